@@ -0,0 +1,121 @@
+import os
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    return value.lower() in ("1", "true", "yes") if value else default
+
+
+# Exchange rate provider
+FX_BACKEND = os.getenv("FX_BACKEND", "http")  # http | file | env
+FX_API_URL = os.getenv(
+    "FX_API_URL",
+    "https://v6.exchangerate-api.com/v6/4ca83eeae455d22f20ac2a2f/latest/USD",
+)
+FX_RATE_FILE = os.getenv("FX_RATE_FILE", "")
+FX_RATE_ENV_VAR = "FX_UAH_RATE"
+FX_TTL_SECONDS = _env_float("FX_TTL_SECONDS", 3600.0)
+FX_MAX_STALENESS_SECONDS = _env_float("FX_MAX_STALENESS_SECONDS", 86400.0)
+FX_TIMEOUT_SECONDS = _env_float("FX_TIMEOUT_SECONDS", 2.0)
+
+# Batch scoring
+PREDICT_BATCH_MAX_ROWS = int(os.getenv("PREDICT_BATCH_MAX_ROWS", "10000"))
+# /predict/columnar takes binary column batches, so it allows far more rows
+PREDICT_COLUMNAR_MAX_ROWS = int(os.getenv("PREDICT_COLUMNAR_MAX_ROWS", "1000000"))
+
+# Asynchronous scoring jobs (/jobs): sqlite (shared by the workers on a host) | memory
+JOBS_BACKEND = os.getenv("JOBS_BACKEND", "sqlite")
+JOBS_DIR = os.getenv("JOBS_DIR", "/tmp/fico-jobs")  # spilled inputs and results
+JOBS_CHUNK_SIZE = int(os.getenv("JOBS_CHUNK_SIZE", "1000"))
+JOBS_CONCURRENCY = int(os.getenv("JOBS_CONCURRENCY", "1"))  # jobs scored per worker
+JOBS_MAX_QUEUED = int(os.getenv("JOBS_MAX_QUEUED", "100"))
+JOBS_MAX_BYTES = int(os.getenv("JOBS_MAX_BYTES", str(256 << 20)))
+JOBS_POLL_INTERVAL = _env_float("JOBS_POLL_INTERVAL", 0.5)
+# A running job without progress for this long is resumed by another worker
+JOBS_STALE_SECONDS = _env_float("JOBS_STALE_SECONDS", 60.0)
+JOBS_RETENTION_SECONDS = _env_float("JOBS_RETENTION_SECONDS", 86400.0)
+
+# Input and prediction drift monitoring (/drift)
+DRIFT_MONITORING = _env_bool("DRIFT_MONITORING", True)
+DRIFT_DIR = os.getenv("DRIFT_DIR", "/tmp/fico-drift")  # per-worker sketches
+DRIFT_REFERENCE_PATH = os.getenv("DRIFT_REFERENCE_PATH", "") or os.path.join(
+    DRIFT_DIR, "reference.npz"
+)
+DRIFT_WINDOW_SECONDS = _env_float("DRIFT_WINDOW_SECONDS", 3600.0)
+DRIFT_FLUSH_INTERVAL = _env_float("DRIFT_FLUSH_INTERVAL", 10.0)
+DRIFT_RETENTION_SECONDS = _env_float("DRIFT_RETENTION_SECONDS", 7 * 86400.0)
+DRIFT_PSI_THRESHOLD = _env_float("DRIFT_PSI_THRESHOLD", 0.2)
+
+# Micro-batching scheduler in front of the booster (opt-in)
+BATCHING_ENABLED = os.getenv("BATCHING_ENABLED", "").lower() in ("1", "true", "yes")
+BATCHING_MAX_SIZE = int(os.getenv("BATCHING_MAX_SIZE", "64"))
+BATCHING_MAX_WAIT_US = int(os.getenv("BATCHING_MAX_WAIT_US", "2000"))
+BATCHING_QUEUE_SIZE = int(os.getenv("BATCHING_QUEUE_SIZE", "1024"))
+
+# Dedicated executor for CPU-bound scoring
+INFERENCE_EXECUTOR = os.getenv("INFERENCE_EXECUTOR", "thread")  # thread | process
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", "0")) or os.cpu_count() or 1
+INFERENCE_NTHREAD = int(os.getenv("INFERENCE_NTHREAD", "1"))
+
+# Admission control in front of /predict and /recommend
+ADMISSION_CONTROL = _env_bool("ADMISSION_CONTROL", True)
+ADMISSION_MAX_CONCURRENT = (
+    int(os.getenv("ADMISSION_MAX_CONCURRENT", "0")) or 4 * INFERENCE_WORKERS
+)
+ADMISSION_QUEUE_SIZE = int(os.getenv("ADMISSION_QUEUE_SIZE", "64"))
+# Deadline for requests without an X-Request-Timeout header, and the cap on it
+ADMISSION_DEFAULT_TIMEOUT = _env_float("ADMISSION_DEFAULT_TIMEOUT", 5.0)
+ADMISSION_MAX_TIMEOUT = _env_float("ADMISSION_MAX_TIMEOUT", 60.0)
+# Per-client token buckets, keyed by this header or the peer address; 0 disables
+ADMISSION_CLIENT_RATE = _env_float("ADMISSION_CLIENT_RATE", 0.0)  # requests/s
+ADMISSION_CLIENT_BURST = _env_float("ADMISSION_CLIENT_BURST", 20.0)
+ADMISSION_CLIENT_HEADER = os.getenv("ADMISSION_CLIENT_HEADER", "X-Client-Id")
+
+# Versioned model artifacts, see app/models/registry.py
+MODEL_REGISTRY_DIR = os.getenv(
+    "MODEL_REGISTRY_DIR", os.path.join(os.path.dirname(__file__), "models", "artifacts")
+)
+MODEL_VERSION = os.getenv("MODEL_VERSION", "")  # pin the default version
+MODEL_WATCH_INTERVAL = _env_float("MODEL_WATCH_INTERVAL", 30.0)  # 0 disables
+MODEL_SHADOW_VERSION = os.getenv("MODEL_SHADOW_VERSION", "")
+MODEL_SHADOW_RATE = _env_float("MODEL_SHADOW_RATE", 0.0)
+# Sampled rows are dropped while this many shadow calls are in flight
+MODEL_SHADOW_MAX_INFLIGHT = int(os.getenv("MODEL_SHADOW_MAX_INFLIGHT", "4"))
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")  # admin endpoints are off when unset
+
+# Tree evaluation backend: xgboost | arrays (vectorized NumPy) | codegen (generated Python).
+# arrays and codegen read the memory-mapped tree arrays, which workers share;
+# every worker still holds its own copy of the xgboost booster.
+MODEL_BACKEND = os.getenv("MODEL_BACKEND", "xgboost")
+# Larger batches go through xgboost even when a compiled backend is selected
+COMPILED_TREES_MAX_ROWS = int(os.getenv("COMPILED_TREES_MAX_ROWS", "8"))
+
+# Per-applicant attributions: arrays (Saabas over the tree arrays, path-dependent
+# and not SHAP values) | xgboost (exact TreeSHAP, much slower)
+ATTRIBUTIONS_BACKEND = os.getenv("ATTRIBUTIONS_BACKEND", "arrays")
+# Rank /predict recommendations by the applicant's attributions, not global importances
+RECOMMEND_BY_ATTRIBUTIONS = _env_bool("RECOMMEND_BY_ATTRIBUTIONS", True)
+
+# Prediction result cache: off | local (per process) | shared (local + SQLite file)
+PREDICTION_CACHE = os.getenv("PREDICTION_CACHE", "off")
+PREDICTION_CACHE_TTL_SECONDS = _env_float("PREDICTION_CACHE_TTL_SECONDS", 300.0)
+PREDICTION_CACHE_MAX_BYTES = int(os.getenv("PREDICTION_CACHE_MAX_BYTES", str(64 << 20)))
+PREDICTION_CACHE_PATH = os.getenv(
+    "PREDICTION_CACHE_PATH", "/tmp/fico-prediction-cache.sqlite3"
+)
+PREDICTION_CACHE_SHARED_MAX_ENTRIES = int(
+    os.getenv("PREDICTION_CACHE_SHARED_MAX_ENTRIES", "100000")
+)
+# Width of the UAH/USD rate buckets that are part of the cache key
+PREDICTION_CACHE_FX_BUCKET = _env_float("PREDICTION_CACHE_FX_BUCKET", 0.01)
+
+# Add a Server-Timing header with per-stage durations to every response
+SERVER_TIMING = os.getenv("SERVER_TIMING", "").lower() in ("1", "true", "yes")
+
+# /recommend/whatif: points scored between each feature's value and its target
+WHATIF_STEPS = int(os.getenv("WHATIF_STEPS", "4"))
@@ -1,5 +1,5 @@
-import requests
-from app.schemas.user import UserData
+from app.services.exchange_rate import RateUnavailable, get_rate_provider
+from app.services.timing import timed
 from fastapi import HTTPException
 
 currency_fields = [
@@ -12,20 +12,9 @@ currency_fields = [
 ]
 
 
-def get_uah_to_usd() -> int:
-    url = "https://v6.exchangerate-api.com/v6/4ca83eeae455d22f20ac2a2f/latest/USD"
-
+async def get_uah_to_usd() -> float:
     try:
-        response = requests.get(url)
-        data = response.json()
-        return data["conversion_rates"]["UAH"]
-    except Exception as e:
-        raise HTTPException(status_code=500)
-
-
-def convert_to_usd(userData: UserData):
-    data = userData.model_dump()
-    convertion_rate = get_uah_to_usd()
-    for feat in currency_fields:
-        data[feat] = data[feat] / convertion_rate if data[feat] != 0 else 0
-    return UserData(**data)
+        with timed("fx"):
+            return await get_rate_provider().get_rate()
+    except RateUnavailable as e:
+        raise HTTPException(status_code=500) from e
@@ -0,0 +1,19 @@
+from typing import Annotated
+
+from fastapi import Header, HTTPException
+
+from app.models.registry import UnknownModelVersion, get_registry
+
+MODEL_VERSION_HEADER = "X-Model-Version"
+
+
+def resolve_model_version(
+    x_model_version: Annotated[str | None, Header()] = None,
+) -> str:
+    """Pin the request to one model version, the default unless the header names one."""
+    try:
+        return get_registry().get(x_model_version).version
+    except UnknownModelVersion:
+        raise HTTPException(
+            status_code=404, detail=f"Unknown model version {x_model_version}"
+        )
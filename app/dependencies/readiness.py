@@ -0,0 +1,13 @@
+from fastapi import HTTPException
+
+from app.services.startup import is_ready
+
+
+def require_ready() -> None:
+    """Refuse scoring until the model is loaded and warmed."""
+    if not is_ready():
+        raise HTTPException(
+            status_code=503,
+            detail="The service is starting",
+            headers={"Retry-After": "1"},
+        )
@@ -1,13 +1,92 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-from app.routers import predict, health, recommend
+from app import config
+from app.models.registry import get_registry
+from app.routers import predict, health, recommend, metrics, admin, jobs, drift
+from app.services import scoring
+from app.services.admission import AdmissionMiddleware
+from app.services.batching import start_batcher, stop_batcher
+from app.services.drift import get_drift_monitor, shutdown_drift_monitor
+from app.services.executor import (
+    get_inference_executor,
+    shutdown_inference_executor,
+)
+from app.services.jobs import get_job_queue, shutdown_job_queue
+from app.services.prediction_cache import (
+    get_prediction_cache,
+    shutdown_prediction_cache,
+)
+from app.services.shadow import configure_shadow_from_env
+from app.services.startup import mark_not_ready, start_serving, warm_up_scoring
+from app.services.timing import TimingMiddleware
+from app.services.exchange_rate import get_rate_provider, shutdown_rate_provider
 from fastapi.middleware.cors import CORSMiddleware
 
-app = FastAPI()
+
+async def _start_rate_provider() -> None:
+    await get_rate_provider().start()
+
+
+async def _start_inference() -> None:
+    get_prediction_cache()
+    executor = get_inference_executor()
+    if executor.kind == "process":
+        # One warm-up call per worker process; the parent is already warm.
+        await asyncio.gather(
+            *(executor.run(warm_up_scoring) for _ in range(executor.workers))
+        )
+    # Batched rows are keyed by (version, with_attributions) and fully scored
+    # on the executor, recommendations included.
+    await start_batcher(
+        lambda features, key: executor.run(scoring.score, features, *key)
+    )
+
+
+async def _start_jobs() -> None:
+    await get_job_queue().start()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    configure_shadow_from_env()
+    # Startup runs in the background so /health/live answers while the model
+    # loads; /health and the scoring routes return 503 until it is done.
+    tasks = [
+        asyncio.create_task(
+            start_serving([_start_rate_provider, _start_inference, _start_jobs])
+        )
+    ]
+    if config.MODEL_WATCH_INTERVAL > 0:
+        tasks.append(asyncio.create_task(get_registry().watch()))
+    monitor = get_drift_monitor()
+    if monitor is not None:
+        tasks.append(asyncio.create_task(monitor.run()))
+    yield
+    mark_not_ready()
+    for task in tasks:
+        task.cancel()
+    await shutdown_job_queue()
+    await stop_batcher()
+    shutdown_inference_executor()
+    shutdown_prediction_cache()
+    shutdown_drift_monitor()
+    await shutdown_rate_provider()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.include_router(predict.router)
 app.include_router(recommend.router)
+app.include_router(jobs.router)
 app.include_router(health.router)
+app.include_router(metrics.router)
+app.include_router(drift.router)
+app.include_router(admin.router)
 
+# Innermost, so CORS headers and timings also cover shed requests.
+app.add_middleware(AdmissionMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -15,6 +94,7 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(TimingMiddleware)
 
 
 @app.get("/")
@@ -1,25 +1,33 @@
-import pickle
-import os
+from typing import Optional
+
+from app import config
+from app.models.registry import LoadedModel, get_registry
 
 
 class ForwardModel:
-    _instance = None
-    _model = None
-
-    def __new__(cls, *args, **kwargs):
-        if cls._instance is None:
-            cls._instance = super(ForwardModel, cls).__new__(cls)
-            try:
-                model_path = os.path.join(os.path.dirname(__file__), "xgb_model_2.pkl")
-                with open(model_path, "rb") as f:
-                    cls._model = pickle.load(f)
-            except FileNotFoundError as e:
-                raise RuntimeError(f"Model file not found at {model_path}") from e
-        return cls._instance
+    """The served booster; `version=None` means the registry's default."""
+
+    def __init__(self, version: Optional[str] = None):
+        self.version = version
+
+    @classmethod
+    def load(cls) -> "ForwardModel":
+        """Load, validate and warm every version now instead of on first use."""
+        registry = get_registry()
+        registry.sync()
+        registry.get(config.MODEL_VERSION or None)
+        return cls()
+
+    @property
+    def model(self) -> LoadedModel:
+        return get_registry().get(self.version)
+
+    def set_nthread(self, nthread: int) -> None:
+        get_registry().set_nthread(nthread)
 
     def predict(self, data):
-        return self._model.predict(data)
+        return self.model.predict(data)
 
     @property
     def feature_importances(self):
-        return self._model.feature_importances_
+        return self.model.feature_importances
@@ -0,0 +1,373 @@
+"""Pure NumPy / pure Python evaluation of an XGBoost tree ensemble.
+
+For one or a handful of rows most of `XGBRegressor.predict` goes to building
+the input and crossing into the C++ library, not to walking the trees. The
+booster is exported once, through its JSON model dump, into flat arrays that
+are evaluated either with vectorized traversal (`TreeArrays`) or with a
+generated Python module of nested `if` statements (`CodegenTrees`).
+"""
+
+import json
+import math
+import os
+
+import numpy as np
+
+_OUTPUT_TRANSFORMS = {
+    "reg:squarederror": "identity",
+    "reg:squaredlogerror": "identity",
+    "reg:pseudohubererror": "identity",
+    "reg:absoluteerror": "identity",
+    "reg:quantileerror": "identity",
+    "reg:logistic": "sigmoid",
+    "binary:logistic": "sigmoid",
+    "count:poisson": "exp",
+    "reg:gamma": "exp",
+    "reg:tweedie": "exp",
+}
+
+
+class UnsupportedModel(Exception):
+    """Raised when a booster uses features the compiled backends do not handle."""
+
+
+def _parse_float(value: str) -> float:
+    # xgboost >= 3 writes scalar model params as one-element lists: "[5.0E2]"
+    return float(value.strip("[]"))
+
+
+class TreeArrays:
+    """A tree ensemble flattened into aligned per-node arrays.
+
+    Leaves point at themselves, so every row can take the same number of
+    traversal steps (`max_depth`) without checking for leaves.
+    """
+
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        default_left: np.ndarray,
+        value: np.ndarray,
+        cover: np.ndarray,
+        roots: np.ndarray,
+        max_depth: int,
+        base_score: float,
+        transform: str,
+        num_features: int,
+    ):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.default_left = default_left
+        self.value = value
+        self.cover = cover
+        self.roots = roots
+        self.max_depth = max_depth
+        self.base_score = base_score
+        self.transform = transform
+        self.num_features = num_features
+        self._node_mean = None
+
+    @classmethod
+    def from_booster(cls, booster) -> "TreeArrays":
+        # Models trained with early stopping predict with the best iteration only.
+        best_iteration = booster.attr("best_iteration")
+        num_trees = int(best_iteration) + 1 if best_iteration is not None else None
+        return cls.from_json(booster.save_raw(raw_format="json"), num_trees)
+
+    @classmethod
+    def from_json(cls, raw: bytes | str, num_trees: int | None = None) -> "TreeArrays":
+        learner = json.loads(raw)["learner"]
+        objective = learner["objective"]["name"]
+        params = learner["learner_model_param"]
+        booster = learner["gradient_booster"]
+
+        if objective not in _OUTPUT_TRANSFORMS:
+            raise UnsupportedModel(f"Objective {objective} is not supported")
+        if booster["name"] != "gbtree":
+            raise UnsupportedModel(f"Booster {booster['name']} is not supported")
+        if int(params.get("num_class", 0)) > 1 or int(params.get("num_target", 1)) > 1:
+            raise UnsupportedModel("Multi-output models are not supported")
+
+        trees = booster["model"]["trees"][:num_trees]
+        feature, threshold, left, right, default_left, value, cover, roots = (
+            [] for _ in range(8)
+        )
+        max_depth, offset = 0, 0
+        for tree in trees:
+            if any(tree["split_type"]):
+                raise UnsupportedModel("Categorical splits are not supported")
+
+            n = len(tree["left_children"])
+            tree_left = np.array(tree["left_children"], dtype=np.int64)
+            tree_right = np.array(tree["right_children"], dtype=np.int64)
+            is_leaf = tree_left == -1
+            own = np.arange(n)
+
+            roots.append(offset)
+            feature.append(np.where(is_leaf, 0, tree["split_indices"]))
+            threshold.append(np.where(is_leaf, np.nan, tree["split_conditions"]))
+            left.append(np.where(is_leaf, own, tree_left) + offset)
+            right.append(np.where(is_leaf, own, tree_right) + offset)
+            default_left.append(np.array(tree["default_left"], dtype=bool))
+            # For leaves `split_conditions` holds the leaf weight.
+            value.append(np.where(is_leaf, tree["split_conditions"], 0.0))
+            cover.append(np.array(tree["sum_hessian"]))
+            max_depth = max(max_depth, _depth(tree_left, tree_right))
+            offset += n
+
+        transform = _OUTPUT_TRANSFORMS[objective]
+        return cls(
+            feature=np.concatenate(feature).astype(np.intp),
+            threshold=np.concatenate(threshold).astype(np.float32),
+            left=np.concatenate(left).astype(np.intp),
+            right=np.concatenate(right).astype(np.intp),
+            default_left=np.concatenate(default_left),
+            value=np.concatenate(value).astype(np.float32),
+            cover=np.concatenate(cover).astype(np.float32),
+            roots=np.array(roots, dtype=np.intp),
+            max_depth=max_depth,
+            base_score=_parse_float(params["base_score"]),
+            transform=transform,
+            num_features=int(params["num_feature"]),
+        )
+
+    @property
+    def base_margin(self) -> float:
+        if self.transform == "sigmoid":
+            return math.log(self.base_score / (1 - self.base_score))
+        if self.transform == "exp":
+            return math.log(self.base_score)
+        return self.base_score
+
+    def leaves(self, X: np.ndarray) -> np.ndarray:
+        """Index of the leaf each row reaches in each tree, shape (rows, trees)."""
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        flat = X.ravel()
+        row_offset = (np.arange(len(X)) * X.shape[1])[:, None]
+        node = np.broadcast_to(self.roots, (len(X), len(self.roots)))
+        has_missing = np.isnan(flat).any()
+        for _ in range(self.max_depth):
+            x = flat[row_offset + self.feature[node]]
+            go_left = x < self.threshold[node]
+            if has_missing:
+                go_left |= np.isnan(x) & self.default_left[node]
+            node = np.where(go_left, self.left[node], self.right[node])
+        return node
+
+    def predict_margin(self, X: np.ndarray) -> np.ndarray:
+        return self._margin(self.leaves(X))
+
+    def _margin(self, leaves: np.ndarray) -> np.ndarray:
+        leaf_values = self.value[leaves]
+        # Accumulate tree by tree in float32, in the same order as xgboost.
+        margin = np.empty((len(leaf_values), len(self.roots) + 1), np.float32)
+        margin[:, 0] = self.base_margin
+        margin[:, 1:] = leaf_values
+        return np.cumsum(margin, axis=1, dtype=np.float32)[:, -1]
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return _apply_transform(self.predict_margin(X), self.transform)
+
+    @property
+    def node_mean(self) -> np.ndarray:
+        """Cover-weighted mean leaf value under each node, computed once."""
+        if self._node_mean is None:
+            is_leaf = self.left == np.arange(len(self.left))
+            value = self.value.astype(np.float64)
+            cover = np.where(self.cover > 0, self.cover, 1).astype(np.float64)
+            mean = value
+            # Each pass settles one more level above the leaves.
+            for _ in range(self.max_depth):
+                children = (
+                    cover[self.left] * mean[self.left]
+                    + cover[self.right] * mean[self.right]
+                ) / cover
+                mean = np.where(is_leaf, value, children)
+            self._node_mean = mean
+        return self._node_mean
+
+    def predict_with_contributions(
+        self, X: np.ndarray, chunk_rows: int = 1024
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """`predict(X)` and per-feature Saabas attributions from one traversal.
+
+        Every split on a row's path credits its feature with the change in
+        `node_mean`. Attributions have shape (rows, num_features + 1), the last
+        column being the bias, and each row sums to its margin. They match
+        xgboost's `pred_contribs=True, approx_contribs=True`.
+        """
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        mean = self.node_mean
+        width = self.num_features + 1
+        bias = self.base_margin + float(mean[self.roots].sum())
+        out = np.empty((len(X), width), dtype=np.float64)
+        margin = np.empty(len(X), dtype=np.float32)
+        for start in range(0, len(X), chunk_rows):
+            chunk = X[start : start + chunk_rows]
+            flat = chunk.ravel()
+            rows = np.arange(len(chunk))[:, None]
+            node = np.broadcast_to(self.roots, (len(chunk), len(self.roots)))
+            has_missing = np.isnan(flat).any()
+            totals = np.zeros(len(chunk) * width)
+            for _ in range(self.max_depth):
+                feature = self.feature[node]
+                x = flat[rows * chunk.shape[1] + feature]
+                go_left = x < self.threshold[node]
+                if has_missing:
+                    go_left |= np.isnan(x) & self.default_left[node]
+                child = np.where(go_left, self.left[node], self.right[node])
+                # Leaves point at themselves, so they add zero.
+                totals += np.bincount(
+                    (rows * width + feature).ravel(),
+                    weights=(mean[child] - mean[node]).ravel(),
+                    minlength=len(totals),
+                )
+                node = child
+            out[start : start + len(chunk)] = totals.reshape(len(chunk), width)
+            margin[start : start + len(chunk)] = self._margin(node)
+        out[:, -1] = bias
+        return _apply_transform(margin, self.transform), out
+
+    def contributions(self, X: np.ndarray) -> np.ndarray:
+        return self.predict_with_contributions(X)[1]
+
+    def save(self, directory: str) -> list[str]:
+        """Write one `.npy` per array plus `trees.json`; returns the file names."""
+        os.makedirs(directory, exist_ok=True)
+        files = []
+        for name in _ARRAY_FIELDS:
+            np.save(os.path.join(directory, f"{name}.npy"), getattr(self, name))
+            files.append(f"{name}.npy")
+        meta = {name: getattr(self, name) for name in _SCALAR_FIELDS}
+        with open(os.path.join(directory, "trees.json"), "w") as f:
+            json.dump(meta, f)
+        return files + ["trees.json"]
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> "TreeArrays":
+        """Load saved arrays, memory-mapped so worker processes share the pages."""
+        with open(os.path.join(directory, "trees.json")) as f:
+            meta = json.load(f)
+        arrays = {
+            name: np.load(
+                os.path.join(directory, f"{name}.npy"),
+                mmap_mode="r" if mmap else None,
+                allow_pickle=False,
+            )
+            for name in _ARRAY_FIELDS
+        }
+        return cls(**arrays, **meta)
+
+
+_ARRAY_FIELDS = (
+    "feature",
+    "threshold",
+    "left",
+    "right",
+    "default_left",
+    "value",
+    "cover",
+    "roots",
+)
+_SCALAR_FIELDS = ("max_depth", "base_score", "transform", "num_features")
+
+
+def _depth(left: np.ndarray, right: np.ndarray) -> int:
+    depth = np.zeros(len(left), dtype=np.int64)
+    for node in range(len(left)):
+        if left[node] != -1:
+            depth[left[node]] = depth[right[node]] = depth[node] + 1
+    return int(depth.max())
+
+
+def _apply_transform(margin: np.ndarray, transform: str) -> np.ndarray:
+    if transform == "sigmoid":
+        return (1 / (1 + np.exp(-margin))).astype(np.float32)
+    if transform == "exp":
+        return np.exp(margin).astype(np.float32)
+    return margin
+
+
+class CodegenTrees:
+    """The ensemble compiled into a generated Python module of nested `if`s.
+
+    Cheapest for one row at a time; for larger batches use `TreeArrays`.
+    """
+
+    def __init__(self, trees: TreeArrays):
+        self.trees = trees
+        self.source = self._generate(trees)
+        namespace: dict = {}
+        try:
+            code = compile(self.source, "<compiled-trees>", "exec")
+        except (SyntaxError, RecursionError, MemoryError) as e:
+            raise UnsupportedModel("Trees are too deep to compile to Python") from e
+        exec(code, namespace)
+        self._predict_row = namespace["predict_row"]
+
+    @staticmethod
+    def _generate(trees: TreeArrays) -> str:
+        lines = ["def predict_row(x):", f"    margin = {trees.base_margin!r}"]
+
+        def emit(node: int, indent: int) -> None:
+            pad = "    " * indent
+            if trees.left[node] == node:
+                lines.append(f"{pad}margin += {float(trees.value[node])!r}")
+                return
+            feat = int(trees.feature[node])
+            cond = f"x[{feat}] < {float(trees.threshold[node])!r}"
+            if trees.default_left[node]:
+                cond += f" or x[{feat}] != x[{feat}]"
+            lines.append(f"{pad}if {cond}:")
+            emit(int(trees.left[node]), indent + 1)
+            lines.append(f"{pad}else:")
+            emit(int(trees.right[node]), indent + 1)
+
+        for root in trees.roots:
+            emit(int(root), 1)
+        lines.append("    return margin")
+        return "\n".join(lines) + "\n"
+
+    def predict_margin(self, X: np.ndarray) -> np.ndarray:
+        rows = np.asarray(X, dtype=np.float32).tolist()
+        return np.array([self._predict_row(row) for row in rows], dtype=np.float32)
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return _apply_transform(self.predict_margin(X), self.trees.transform)
+
+
+def probe_matrix(trees: TreeArrays, rows: int = 512, seed: int = 0) -> np.ndarray:
+    """Inputs that land on both sides of the split thresholds, plus some NaNs."""
+    rng = np.random.default_rng(seed)
+    X = np.zeros((rows, trees.num_features), dtype=np.float32)
+    is_split = trees.left != np.arange(len(trees.left))
+    for feat in range(trees.num_features):
+        cuts = trees.threshold[is_split & (trees.feature == feat)]
+        if len(cuts):
+            X[:, feat] = rng.choice(cuts, rows) + rng.normal(0, 1e-3, rows) * np.abs(
+                rng.choice(cuts, rows)
+            )
+        else:
+            X[:, feat] = rng.normal(0, 1, rows)
+    X[rng.random(X.shape) < 0.02] = np.nan
+    return X
+
+
+def check_parity(backend, reference, trees: TreeArrays, rtol: float = 1e-5) -> float:
+    """Largest relative deviation of `backend` from `reference` on probe inputs."""
+    X = probe_matrix(trees)
+    expected = np.asarray(reference(X), dtype=np.float64)
+    actual = np.asarray(backend.predict(X), dtype=np.float64)
+    deviation = float(
+        np.max(np.abs(actual - expected) / np.maximum(np.abs(expected), 1))
+    )
+    if deviation > rtol:
+        raise UnsupportedModel(
+            f"Compiled trees deviate from xgboost by {deviation:.3g} (> {rtol})"
+        )
+    return deviation
@@ -0,0 +1,107 @@
+"""Convert a pickled XGBoost sklearn model into a native model artifact.
+
+    python -m app.models.export [--pickle app/models/xgb_model_2.pkl] [--version V]
+
+This is the only place a pickle is read; the API loads the artifact.
+"""
+
+import argparse
+import json
+import os
+import pickle
+import shutil
+import time
+
+import numpy as np
+
+from app import config
+from app.models.compiled_trees import TreeArrays, UnsupportedModel
+from app.models.registry import (
+    BOOSTER_FILE,
+    FORMAT_VERSION,
+    IMPORTANCES_FILE,
+    MANIFEST_FILE,
+    TREES_DIR,
+    ModelArtifactError,
+    sha256_file,
+)
+from app.schemas.user import MODEL_FEATURES
+
+LEGACY_PICKLE = os.path.join(os.path.dirname(__file__), "xgb_model_2.pkl")
+
+
+def export_model(model, directory: str, version: str = "") -> dict:
+    """Write `model` (an `XGBModel`) as an artifact directory; returns the manifest."""
+    booster = model.get_booster()
+    if booster.feature_names is not None and booster.feature_names != MODEL_FEATURES:
+        raise ModelArtifactError(
+            "Model was trained on a different feature order than MODEL_FEATURES"
+        )
+    if booster.num_features() != len(MODEL_FEATURES):
+        raise ModelArtifactError(
+            f"Model expects {booster.num_features()} features, "
+            f"the API provides {len(MODEL_FEATURES)}"
+        )
+
+    # A dot-prefixed staging directory is ignored by registry watchers until
+    # the finished artifact is renamed into place.
+    parent, name = os.path.split(directory.rstrip(os.sep))
+    staging = os.path.join(parent, f".{name}.tmp")
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+
+    booster.save_model(os.path.join(staging, BOOSTER_FILE))
+    np.save(
+        os.path.join(staging, IMPORTANCES_FILE),
+        np.asarray(model.feature_importances_, dtype=np.float32),
+    )
+    files = [BOOSTER_FILE, IMPORTANCES_FILE]
+    try:
+        trees = TreeArrays.from_booster(booster)
+        files += [
+            os.path.join(TREES_DIR, name)
+            for name in trees.save(os.path.join(staging, TREES_DIR))
+        ]
+    except UnsupportedModel:
+        pass
+
+    best_iteration = booster.attr("best_iteration")
+    classes = getattr(model, "classes_", None)
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "version": version,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "estimator": type(model).__name__,
+        "feature_names": MODEL_FEATURES,
+        "num_trees": int(best_iteration) + 1 if best_iteration is not None else None,
+        "classes": classes.tolist() if classes is not None else None,
+        "files": {name: sha256_file(os.path.join(staging, name)) for name in files},
+    }
+    with open(os.path.join(staging, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(staging, directory)
+    return manifest
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pickle", default=LEGACY_PICKLE)
+    parser.add_argument("--registry", default=config.MODEL_REGISTRY_DIR)
+    parser.add_argument(
+        "--version",
+        default=time.strftime("%Y%m%d%H%M%S"),
+        help="Version directory name; versions sort by name, newest last",
+    )
+    args = parser.parse_args()
+
+    with open(args.pickle, "rb") as f:
+        model = pickle.load(f)
+    out = os.path.join(args.registry, args.version)
+    manifest = export_model(model, out, version=args.version)
+    print(f"Wrote {out} ({len(manifest['files'])} files)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,441 @@
+"""Loading, validation and versioning of native-format model artifacts.
+
+An artifact is a directory written by `app.models.export`, one per model
+version under `MODEL_REGISTRY_DIR`:
+
+    manifest.json             format version, feature order, file checksums
+    model.ubj                 the booster in XGBoost's native UBJSON format
+    feature_importances.npy   importances as `XGBModel.feature_importances_`
+    trees/*.npy               the ensemble as flat arrays (optional)
+
+Nothing in it is unpickled. The `.npy` files are memory-mapped, so several
+uvicorn workers loading the same artifact share those pages. The booster is
+not shared: XGBoost parses `model.ubj` into its own memory, so every process
+holds a copy of it.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import mmap
+import os
+import threading
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+
+from app import config
+from app.models.compiled_trees import (
+    CodegenTrees,
+    TreeArrays,
+    UnsupportedModel,
+    check_parity,
+)
+from app.schemas.user import MODEL_FEATURES
+
+if TYPE_CHECKING:
+    import xgboost as xgb
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+BOOSTER_FILE = "model.ubj"
+IMPORTANCES_FILE = "feature_importances.npy"
+TREES_DIR = "trees"
+
+
+class ModelArtifactError(RuntimeError):
+    """Raised when a model artifact is missing, corrupt or does not fit the API."""
+
+
+def _map_file(path: str) -> mmap.mmap:
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def sha256_file(path: str) -> str:
+    with _map_file(path) as mapped:
+        return hashlib.sha256(mapped).hexdigest()
+
+
+def _build_backend(booster: "xgb.Booster", trees: Optional[TreeArrays], kind: str):
+    """Compiled-tree evaluator for `booster`, or None to use xgboost itself."""
+    if kind == "xgboost":
+        return None
+    if kind not in ("arrays", "codegen"):
+        raise ModelArtifactError(f"Unknown model backend: {kind!r}")
+    if trees is None:
+        raise ModelArtifactError(f"Model backend {kind!r} needs exported tree arrays")
+
+    def reference(X):
+        return booster.inplace_predict(X, validate_features=False)
+
+    try:
+        backend = CodegenTrees(trees) if kind == "codegen" else trees
+        deviation = check_parity(backend, reference, trees)
+    except UnsupportedModel as e:
+        raise ModelArtifactError(
+            f"Model backend {kind!r} cannot serve this model"
+        ) from e
+    logger.info("Using %s model backend (max deviation %.3g)", kind, deviation)
+    return backend
+
+
+class LoadedModel:
+    """A validated booster plus everything needed to serve it."""
+
+    def __init__(
+        self,
+        booster: "xgb.Booster",
+        feature_importances: np.ndarray,
+        trees: Optional[TreeArrays] = None,
+        num_trees: Optional[int] = None,
+        classes: Optional[list] = None,
+        backend: str = config.MODEL_BACKEND,
+        version: str = "",
+    ):
+        self.booster = booster
+        self.feature_importances = feature_importances
+        self.trees = trees
+        self.iteration_range = (0, num_trees or 0)
+        self.classes = np.array(classes) if classes is not None else None
+        self.version = version
+        self.backend = _build_backend(booster, trees, backend)
+        # Recommenders built for this model by feature order; they go with it.
+        self.recommenders: dict = {}
+
+    def set_nthread(self, nthread: int) -> None:
+        self.booster.set_param({"nthread": nthread})
+
+    def predict(self, data) -> np.ndarray:
+        X = np.asarray(data)
+        # The compiled trees only beat xgboost's native predict for tiny batches.
+        if self.backend is not None and len(X) <= config.COMPILED_TREES_MAX_ROWS:
+            output = self.backend.predict(X.astype(np.float32, copy=False))
+        else:
+            output = self.booster.inplace_predict(
+                X, iteration_range=self.iteration_range, validate_features=False
+            )
+        return self._to_labels(output)
+
+    def predict_with_contributions(self, data) -> tuple[np.ndarray, np.ndarray]:
+        """`predict(data)` and per-feature attributions plus a bias column.
+
+        Each attribution row sums to the row's margin. With the tree arrays
+        both come out of one traversal, which is bit-identical to xgboost.
+        """
+        X = np.asarray(data)
+        if config.ATTRIBUTIONS_BACKEND == "arrays" and self.trees is not None:
+            output, contributions = self.trees.predict_with_contributions(X)
+            return self._to_labels(output), contributions
+        return self.predict(X), self.contributions(X)
+
+    def contributions(self, data) -> np.ndarray:
+        X = np.asarray(data)
+        if config.ATTRIBUTIONS_BACKEND == "arrays" and self.trees is not None:
+            return self.trees.contributions(X)
+
+        import xgboost as xgb
+
+        return self.booster.predict(
+            xgb.DMatrix(X),
+            pred_contribs=True,
+            iteration_range=self.iteration_range,
+            validate_features=False,
+        )
+
+    def _to_labels(self, output: np.ndarray) -> np.ndarray:
+        """Map classifier probabilities to labels like `XGBClassifier.predict`."""
+        if self.classes is None:
+            return output
+        if output.ndim == 1:
+            return self.classes[(output > 0.5).astype(np.intp)]
+        return self.classes[np.argmax(output, axis=1)]
+
+
+def read_manifest(directory: str) -> dict:
+    path = os.path.join(directory, MANIFEST_FILE)
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except FileNotFoundError as e:
+        raise ModelArtifactError(f"Model manifest not found at {path}") from e
+    except json.JSONDecodeError as e:
+        raise ModelArtifactError(f"Model manifest at {path} is not valid JSON") from e
+
+    if manifest.get("format_version") != FORMAT_VERSION:
+        raise ModelArtifactError(
+            f"Unsupported model format version {manifest.get('format_version')!r}"
+        )
+    return manifest
+
+
+def verify_artifact(directory: str, manifest: dict) -> None:
+    """Check file checksums and that the feature order matches `MODEL_FEATURES`."""
+    for name, digest in manifest["files"].items():
+        path = os.path.join(directory, name)
+        if not os.path.exists(path):
+            raise ModelArtifactError(f"Model file {name} is missing from {directory}")
+        if sha256_file(path) != digest:
+            raise ModelArtifactError(f"Checksum mismatch for model file {name}")
+
+    if manifest["feature_names"] != MODEL_FEATURES:
+        raise ModelArtifactError(
+            "Model feature order does not match InputFeatures.model_dump"
+        )
+
+
+def load_artifact(
+    directory: str,
+    backend: str = config.MODEL_BACKEND,
+    version: Optional[str] = None,
+) -> LoadedModel:
+    manifest = read_manifest(directory)
+    verify_artifact(directory, manifest)
+
+    # xgboost (and the scikit-learn it imports) is the slowest import in the
+    # app; importing it here lets the server answer liveness probes sooner.
+    import xgboost as xgb
+
+    booster = xgb.Booster()
+    with _map_file(os.path.join(directory, BOOSTER_FILE)) as mapped:
+        booster.load_model(bytearray(mapped))
+    if booster.num_features() != len(MODEL_FEATURES):
+        raise ModelArtifactError(
+            f"Model expects {booster.num_features()} features, "
+            f"the API provides {len(MODEL_FEATURES)}"
+        )
+
+    trees = None
+    if os.path.exists(os.path.join(directory, TREES_DIR, "trees.json")):
+        trees = TreeArrays.load(os.path.join(directory, TREES_DIR))
+
+    return LoadedModel(
+        booster=booster,
+        feature_importances=np.load(
+            os.path.join(directory, IMPORTANCES_FILE), allow_pickle=False
+        ),
+        trees=trees,
+        num_trees=manifest.get("num_trees"),
+        classes=manifest.get("classes"),
+        backend=backend,
+        version=version or manifest.get("version", ""),
+    )
+
+
+class UnknownModelVersion(KeyError):
+    """Raised when a requested model version is neither loaded nor on disk."""
+
+
+CURRENT_FILE = "CURRENT"
+
+
+def warm_up(model: LoadedModel) -> None:
+    """Run the first predictions now so no request pays for lazy initialization."""
+    for rows in (1, config.COMPILED_TREES_MAX_ROWS + 1):
+        model.predict(np.zeros((rows, len(MODEL_FEATURES))))
+    model.contributions(np.zeros((1, len(MODEL_FEATURES))))
+
+
+class ModelRegistry:
+    """Versioned models under `root/<version>/`, swappable without a restart.
+
+    Loading and warm-up happen before a model is published, and publishing
+    replaces the whole version mapping with one reference assignment, so a
+    request only ever sees fully loaded models. The newest version is the
+    default unless `MODEL_VERSION` or the `root/CURRENT` file pins one; a
+    promotion writes `CURRENT`, which is how it reaches every worker process.
+    An unloaded version stays unloaded in this process until it is loaded
+    again or becomes the pinned version.
+    """
+
+    def __init__(
+        self,
+        root: str = config.MODEL_REGISTRY_DIR,
+        backend: str = config.MODEL_BACKEND,
+    ):
+        self.root = root
+        self.backend = backend
+        self.nthread: Optional[int] = None
+        self._models: dict[str, LoadedModel] = {}
+        self._stamps: dict[str, float] = {}
+        self._unloaded: set[str] = set()
+        self._default: Optional[str] = None
+        self._lock = threading.RLock()
+
+    @property
+    def default_version(self) -> Optional[str]:
+        return self._default
+
+    @property
+    def loaded_versions(self) -> list[str]:
+        return sorted(self._models)
+
+    @property
+    def unloaded_versions(self) -> list[str]:
+        return sorted(self._unloaded)
+
+    def available_versions(self) -> list[str]:
+        """Version directories on disk with a manifest, oldest first."""
+        try:
+            names = os.listdir(self.root)
+        except FileNotFoundError:
+            return []
+        return sorted(
+            name
+            for name in names
+            if not name.startswith(".")
+            and os.path.isfile(os.path.join(self.root, name, MANIFEST_FILE))
+        )
+
+    def _manifest_stamp(self, version: str) -> float:
+        return os.stat(os.path.join(self.root, version, MANIFEST_FILE)).st_mtime
+
+    def _pinned_version(self) -> Optional[str]:
+        if config.MODEL_VERSION:
+            return config.MODEL_VERSION
+        try:
+            with open(os.path.join(self.root, CURRENT_FILE), encoding="utf-8") as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def add(self, version: str, model: LoadedModel, stamp: float = 0.0) -> None:
+        """Publish an already loaded model under `version`."""
+        model.version = version
+        if self.nthread is not None:
+            model.set_nthread(self.nthread)
+        with self._lock:
+            self._models = {**self._models, version: model}
+            self._stamps[version] = stamp
+            if self._default is None:
+                self._default = version
+
+    def load(self, version: str) -> LoadedModel:
+        """Load, validate and warm `version` from disk, then publish it."""
+        stamp = self._manifest_stamp(version)
+        model = load_artifact(
+            os.path.join(self.root, version), self.backend, version=version
+        )
+        if self.nthread is not None:
+            model.set_nthread(self.nthread)
+        warm_up(model)
+        self.add(version, model, stamp)
+        self._unloaded.discard(version)
+        logger.info("Loaded model version %s", version)
+        return model
+
+    def unload(self, version: str) -> None:
+        """Drop `version`; `sync` and `get` leave it alone until it is loaded."""
+        with self._lock:
+            if version == self._default:
+                raise ValueError("The default model version cannot be unloaded")
+            self._drop(version)
+            self._unloaded.add(version)
+
+    def _drop(self, version: str) -> None:
+        self._models = {k: v for k, v in self._models.items() if k != version}
+        self._stamps.pop(version, None)
+
+    def promote(self, version: str, persist: bool = True) -> None:
+        """Make `version` the default; with `persist`, for every worker."""
+        self.get(version)
+        with self._lock:
+            self._default = version
+        if persist:
+            os.makedirs(self.root, exist_ok=True)
+            pointer = os.path.join(self.root, CURRENT_FILE)
+            with open(pointer + ".tmp", "w", encoding="utf-8") as f:
+                f.write(version)
+            os.replace(pointer + ".tmp", pointer)
+
+    def get(self, version: Optional[str] = None) -> LoadedModel:
+        models = self._models
+        version = version or self._default
+        model = models.get(version) if version else None
+        if model is not None:
+            return model
+        if version is None:
+            self.sync()
+            if self._default is None:
+                raise ModelArtifactError(f"No model versions found in {self.root}")
+            return self._models[self._default]
+        if version in self._unloaded:
+            raise UnknownModelVersion(version)
+        if version in self.available_versions():
+            # Worker processes load versions on first use.
+            with self._lock:
+                return self._models.get(version) or self.load(version)
+        raise UnknownModelVersion(version)
+
+    def resolve(self, version: Optional[str] = None) -> str:
+        """The concrete version `get(version)` serves, without loading it."""
+        if version:
+            return version
+        if self._default is not None:
+            return self._default
+        available = self.available_versions()
+        resolved = self._pinned_version() or (available[-1] if available else None)
+        if resolved is None:
+            raise ModelArtifactError(f"No model versions found in {self.root}")
+        return resolved
+
+    def set_nthread(self, nthread: int) -> None:
+        self.nthread = nthread
+        for model in self._models.values():
+            model.set_nthread(nthread)
+
+    def sync(self) -> None:
+        """Bring loaded versions and the default in line with the directory."""
+        with self._lock:
+            on_disk = self.available_versions()
+            pinned = self._pinned_version()
+            self._unloaded &= set(on_disk)
+            for version in on_disk:
+                if version in self._unloaded and version != pinned:
+                    continue
+                try:
+                    if self._stamps.get(version) != self._manifest_stamp(version):
+                        self.load(version)
+                except FileNotFoundError:
+                    # Deleted since it was listed; the next sync drops it.
+                    continue
+                except ModelArtifactError:
+                    logger.exception("Could not load model version %s", version)
+
+            # Without a pin (MODEL_VERSION or CURRENT) the newest version serves.
+            if pinned in self._models:
+                self._default = pinned
+            elif pinned:
+                logger.warning("Pinned model version %s is not loadable", pinned)
+            else:
+                loaded = [v for v in on_disk if v in self._models]
+                if loaded:
+                    self._default = loaded[-1]
+            if self._default not in self._models:
+                self._default = max(self._models) if self._models else None
+
+            for version in set(self._models) - set(on_disk) - {self._default}:
+                # Models added in-process (not from disk) have no stamp.
+                if self._stamps.get(version):
+                    self._drop(version)
+
+    async def watch(self, interval: float = config.MODEL_WATCH_INTERVAL) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.sync)
+            except Exception:
+                logger.exception("Model registry sync failed")
+
+
+_registry: Optional[ModelRegistry] = None
+
+
+def get_registry() -> ModelRegistry:
+    global _registry
+    if _registry is None:
+        _registry = ModelRegistry()
+    return _registry
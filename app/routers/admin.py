@@ -0,0 +1,92 @@
+import asyncio
+import hmac
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+
+from app import config
+from app.models.registry import ModelArtifactError, UnknownModelVersion, get_registry
+from app.services.shadow import get_shadow, set_shadow
+
+
+def require_admin_token(x_admin_token: Annotated[str | None, Header()] = None):
+    if not config.ADMIN_TOKEN:
+        raise HTTPException(status_code=404)
+    if not hmac.compare_digest(
+        (x_admin_token or "").encode(), config.ADMIN_TOKEN.encode()
+    ):
+        raise HTTPException(status_code=403)
+
+
+router = APIRouter(
+    prefix="/admin/models",
+    tags=["Model administration"],
+    dependencies=[Depends(require_admin_token)],
+)
+
+
+@router.get("", summary="Loaded model versions and shadow scoring stats")
+def list_models() -> dict:
+    registry = get_registry()
+    shadow = get_shadow()
+    return {
+        "default": registry.default_version,
+        "loaded": registry.loaded_versions,
+        "unloaded": registry.unloaded_versions,
+        "available": registry.available_versions(),
+        "shadow": shadow.stats() if shadow else None,
+    }
+
+
+@router.post("/{version}/load", summary="Load and warm a model version")
+async def load_model(version: str) -> dict:
+    registry = get_registry()
+    if version not in registry.available_versions():
+        raise HTTPException(status_code=404, detail=f"Unknown model version {version}")
+    try:
+        await asyncio.to_thread(registry.load, version)
+    except ModelArtifactError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {"loaded": version}
+
+
+@router.post("/{version}/promote", summary="Serve a model version by default")
+async def promote_model(version: str) -> dict:
+    try:
+        await asyncio.to_thread(get_registry().promote, version)
+    except UnknownModelVersion:
+        raise HTTPException(status_code=404, detail=f"Unknown model version {version}")
+    except ModelArtifactError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {"default": version}
+
+
+# Unloading is per worker process. The version stays unloaded there, through
+# registry syncs, until it is loaded or pinned again.
+@router.delete("/{version}", summary="Unload a model version")
+def unload_model(version: str) -> dict:
+    try:
+        get_registry().unload(version)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"unloaded": version}
+
+
+# Shadow settings are per worker process; use MODEL_SHADOW_VERSION and
+# MODEL_SHADOW_RATE to configure every worker at once.
+@router.put("/shadow/{version}", summary="Shadow-score a share of traffic")
+def start_shadow(version: str, rate: Annotated[float, Query(gt=0, le=1)]) -> dict:
+    try:
+        get_registry().get(version)
+    except UnknownModelVersion:
+        raise HTTPException(status_code=404, detail=f"Unknown model version {version}")
+    except ModelArtifactError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return set_shadow(version, rate).stats()
+
+
+@router.delete("/shadow", summary="Stop shadow scoring")
+def stop_shadow() -> dict:
+    shadow = get_shadow()
+    set_shadow(None)
+    return {"stopped": shadow.stats() if shadow else None}
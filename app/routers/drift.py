@@ -0,0 +1,21 @@
+from typing import Annotated
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.services.drift import get_drift_monitor
+
+router = APIRouter(prefix="/drift", tags=["Metrics"])
+
+
+@router.get("", summary="Input and prediction drift against the reference")
+async def drift(
+    windows: Annotated[
+        int,
+        Query(ge=1, description="Recent windows of DRIFT_WINDOW_SECONDS to include"),
+    ] = 24,
+) -> dict:
+    """PSI and KS per model feature and for the prediction, merged over workers."""
+    monitor = get_drift_monitor()
+    if monitor is None:
+        raise HTTPException(status_code=404, detail="Drift monitoring is off")
+    return await monitor.report(windows)
@@ -1,8 +1,31 @@
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.services.startup import is_ready, startup_error, startup_report
 
 router = APIRouter(prefix="/health", tags=["Health"])
 
 
-@router.get("/", summary="Health check")
-def health_check() -> dict[str, str]:
-    return {"status": "healthy"}
+# The probes are async so they never wait for a threadpool busy with scoring.
+
+
+@router.get("/", summary="Readiness check")
+async def health_check() -> JSONResponse:
+    """503 until the model is loaded and warmed, so probes gate traffic on it."""
+    if is_ready():
+        return JSONResponse({"status": "healthy"})
+    status = "failed" if startup_error() else "starting"
+    return JSONResponse({"status": status}, status_code=503)
+
+
+@router.get("/live", summary="Liveness check")
+async def liveness_check() -> JSONResponse:
+    """200 unless startup failed; overload and warm-up do not make it fail."""
+    if startup_error():
+        return JSONResponse({"status": "failed"}, status_code=503)
+    return JSONResponse({"status": "alive"})
+
+
+@router.get("/startup", summary="Startup phases and memory of this worker")
+def startup_check() -> dict:
+    return startup_report()
@@ -0,0 +1,134 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+
+from app.dependencies.currency import get_uah_to_usd
+from app.dependencies.model_version import MODEL_VERSION_HEADER, resolve_model_version
+from app.dependencies.readiness import require_ready
+from app.routers.predict import NDJSON_MEDIA_TYPE, AttributionsQuery
+from app.schemas.response import JobStatus
+from app.services.jobs import (
+    InvalidJobInput,
+    Job,
+    JobQueueFull,
+    JobTooLarge,
+    get_job_queue,
+)
+
+router = APIRouter(
+    prefix="/jobs",
+    tags=["Asynchronous scoring jobs"],
+    dependencies=[Depends(require_ready)],
+)
+
+
+async def _job(job_id: str) -> Job:
+    job = await get_job_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job {job_id}")
+    return job
+
+
+@router.post(
+    "/",
+    summary="Queue a batch of applicants for scoring",
+    status_code=202,
+    response_model=JobStatus,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "description": (
+                "A JSON array of UserData or one UserData per line (NDJSON)."
+                " NDJSON is spilled to disk as it arrives; JSON arrays are"
+                " read whole first."
+            ),
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "type": "array",
+                        "items": {"$ref": "#/components/schemas/UserData"},
+                    }
+                },
+                NDJSON_MEDIA_TYPE: {
+                    "schema": {"$ref": "#/components/schemas/UserData"}
+                },
+            },
+        }
+    },
+)
+async def submit_job(
+    request: Request,
+    response: Response,
+    version: Annotated[str, Depends(resolve_model_version)],
+    with_attributions: AttributionsQuery = False,
+):
+    # One exchange rate snapshot for the whole job.
+    rate = await get_uah_to_usd()
+    content_type = request.headers.get("content-type", "application/json")
+    try:
+        job = await get_job_queue().submit(
+            request.stream(),
+            ndjson=content_type.startswith(NDJSON_MEDIA_TYPE),
+            version=version,
+            rate=rate,
+            with_attributions=with_attributions,
+        )
+    except JobQueueFull as e:
+        raise HTTPException(
+            status_code=503, detail=str(e), headers={"Retry-After": "30"}
+        ) from e
+    except JobTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e)) from e
+    except InvalidJobInput as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    response.headers["Location"] = f"{router.prefix}/{job.id}"
+    response.headers[MODEL_VERSION_HEADER] = version
+    return job.status()
+
+
+@router.get("/{job_id}", summary="Progress of a scoring job", response_model=JobStatus)
+async def job_status(job_id: str):
+    return (await _job(job_id)).status()
+
+
+@router.get(
+    "/{job_id}/results",
+    summary="Stream a job's results as NDJSON while it runs",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": (
+                'One line per applicant, in input order: {"row": n, ...} with'
+                ' the /predict/batch response fields, or {"row": n, "error":'
+                " ...} for an applicant that failed validation. The stream"
+                " ends when the job finishes."
+            ),
+            "content": {NDJSON_MEDIA_TYPE: {}},
+        }
+    },
+)
+async def job_results(job_id: str):
+    job = await _job(job_id)
+    try:
+        lines = await get_job_queue().results(job.id)
+    except FileNotFoundError as e:
+        raise HTTPException(
+            status_code=410, detail="The job's results were removed"
+        ) from e
+    return StreamingResponse(
+        lines,
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={MODEL_VERSION_HEADER: job.version},
+    )
+
+
+@router.delete(
+    "/{job_id}", summary="Cancel a queued or running job", response_model=JobStatus
+)
+async def cancel_job(job_id: str):
+    job = await get_job_queue().cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job {job_id}")
+    return job.status()
@@ -1,12 +1,58 @@
-from typing import Annotated
-from app.services.feature_importance import FeatureRecommender
-from fastapi import APIRouter, Body, Depends
-from app.models.boost_model import ForwardModel
+import asyncio
+from typing import Annotated, Optional, Sequence
+
+import numpy as np
+from pydantic import TypeAdapter, ValidationError
+from app import config
+from app.services import columnar, scoring
+from app.services.executor import get_inference_executor
+from app.services.features import (
+    build_feature_matrix,
+    convert_matrix_to_usd,
+    user_features,
+    users_to_matrix,
+)
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response
+from fastapi.exceptions import RequestValidationError
 from app.schemas import user
 from app.schemas.response import ResponseWithRecommendation
-from app.dependencies.currency import convert_to_usd
+from app.dependencies.currency import get_uah_to_usd
+from app.dependencies.model_version import MODEL_VERSION_HEADER, resolve_model_version
+from app.dependencies.readiness import require_ready
+from app.services.batching import BatcherOverloaded, get_batcher
+from app.services.drift import get_drift_monitor
+from app.services.prediction_cache import get_prediction_cache, prediction_key
+from app.services.serialization import (
+    ATTRIBUTED_RESPONSE_ADAPTER,
+    ATTRIBUTED_RESPONSES_ADAPTER,
+    RESPONSE_ADAPTER,
+    RESPONSES_ADAPTER,
+    json_bytes_response,
+    json_response,
+)
+from app.services.shadow import get_shadow
+from app.services.timing import mark_handler_start, timed
+
+router = APIRouter(
+    prefix="/predict",
+    tags=["Fico prediction"],
+    dependencies=[Depends(require_ready)],
+)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
 
-router = APIRouter(prefix="/predict", tags=["Fico prediction"])
+_user_list_adapter = TypeAdapter(list[user.UserData])
+
+AttributionsQuery = Annotated[
+    bool,
+    Query(
+        alias="attributions",
+        description=(
+            "Add each applicant's per-feature contributions to the score's"
+            " margin (Saabas attributions unless ATTRIBUTIONS_BACKEND=xgboost)"
+        ),
+    ),
+]
 
 
 @router.post(
@@ -14,24 +60,256 @@ router = APIRouter(prefix="/predict", tags=["Fico prediction"])
     summary="Fico prediction with XGB Boost",
     response_model=ResponseWithRecommendation,
 )
-def predict_xgb_boost(data: Annotated[user.UserData, Body(), Depends(convert_to_usd)]):
-    # Get the input model
-    input_model = user.InputFeatures(**data.model_dump())
+async def predict_xgb_boost(
+    data: Annotated[user.UserData, Body()],
+    rate: Annotated[float, Depends(get_uah_to_usd)],
+    version: Annotated[str, Depends(resolve_model_version)],
+    with_attributions: AttributionsQuery = False,
+):
+    mark_handler_start()
+    with timed("features"):
+        features = user_features(data, rate)
+    headers = {MODEL_VERSION_HEADER: version}
+
+    cache = get_prediction_cache()
+    if cache is not None:
+        key = prediction_key(
+            features[0],
+            version,
+            rate,
+            variant="attributions" if with_attributions else "",
+        )
+        with timed("cache"):
+            body = await cache.get(key)
+        if body is not None:
+            _observe(features)
+            return json_bytes_response(body, headers)
+
+    result = await _score_single(features, version, with_attributions)
+    _observe(features, [result.prediction])
+    _shadow_score(features, version, [result.prediction])
+    adapter = ATTRIBUTED_RESPONSE_ADAPTER if with_attributions else RESPONSE_ADAPTER
+    with timed("serialize"):
+        body = adapter.dump_json(result)
+    if cache is not None:
+        with timed("cache"):
+            await cache.set(key, body)
+    return json_bytes_response(body, headers)
+
+
+async def _score_single(
+    features: np.ndarray, version: str, with_attributions: bool = False
+) -> ResponseWithRecommendation:
+    # Score on the inference executor, or through the micro-batcher if enabled
+    batcher = get_batcher()
+    if batcher is None:
+        executor = get_inference_executor()
+        with timed("inference"):
+            results = await executor.run(
+                scoring.score, features, version, with_attributions
+            )
+        return results[0]
+
+    try:
+        with timed("inference"):
+            return await batcher.submit(features[0], (version, with_attributions))
+    except BatcherOverloaded:
+        raise HTTPException(status_code=503, detail="Too many pending predictions")
+
+
+def _shadow_score(
+    features: np.ndarray, version: str, predictions: Sequence[float]
+) -> None:
+    shadow = get_shadow()
+    if shadow is not None:
+        shadow.submit(features, version, predictions)
+
+
+def _observe(
+    features: np.ndarray, predictions: Optional[Sequence[float]] = None
+) -> None:
+    monitor = get_drift_monitor()
+    if monitor is not None:
+        monitor.observe(features, predictions)
 
-    if any(input_model.model_dump().values()):
-        input_model.home_ownership_ANY = True
-        data.home_ownership_ANY = True
 
-    model_input = list(input_model.model_dump().values())
+# Larger batch bodies are validated in a worker thread, off the event loop.
+_PARSE_INLINE_BYTES = 64 << 10
+
+
+def _count_rows(body: bytes, ndjson: bool) -> int:
+    """Rows in a batch body without validating it; never fewer than it holds."""
+    if ndjson:
+        return sum(1 for line in body.splitlines() if line.strip())
+    # `UserData` rows are flat objects, so each one opens exactly one brace.
+    return body.count(b"{")
+
+
+def _parse_batch(body: bytes, content_type: str) -> list[user.UserData]:
+    if not content_type.startswith(NDJSON_MEDIA_TYPE):
+        try:
+            return _user_list_adapter.validate_json(body)
+        except ValidationError as e:
+            raise RequestValidationError(
+                [{**err, "loc": ("body", *err["loc"])} for err in e.errors()]
+            ) from e
+
+    users, errors = [], []
+    for i, line in enumerate(line for line in body.splitlines() if line.strip()):
+        try:
+            users.append(user.UserData.model_validate_json(line))
+        except ValidationError as e:
+            errors += [{**err, "loc": ("body", i, *err["loc"])} for err in e.errors()]
+    if errors:
+        raise RequestValidationError(errors)
+    return users
+
+
+@router.post(
+    "/batch",
+    summary="Batch Fico prediction with XGB Boost",
+    response_model=list[ResponseWithRecommendation],
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "type": "array",
+                        "items": {"$ref": "#/components/schemas/UserData"},
+                    }
+                },
+                NDJSON_MEDIA_TYPE: {
+                    "schema": {"$ref": "#/components/schemas/UserData"}
+                },
+            },
+        }
+    },
+)
+async def predict_xgb_boost_batch(
+    request: Request,
+    version: Annotated[str, Depends(resolve_model_version)],
+    with_attributions: AttributionsQuery = False,
+):
+    mark_handler_start()
+    content_type = request.headers.get("content-type", "application/json")
+    ndjson = content_type.startswith(NDJSON_MEDIA_TYPE)
+    body = await request.body()
+    if _count_rows(body, ndjson) > config.PREDICT_BATCH_MAX_ROWS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch is limited to {config.PREDICT_BATCH_MAX_ROWS} rows",
+        )
+    with timed("validation"):
+        if len(body) > _PARSE_INLINE_BYTES:
+            users = await asyncio.to_thread(_parse_batch, body, content_type)
+        else:
+            users = _parse_batch(body, content_type)
+
+    rate = await get_uah_to_usd()
+    with timed("features"):
+        features = build_feature_matrix(
+            convert_matrix_to_usd(users_to_matrix(users), rate)
+        )
+    with timed("inference"):
+        results = await get_inference_executor().run(
+            scoring.score, features, version, with_attributions
+        )
+    predictions = [result.prediction for result in results]
+    _observe(features, predictions)
+    _shadow_score(features, version, predictions)
+
+    headers = {MODEL_VERSION_HEADER: version}
+    with timed("serialize"):
+        if ndjson:
+            adapter = (
+                ATTRIBUTED_RESPONSE_ADAPTER if with_attributions else RESPONSE_ADAPTER
+            )
+            lines = [adapter.dump_json(result) for result in results]
+            return Response(
+                b"\n".join(lines) + b"\n",
+                media_type=NDJSON_MEDIA_TYPE,
+                headers=headers,
+            )
+        adapter = (
+            ATTRIBUTED_RESPONSES_ADAPTER if with_attributions else RESPONSES_ADAPTER
+        )
+        return json_response(adapter, results, headers)
+
+
+@router.post(
+    "/columnar",
+    summary="Batch Fico prediction from binary columns",
+    response_class=Response,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "description": (
+                "One column per UserData field, as a 1-D structured NumPy array"
+                " (.npy) or an Arrow IPC stream. The response uses the same"
+                " format, with an int64 `prediction` column holding the"
+                " /predict/batch predictions."
+            ),
+            "content": {
+                media_type: {"schema": {"type": "string", "format": "binary"}}
+                for media_type in columnar.MEDIA_TYPES
+            },
+        },
+        "responses": {
+            "200": {
+                "content": {
+                    media_type: {"schema": {"type": "string", "format": "binary"}}
+                    for media_type in columnar.MEDIA_TYPES
+                }
+            }
+        },
+    },
+)
+async def predict_xgb_boost_columnar(
+    request: Request,
+    version: Annotated[str, Depends(resolve_model_version)],
+):
+    mark_handler_start()
+    media_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if media_type not in columnar.MEDIA_TYPES:
+        raise HTTPException(
+            status_code=415,
+            detail=f"Expected one of {', '.join(columnar.MEDIA_TYPES)}",
+        )
 
-    # Get the prediction
-    boost = ForwardModel()
-    prediction = boost.predict([model_input])
+    body = await request.body()
+    with timed("validation"):
+        try:
+            columns = columnar.read_columns(body, media_type)
+        except columnar.ColumnarFormatUnavailable as e:
+            raise HTTPException(status_code=415, detail=str(e)) from e
+        except columnar.ColumnarFormatError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+        if len(next(iter(columns.values()))) > config.PREDICT_COLUMNAR_MAX_ROWS:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Batch is limited to {config.PREDICT_COLUMNAR_MAX_ROWS} rows",
+            )
+        errors = columnar.validate_columns(columns)
+    if errors:
+        raise RequestValidationError(errors)
 
-    # Get the recommendations
-    recommender = FeatureRecommender(input_model.model_dump().keys())
-    recommendations = recommender.analyze_features(input_model.model_dump())
+    rate = await get_uah_to_usd()
+    with timed("features"):
+        features = columnar.feature_matrix(columns, rate)
+    predictions = np.empty(0, dtype=np.int64)
+    if len(features):
+        with timed("inference"):
+            scores = await get_inference_executor().run(
+                scoring.predict, features, version
+            )
+        # Truncated like `int(prediction)` in the JSON responses.
+        predictions = np.asarray(scores).astype(np.int64)
+        _observe(features, predictions)
+        _shadow_score(features, version, predictions)
 
-    return ResponseWithRecommendation(
-        prediction=int(prediction[0]), recommendations=recommendations
+    with timed("serialize"):
+        content = columnar.write_columns({"prediction": predictions}, media_type)
+    return Response(
+        content, media_type=media_type, headers={MODEL_VERSION_HEADER: version}
     )
@@ -1,18 +1,63 @@
 from typing import Annotated
-from fastapi import APIRouter, Body
+from fastapi import APIRouter, Body, Depends
+from app.dependencies.currency import get_uah_to_usd
+from app.dependencies.model_version import MODEL_VERSION_HEADER, resolve_model_version
+from app.dependencies.readiness import require_ready
+from app.schemas.response import WhatIfResponse
 from app.schemas.user import UserData
-from app.services.feature_importance import FeatureRecommender
+from app.services import scoring
+from app.services.executor import get_inference_executor
+from app.services.features import users_to_matrix
+from app.services.serialization import (
+    RECOMMENDATIONS_ADAPTER,
+    WHATIF_ADAPTER,
+    json_response,
+)
+from app.services.timing import mark_handler_start, timed
 
 router = APIRouter(
-    prefix="/recommend", tags=["Recomendations on how to imporve your Fico score"]
+    prefix="/recommend",
+    tags=["Recomendations on how to imporve your Fico score"],
+    dependencies=[Depends(require_ready)],
 )
 
 
 @router.post("/", summary="Reccomendation based on Fico score")
-def predict_xgb_recommendation(data: Annotated[UserData, Body()]):
+async def predict_xgb_recommendation(
+    data: Annotated[UserData, Body()],
+    version: Annotated[str, Depends(resolve_model_version)],
+):
+    mark_handler_start()
     user_data = data.model_dump()
 
-    recommender = FeatureRecommender(data.model_dump().keys())
-    recommendations = recommender.analyze_features(user_data)
+    with timed("inference"):
+        recommendations = await get_inference_executor().run(
+            scoring.recommend_user, user_data, version
+        )
+
+    with timed("serialize"):
+        return json_response(
+            RECOMMENDATIONS_ADAPTER,
+            recommendations,
+            {MODEL_VERSION_HEADER: version},
+        )
+
+
+@router.post(
+    "/whatif",
+    summary="Predicted Fico score change for each recommended action",
+    response_model=WhatIfResponse,
+)
+async def predict_xgb_whatif(
+    data: Annotated[UserData, Body()],
+    rate: Annotated[float, Depends(get_uah_to_usd)],
+    version: Annotated[str, Depends(resolve_model_version)],
+):
+    mark_handler_start()
+    raw = users_to_matrix([data])[0]
+
+    with timed("inference"):
+        result = await get_inference_executor().run(scoring.whatif, raw, rate, version)
 
-    return recommendations
+    with timed("serialize"):
+        return json_response(WHATIF_ADAPTER, result, {MODEL_VERSION_HEADER: version})
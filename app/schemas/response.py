@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseModel
 
 
@@ -5,6 +7,8 @@ class Recommendation(BaseModel):
     feat_name: str
     current_value: float
     target_value: float
+    # The applicant's share of |attributions|, or the model's global
+    # importance when RECOMMEND_BY_ATTRIBUTIONS is off.
     importance: float
     impact: float
     message: str
@@ -17,3 +21,51 @@ class NotNeedImprovement(BaseModel):
 class ResponseWithRecommendation(BaseModel):
     prediction: float
     recommendations: list[Recommendation] | NotNeedImprovement
+
+
+class ResponseWithAttributions(ResponseWithRecommendation):
+    # Per-feature contributions to the model's margin; they sum to it with
+    # base_value. Saabas attributions, or TreeSHAP with ATTRIBUTIONS_BACKEND=xgboost.
+    attributions: dict[str, float]
+    base_value: float
+
+
+class WhatIfStep(BaseModel):
+    value: float
+    prediction: float
+    delta: float
+
+
+class WhatIfAction(BaseModel):
+    feature: str
+    feat_name: str
+    field: str
+    current_value: float
+    target_value: float
+    delta: float
+    steps: list[WhatIfStep]
+
+
+class WhatIfPlan(BaseModel):
+    features: list[str]
+    prediction: float
+    delta: float
+
+
+class WhatIfResponse(BaseModel):
+    prediction: float
+    actions: list[WhatIfAction]
+    plan: WhatIfPlan
+
+
+class JobStatus(BaseModel):
+    id: str
+    state: str
+    version: str
+    rows_total: int
+    rows_done: int
+    errors: int
+    created: float
+    started: Optional[float]
+    finished: Optional[float]
+    error: Optional[str]
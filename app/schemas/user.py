@@ -27,6 +27,36 @@ class UserData(BaseModel):
     home_ownership_NONE: bool = Field(default=False)
 
 
+MODEL_FEATURES = [
+    "bc_open_to_buy",
+    "revol_util",
+    "pct_tl_nvr_dlq",
+    "number_of_derogatory_records",
+    "number_of_collections",
+    "mo_sin_old_rev_tl_op",
+    "num_actv_rev_tl",
+    "total_credit_limit",
+    "accounts_with_75_percent_limit",
+    "credits_overdue_120_days",
+    "mo_sin_rcnt_rev_tl_op",
+    "total_accounts",
+    "mo_sin_old_il_acct",
+    "credits_taken_last_2_years",
+    "total_il_high_credit_limit",
+    "bc_util",
+    "dti",
+    "avg_cur_bal",
+    "total_income",
+    "credits_overdue_30_days",
+    "home_ownership_RENT",
+    "home_ownership_MORTGAGE",
+    "home_ownership_OWN",
+    "home_ownership_ANY",
+    "home_ownership_OTHER",
+    "home_ownership_NONE",
+]
+
+
 class InputFeatures(UserData):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -122,32 +152,4 @@ class InputFeatures(UserData):
 
     def model_dump(self, **kwargs) -> Dict[str, Any]:
         data = super().model_dump(**kwargs)
-        ordered_fields = [
-            "bc_open_to_buy",
-            "revol_util",
-            "pct_tl_nvr_dlq",
-            "number_of_derogatory_records",
-            "number_of_collections",
-            "mo_sin_old_rev_tl_op",
-            "num_actv_rev_tl",
-            "total_credit_limit",
-            "accounts_with_75_percent_limit",
-            "credits_overdue_120_days",
-            "mo_sin_rcnt_rev_tl_op",
-            "total_accounts",
-            "mo_sin_old_il_acct",
-            "credits_taken_last_2_years",
-            "total_il_high_credit_limit",
-            "bc_util",
-            "dti",
-            "avg_cur_bal",
-            "total_income",
-            "credits_overdue_30_days",
-            "home_ownership_RENT",
-            "home_ownership_MORTGAGE",
-            "home_ownership_OWN",
-            "home_ownership_ANY",
-            "home_ownership_OTHER",
-            "home_ownership_NONE",
-        ]
-        return {k: data[k] for k in ordered_fields}
+        return {k: data[k] for k in MODEL_FEATURES}
@@ -0,0 +1,128 @@
+"""Pre-fork server: load the model once, then fork uvicorn workers that share it.
+
+    python -m app.server --workers 4 --preload [--host 0.0.0.0 --port 80]
+
+With `--preload` the parent imports the app, loads and warms every model
+version and freezes the garbage collector before forking, so the workers
+start warm and share the model pages copy-on-write. Without it each worker
+imports and loads everything itself, like `uvicorn --workers`. Workers
+that exit unexpectedly are replaced.
+"""
+
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+
+import uvicorn
+
+from app import config
+
+logger = logging.getLogger("app.server")
+
+
+def _bind(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _run_worker(sock: socket.socket, args: argparse.Namespace) -> None:
+    # The parent's signal handlers must not leak into the worker.
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    server = uvicorn.Server(
+        uvicorn.Config("app.main:app", log_level=args.log_level, access_log=False)
+    )
+    server.run(sockets=[sock])
+
+
+def _spawn(sock: socket.socket, args: argparse.Namespace) -> int:
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            _run_worker(sock, args)
+        except BaseException:
+            logger.exception("Worker %d crashed", os.getpid())
+            code = 1
+        finally:
+            os._exit(code)
+    return pid
+
+
+def _preload() -> None:
+    from app.models.registry import get_registry
+    from app.services.startup import memory_usage, preload
+
+    import app.main  # noqa: F401  (imported once here, shared by the workers)
+
+    # Booster calls in the parent must not start an OpenMP pool before fork.
+    get_registry().set_nthread(config.INFERENCE_NTHREAD)
+    started = time.perf_counter()
+    preload()
+    logger.info(
+        "Preloaded models in %.2fs (rss %.0f MB)",
+        time.perf_counter() - started,
+        memory_usage().get("rss_mb", float("nan")),
+    )
+    # Keep the collector from touching (and so copying) every inherited object.
+    gc.collect()
+    gc.freeze()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "80")))
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--preload", action="store_true")
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=args.log_level.upper(), format="%(levelname)s %(name)s: %(message)s"
+    )
+    sock = _bind(args.host, args.port)
+    if args.preload:
+        _preload()
+
+    workers = {_spawn(sock, args) for _ in range(args.workers)}
+    logger.info("Started %d workers: %s", len(workers), sorted(workers))
+
+    stopping = False
+
+    def stop(signum, frame) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    while workers:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        workers.discard(pid)
+        if not stopping:
+            logger.warning("Worker %d exited with status %d; replacing it", pid, status)
+            workers.add(_spawn(sock, args))
+    sock.close()
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""Admission control and load shedding for the scoring routes.
+
+At most `max_concurrent` scoring requests run at once; the rest wait in a
+bounded FIFO queue. Every request has a deadline, from its
+`X-Request-Timeout` header (seconds) or `ADMISSION_DEFAULT_TIMEOUT`. It is
+refused at once with 503 and Retry-After when the queue is full or the
+expected wait already exceeds the deadline, and with 503 if the deadline
+passes while it is queued. The deadline only covers admission; a request
+that got a slot runs to completion. Optional per-client token buckets
+answer 429. `AdmissionMiddleware` decides before the body is read, so
+shedding load is cheap and /health never waits behind scoring.
+"""
+
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from typing import Optional
+
+from fastapi.responses import JSONResponse
+
+from app import config
+from app.services.metrics import REGISTRY
+from app.services.timing import timed
+
+ADMITTED_PATHS = ("/predict", "/recommend")
+TIMEOUT_HEADER = "X-Request-Timeout"
+
+IN_FLIGHT = REGISTRY.gauge(
+    "fico_admission_in_flight",
+    "Scoring requests currently holding an admission slot.",
+)
+QUEUED = REGISTRY.gauge(
+    "fico_admission_queued",
+    "Scoring requests waiting for an admission slot.",
+)
+QUEUE_WAIT = REGISTRY.histogram(
+    "fico_admission_queue_wait_seconds",
+    "Time admitted requests waited for a slot.",
+)
+REJECTED = REGISTRY.counter(
+    "fico_admission_rejected_total",
+    "Scoring requests refused by admission control.",
+    ("reason",),
+)
+
+
+class Rejected(Exception):
+    """Raised when a request is not admitted."""
+
+    def __init__(self, status: int, reason: str, detail: str, retry_after: float):
+        super().__init__(detail)
+        self.status = status
+        self.reason = reason
+        self.detail = detail
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+class TokenBucket:
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self) -> float:
+        """Take one token; returns 0, or the seconds until one is available."""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class AdmissionController:
+    """Concurrency cap, deadline-aware wait queue and per-client rate limits."""
+
+    def __init__(
+        self,
+        max_concurrent: int = config.ADMISSION_MAX_CONCURRENT,
+        max_queue: int = config.ADMISSION_QUEUE_SIZE,
+        client_rate: float = config.ADMISSION_CLIENT_RATE,
+        client_burst: float = config.ADMISSION_CLIENT_BURST,
+        max_clients: int = 10_000,
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.client_rate = client_rate
+        self.client_burst = client_burst
+        self.max_clients = max_clients
+        self.in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._buckets: OrderedDict[str, TokenBucket] = OrderedDict()
+        # Moving average of how long a request holds its slot.
+        self._service_seconds = 0.0
+
+    def expected_wait(self, position: int) -> float:
+        """Seconds until the request at `position` in the queue gets a slot."""
+        return (position + 1) * self._service_seconds / self.max_concurrent
+
+    def check_rate(self, client: str) -> None:
+        if self.client_rate <= 0:
+            return
+        bucket = self._buckets.get(client)
+        if bucket is None:
+            bucket = self._buckets[client] = TokenBucket(
+                self.client_rate, self.client_burst
+            )
+            if len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(client)
+        wait = bucket.take()
+        if wait:
+            raise Rejected(429, "rate_limit", "Too many requests", wait)
+
+    async def acquire(self, timeout: float) -> None:
+        """Take a slot within `timeout` seconds or raise `Rejected`."""
+        if self.in_flight < self.max_concurrent and not self._waiters:
+            self._take()
+            return
+
+        position = len(self._waiters)
+        wait = self.expected_wait(position)
+        if position >= self.max_queue:
+            raise Rejected(503, "queue_full", "The service is overloaded", wait)
+        if wait + self._service_seconds > timeout:
+            raise Rejected(503, "deadline", "The request deadline cannot be met", wait)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        QUEUED.set(len(self._waiters))
+        start = time.perf_counter()
+        try:
+            with timed("queue"):
+                await asyncio.wait_for(waiter, timeout)
+        except BaseException as e:
+            if waiter.done() and not waiter.cancelled():
+                # A slot was handed over just as the wait ended; give it back.
+                self.release(0.0)
+            else:
+                waiter.cancel()
+                self._remove(waiter)
+            QUEUED.set(len(self._waiters))
+            if isinstance(e, asyncio.TimeoutError):
+                raise Rejected(
+                    503,
+                    "deadline",
+                    "The request deadline passed while queued",
+                    self.expected_wait(len(self._waiters)),
+                ) from None
+            raise
+        QUEUE_WAIT.observe(time.perf_counter() - start)
+
+    def release(self, held_seconds: float) -> None:
+        """Return a slot, handing it straight to the oldest live waiter."""
+        if held_seconds:
+            self._service_seconds += 0.1 * (held_seconds - self._service_seconds)
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # The slot moves to the waiter; in_flight stays the same.
+                waiter.set_result(None)
+                QUEUED.set(len(self._waiters))
+                return
+        self.in_flight -= 1
+        IN_FLIGHT.set(self.in_flight)
+
+    def _take(self) -> None:
+        self.in_flight += 1
+        IN_FLIGHT.set(self.in_flight)
+
+    def _remove(self, waiter: asyncio.Future) -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+
+def _header(scope: dict, name: bytes) -> Optional[str]:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def request_timeout(scope: dict) -> float:
+    """The request's deadline in seconds, from its timeout header if valid."""
+    value = _header(scope, TIMEOUT_HEADER.lower().encode())
+    try:
+        timeout = float(value) if value is not None else math.nan
+    except ValueError:
+        timeout = math.nan
+    if not timeout > 0:
+        timeout = config.ADMISSION_DEFAULT_TIMEOUT
+    return min(timeout, config.ADMISSION_MAX_TIMEOUT)
+
+
+def client_key(scope: dict) -> str:
+    client = _header(scope, config.ADMISSION_CLIENT_HEADER.lower().encode())
+    if client:
+        return client
+    peer = scope.get("client")
+    return peer[0] if peer else ""
+
+
+class AdmissionMiddleware:
+    """Pure ASGI middleware applying `AdmissionController` to `ADMITTED_PATHS`."""
+
+    def __init__(self, app, enabled: bool = config.ADMISSION_CONTROL):
+        self.app = app
+        self.enabled = enabled
+
+    async def __call__(self, scope, receive, send):
+        if (
+            not self.enabled
+            or scope["type"] != "http"
+            or scope["method"] == "OPTIONS"
+            or not scope["path"].startswith(ADMITTED_PATHS)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        controller = get_admission_controller()
+        try:
+            controller.check_rate(client_key(scope))
+            await controller.acquire(request_timeout(scope))
+        except Rejected as e:
+            REJECTED.labels(e.reason).inc()
+            response = JSONResponse(
+                {"detail": e.detail},
+                status_code=e.status,
+                headers={"Retry-After": str(e.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.release(time.perf_counter() - start)
+
+
+_controller: Optional[AdmissionController] = None
+
+
+def get_admission_controller() -> AdmissionController:
+    global _controller
+    if _controller is None:
+        _controller = AdmissionController()
+    return _controller
+
+
+def set_admission_controller(controller: Optional[AdmissionController]) -> None:
+    global _controller
+    _controller = controller
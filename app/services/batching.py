@@ -0,0 +1,162 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Hashable, Optional, Sequence
+
+import numpy as np
+
+from app import config
+from app.services.metrics import REGISTRY
+
+BATCH_SIZE = REGISTRY.histogram(
+    "fico_batch_size",
+    "Rows per booster call issued by the micro-batcher.",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512),
+)
+QUEUE_WAIT = REGISTRY.histogram(
+    "fico_batch_queue_wait_seconds",
+    "Time a row waited in the micro-batcher before its booster call started.",
+)
+REJECTED = REGISTRY.counter(
+    "fico_batch_rejected_total",
+    "Rows rejected because the micro-batcher queue was full.",
+)
+
+
+class BatcherOverloaded(Exception):
+    """Raised when the micro-batcher queue is full."""
+
+
+class MicroBatcher:
+    """Coalesces concurrent single-row requests into one scoring call.
+
+    Rows are submitted with a `key` (the model version and any scoring
+    options); rows with equal keys share one `predict(matrix, key)` call,
+    which returns one result per row.
+
+    A batch is flushed when it reaches `max_batch_size` rows or when the
+    oldest row has waited `max_wait_us` microseconds, whichever comes first.
+    At most `max_concurrent_batches` booster calls run at once; while they
+    are all busy, new rows keep accumulating into the next batch.
+    """
+
+    def __init__(
+        self,
+        predict: Callable[[np.ndarray, Hashable], Awaitable[Sequence]],
+        max_batch_size: int = config.BATCHING_MAX_SIZE,
+        max_wait_us: int = config.BATCHING_MAX_WAIT_US,
+        max_queue_size: int = config.BATCHING_QUEUE_SIZE,
+        max_concurrent_batches: int = config.INFERENCE_WORKERS,
+    ):
+        self.predict = predict
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_us / 1_000_000
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self._slots = asyncio.Semaphore(max_concurrent_batches)
+        self._task: Optional[asyncio.Task] = None
+        self._inflight: set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for task in list(self._inflight):
+            task.cancel()
+        while not self._queue.empty():
+            _, _, future, _ = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Micro-batcher stopped"))
+
+    async def submit(self, row: Sequence[float], key: Hashable) -> Any:
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((row, key, future, time.perf_counter()))
+        except asyncio.QueueFull:
+            REJECTED.inc()
+            raise BatcherOverloaded() from None
+        return await future
+
+    async def _collect(self) -> list:
+        batch = [await self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            await self._slots.acquire()
+            batch = await self._collect()
+            task = asyncio.create_task(self._flush(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _flush(self, batch: list) -> None:
+        try:
+            started = time.perf_counter()
+            for _, _, _, enqueued in batch:
+                QUEUE_WAIT.observe(started - enqueued)
+            BATCH_SIZE.observe(len(batch))
+
+            # Rows for different model versions or options cannot share a call.
+            by_key: dict[Hashable, list] = {}
+            for item in batch:
+                by_key.setdefault(item[1], []).append(item)
+            for key, items in by_key.items():
+                await self._predict(key, items)
+        finally:
+            self._slots.release()
+
+    async def _predict(self, key: Hashable, items: list) -> None:
+        try:
+            matrix = np.array([row for row, _, _, _ in items], dtype=np.float64)
+            predictions = await self.predict(matrix, key)
+        except Exception as e:
+            for _, _, future, _ in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, _, future, _), prediction in zip(items, predictions):
+            if not future.done():
+                future.set_result(prediction)
+
+
+_batcher: Optional[MicroBatcher] = None
+
+
+def get_batcher() -> Optional[MicroBatcher]:
+    """The process-wide batcher, or None when batching is disabled."""
+    return _batcher
+
+
+async def start_batcher(
+    predict: Callable[[np.ndarray, Hashable], Awaitable[Sequence]],
+) -> None:
+    global _batcher
+    if config.BATCHING_ENABLED and _batcher is None:
+        _batcher = MicroBatcher(predict)
+        await _batcher.start()
+
+
+async def stop_batcher() -> None:
+    global _batcher
+    if _batcher is not None:
+        await _batcher.stop()
+        _batcher = None
@@ -0,0 +1,271 @@
+"""Score a CSV or Parquet file of applicants offline, without the HTTP API.
+
+    python -m app.services.bulk_scoring applicants.csv scores.csv [--rate 41.5]
+
+Rows are read in chunks and scored on a process pool that loads the model
+once per worker; at most two chunks per worker are in flight, so memory
+stays bounded whatever the input size. Every chunk goes through the same
+feature code as /predict/batch, with one exchange rate snapshot per run.
+Rows that fail `UserData` validation are written with an `error` instead
+of a prediction, so output rows line up with input rows.
+"""
+
+import argparse
+import csv
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+from pydantic import ValidationError
+
+from app import config
+from app.models.registry import get_registry
+from app.services import scoring
+from app.services.exchange_rate import fetch_rate_snapshot
+from app.services.features import (
+    build_feature_matrix,
+    convert_matrix_to_usd,
+    users_to_matrix,
+)
+from app.services.records import (
+    DEFAULT_CHUNK_SIZE,
+    error_message,
+    import_pyarrow,
+    is_parquet,
+    read_records,
+    validate_record,
+)
+from app.services.serialization import RESPONSE_ADAPTER
+
+DEFAULT_TOP_N = 3
+
+
+def output_columns(top_n: int, id_column: Optional[str] = None) -> list[str]:
+    columns = [id_column or "row", "prediction", "error"]
+    for i in range(1, top_n + 1):
+        columns += [f"feature_{i}", f"target_{i}", f"impact_{i}"]
+    return columns
+
+
+def score_chunk(
+    records: list[dict],
+    first_row: int,
+    rate: float,
+    version: Optional[str] = None,
+    top_n: int = DEFAULT_TOP_N,
+    id_column: Optional[str] = None,
+) -> list[list]:
+    """Output rows for one chunk of input records, in input order."""
+    users, valid, rows = [], [], []
+    for offset, record in enumerate(records):
+        key = record.get(id_column) if id_column else first_row + offset
+        try:
+            users.append(validate_record(record))
+            valid.append(offset)
+            rows.append([key, None, None])
+        except ValidationError as e:
+            rows.append([key, None, error_message(e)])
+
+    if users:
+        features = build_feature_matrix(
+            convert_matrix_to_usd(users_to_matrix(users), rate)
+        )
+        # Serialized like the /predict response body, so the values match it.
+        for offset, response in zip(valid, scoring.score(features, version)):
+            body = RESPONSE_ADAPTER.dump_python(response, mode="json")
+            rows[offset][1] = body["prediction"]
+            if isinstance(body["recommendations"], list):
+                for item in body["recommendations"][:top_n]:
+                    rows[offset] += [
+                        item["feat_name"],
+                        item["target_value"],
+                        item["impact"],
+                    ]
+
+    width = 3 + 3 * top_n
+    for row in rows:
+        row += [None] * (width - len(row))
+    return rows
+
+
+def _init_worker(version: str, nthread: int) -> None:
+    registry = get_registry()
+    registry.set_nthread(nthread)
+    registry.get(version)
+
+
+class _InlineExecutor(Executor):
+    """Runs submissions immediately; used for a single worker."""
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future: Future = Future()
+        future.set_result(fn(*args, **kwargs))
+        return future
+
+
+def _chunks(records: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class _CsvWriter:
+    def __init__(self, path: str, columns: list[str], id_column: Optional[str]):
+        self._file = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(columns)
+
+    def write(self, rows: list[list]) -> None:
+        self._writer.writerows(rows)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _ParquetWriter:
+    def __init__(self, path: str, columns: list[str], id_column: Optional[str]):
+        self._pa = import_pyarrow()
+        self._columns = columns
+        self._id_is_text = id_column is not None
+        # Spelled out: inferred from the first chunk, a column that happens
+        # to be all None there (no errors yet) would be typed null.
+        self._schema = self._pa.schema(
+            [(columns[0], self._pa.string() if id_column else self._pa.int64())]
+            + [(name, self._column_type(name)) for name in columns[1:]]
+        )
+        self._writer = self._pa.parquet.ParquetWriter(path, self._schema)
+
+    def _column_type(self, name: str):
+        if name == "prediction":
+            return self._pa.int64()
+        if name.startswith(("target_", "impact_")):
+            return self._pa.float64()
+        return self._pa.string()
+
+    def write(self, rows: list[list]) -> None:
+        columns = {
+            name: list(values) for name, values in zip(self._columns, zip(*rows))
+        }
+        if self._id_is_text:
+            ids = columns[self._columns[0]]
+            columns[self._columns[0]] = [None if v is None else str(v) for v in ids]
+        table = self._pa.Table.from_pydict(columns, schema=self._schema)
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+def score_file(
+    input_path: str,
+    output_path: str,
+    rate: float,
+    version: Optional[str] = None,
+    workers: int = config.INFERENCE_WORKERS,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    top_n: int = DEFAULT_TOP_N,
+    id_column: Optional[str] = None,
+) -> dict:
+    """Stream `input_path` through the model into `output_path`; returns a summary."""
+    # Resolved once, so a promotion during the run cannot mix versions.
+    version = get_registry().resolve(version)
+    if workers > 1:
+        pool: Executor = ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(version, 1)
+        )
+    else:
+        _init_worker(version, config.INFERENCE_NTHREAD)
+        pool = _InlineExecutor()
+
+    columns = output_columns(top_n, id_column)
+    writer_cls = _ParquetWriter if is_parquet(output_path) else _CsvWriter
+    writer = writer_cls(output_path, columns, id_column)
+    pending: deque[Future] = deque()
+    rows = errors = 0
+    started = time.perf_counter()
+
+    def drain(limit: int) -> None:
+        nonlocal rows, errors
+        while len(pending) > limit:
+            chunk_rows = pending.popleft().result()
+            writer.write(chunk_rows)
+            rows += len(chunk_rows)
+            errors += sum(row[2] is not None for row in chunk_rows)
+
+    try:
+        first_row = 0
+        for chunk in _chunks(read_records(input_path, chunk_size), chunk_size):
+            pending.append(
+                pool.submit(
+                    score_chunk, chunk, first_row, rate, version, top_n, id_column
+                )
+            )
+            first_row += len(chunk)
+            drain(2 * max(workers, 1))
+        drain(0)
+    finally:
+        writer.close()
+        pool.shutdown(cancel_futures=True)
+
+    seconds = time.perf_counter() - started
+    return {
+        "rows": rows,
+        "errors": errors,
+        "rate": rate,
+        "version": version,
+        "seconds": seconds,
+        "rows_per_second": rows / seconds if seconds else float("nan"),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", help="CSV or Parquet file with UserData columns")
+    parser.add_argument("output", help="CSV or Parquet file to write")
+    parser.add_argument(
+        "--rate",
+        type=float,
+        help="UAH per USD; by default fetched once from the FX backend",
+    )
+    parser.add_argument("--version", help="Model version; the default if omitted")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--top-n", type=int, default=DEFAULT_TOP_N)
+    parser.add_argument(
+        "--id-column", help="Input column copied to the output instead of row numbers"
+    )
+    args = parser.parse_args()
+
+    rate = args.rate if args.rate is not None else fetch_rate_snapshot()
+    if not np.isfinite(rate) or rate <= 0:
+        raise SystemExit(f"Invalid exchange rate {rate!r}")
+
+    summary = score_file(
+        args.input,
+        args.output,
+        rate,
+        version=args.version,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        top_n=args.top_n,
+        id_column=args.id_column,
+    )
+    print(
+        f"Scored {summary['rows']} rows ({summary['errors']} invalid) with model "
+        f"{summary['version']} at {summary['rate']} UAH/USD in {summary['seconds']:.1f}s "
+        f"({summary['rows_per_second']:.0f} rows/s)",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""Columnar binary batches: NumPy `.npy` structured arrays and Arrow IPC streams.
+
+A request body holds one column per `UserData` field. Columns are read as
+views of the body where the dtype allows (float64 columns are never
+copied), validated with array-wide checks instead of per-row models, and
+turned into model features with `build_feature_columns`. Responses use the
+request's format, with a `prediction` column in input row order.
+"""
+
+import io
+from typing import Optional
+
+import numpy as np
+
+from app.dependencies.currency import currency_fields
+from app.schemas.user import UserData
+from app.services.features import USER_FIELDS, build_feature_columns
+
+NPY_MEDIA_TYPE = "application/x-npy"
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+MEDIA_TYPES = (NPY_MEDIA_TYPE, ARROW_STREAM_MEDIA_TYPE)
+
+
+class ColumnarFormatError(ValueError):
+    """Raised when a body is not a readable `.npy` or Arrow IPC stream."""
+
+
+class ColumnarFormatUnavailable(ColumnarFormatError):
+    """Raised for Arrow bodies when pyarrow is not installed."""
+
+
+def _constraints() -> dict[str, tuple[type, Optional[float], bool]]:
+    """(type, lower bound, required) per field, from the `UserData` schema."""
+    constraints = {}
+    for name, field in UserData.model_fields.items():
+        ge = next((m.ge for m in field.metadata if hasattr(m, "ge")), None)
+        constraints[name] = (field.annotation, ge, field.is_required())
+    return constraints
+
+
+_CONSTRAINTS = _constraints()
+
+
+def read_npy(body: bytes) -> dict[str, np.ndarray]:
+    """Columns of a 1-D structured array in `.npy` format, without copying."""
+    buffer = io.BytesIO(body)
+    try:
+        version = np.lib.format.read_magic(buffer)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(buffer)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(buffer)
+    except ValueError as e:
+        raise ColumnarFormatError(f"Invalid .npy body: {e}") from e
+    if dtype.names is None or len(shape) != 1 or dtype.hasobject:
+        raise ColumnarFormatError(
+            "Expected a 1-D structured array with one numeric field per column"
+        )
+    try:
+        array = np.frombuffer(body, dtype=dtype, count=shape[0], offset=buffer.tell())
+    except ValueError as e:
+        raise ColumnarFormatError(f"Invalid .npy body: {e}") from e
+    return {name: array[name] for name in dtype.names}
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+    except ImportError as e:
+        raise ColumnarFormatUnavailable(
+            "Arrow bodies need pyarrow on the server"
+        ) from e
+    return pyarrow
+
+
+def read_arrow(body: bytes) -> dict[str, np.ndarray]:
+    """Columns of an Arrow IPC stream; zero-copy for numeric columns without nulls."""
+    pa = _import_pyarrow()
+    try:
+        table = pa.ipc.open_stream(pa.py_buffer(body)).read_all()
+    except pa.ArrowInvalid as e:
+        raise ColumnarFormatError(f"Invalid Arrow stream: {e}") from e
+    columns = {}
+    for name in table.column_names:
+        column = table.column(name)
+        if column.null_count:
+            # Nulls become NaN, which validation reports as a missing value.
+            column = column.cast(pa.float64())
+        columns[name] = column.to_numpy()
+    return columns
+
+
+def validate_columns(columns: dict[str, np.ndarray]) -> list[dict]:
+    """`UserData` checks over whole columns; errors look like pydantic's.
+
+    Each failing column is reported once, at its first offending row.
+    """
+    errors = []
+    lengths = {len(values) for values in columns.values()}
+    if len(lengths) > 1:
+        return [
+            {
+                "type": "value_error",
+                "loc": ("body",),
+                "msg": "All columns must have the same length",
+                "input": None,
+            }
+        ]
+
+    for name, (annotation, ge, required) in _CONSTRAINTS.items():
+        if name not in columns:
+            if required:
+                errors.append(
+                    {
+                        "type": "missing",
+                        "loc": ("body", name),
+                        "msg": "Field required",
+                        "input": None,
+                    }
+                )
+            continue
+        values = columns[name]
+        if values.dtype.kind not in "biuf":
+            errors.append(
+                {
+                    "type": "float_type",
+                    "loc": ("body", name),
+                    "msg": f"Column must be numeric, not {values.dtype}",
+                    "input": None,
+                }
+            )
+            continue
+
+        checks = [(~np.isfinite(values), "finite_number", "Input should be a number")]
+        if annotation is bool:
+            checks.append(
+                (
+                    (values != 0) & (values != 1),
+                    "bool_parsing",
+                    "Input should be 0 or 1",
+                )
+            )
+        elif annotation is int and values.dtype.kind == "f":
+            checks.append(
+                (
+                    values != np.trunc(values),
+                    "int_from_float",
+                    "Input should be a valid integer",
+                )
+            )
+        if ge is not None:
+            checks.append(
+                (
+                    values < ge,
+                    "greater_than_equal",
+                    f"Input should be greater than or equal to {ge}",
+                )
+            )
+        for bad, kind, message in checks:
+            rows = np.flatnonzero(bad)
+            if len(rows):
+                row = int(rows[0])
+                value = values[row].item()
+                errors.append(
+                    {
+                        "type": kind,
+                        "loc": ("body", row, name),
+                        "msg": message,
+                        # NaN and infinities are not valid JSON.
+                        "input": value if np.isfinite(value) else str(value),
+                    }
+                )
+                break
+    return errors
+
+
+def feature_matrix(columns: dict[str, np.ndarray], rate: float) -> np.ndarray:
+    """Model features for validated columns, amounts converted from UAH."""
+    rows = len(next(iter(columns.values())))
+    raw = {}
+    for name in USER_FIELDS:
+        if name in columns:
+            values = columns[name].astype(np.float64, copy=False)
+        else:
+            values = np.zeros(rows)
+        raw[name] = values / rate if name in currency_fields else values
+    return build_feature_columns(raw)
+
+
+def write_npy(columns: dict[str, np.ndarray]) -> bytes:
+    dtype = np.dtype([(name, values.dtype) for name, values in columns.items()])
+    rows = len(next(iter(columns.values())))
+    array = np.empty(rows, dtype=dtype)
+    for name, values in columns.items():
+        array[name] = values
+    buffer = io.BytesIO()
+    np.lib.format.write_array(buffer, array, allow_pickle=False)
+    return buffer.getvalue()
+
+
+def write_arrow(columns: dict[str, np.ndarray]) -> bytes:
+    pa = _import_pyarrow()
+    table = pa.table(columns)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def read_columns(body: bytes, media_type: str) -> dict[str, np.ndarray]:
+    columns = (
+        read_arrow(body) if media_type == ARROW_STREAM_MEDIA_TYPE else read_npy(body)
+    )
+    if not columns:
+        raise ColumnarFormatError("The body has no columns")
+    return columns
+
+
+def write_columns(columns: dict[str, np.ndarray], media_type: str) -> bytes:
+    if media_type == ARROW_STREAM_MEDIA_TYPE:
+        return write_arrow(columns)
+    return write_npy(columns)
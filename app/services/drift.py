@@ -0,0 +1,431 @@
+"""Input and prediction drift against a reference, from constant-size sketches.
+
+Every row scored by /predict updates a `Sketch`: for each model feature
+(the columns of `InputFeatures.model_dump()`) and the prediction, counts
+over one fixed set of log-spaced bins, each `_GAMMA` times wider than the
+last, mirrored for negative values, with a bin for zero. The bins never
+depend on the data, so sketches from any worker, window or training set
+merge by adding counts, and a sketch takes the same memory however many
+rows it has seen. No payload is kept.
+
+Each worker's `DriftMonitor` buffers rows, folds them into its sketch of
+the current window and writes it to `DRIFT_DIR` every
+`DRIFT_FLUSH_INTERVAL`. `DriftMonitor.report` adds up the recent windows
+of all workers and compares each column with the reference sketch at
+`DRIFT_REFERENCE_PATH`. It reports the population stability index over
+the reference deciles, and the Kolmogorov-Smirnov distance, which is exact
+to within a bin. Build the reference from training data, or freeze a
+period of live traffic as the reference:
+
+    python -m app.services.drift reference applicants.csv [--rate 41.5]
+    python -m app.services.drift freeze [--windows 24]
+"""
+
+import argparse
+import asyncio
+import itertools
+import logging
+import math
+import os
+import sys
+import time
+import uuid
+from typing import Callable, Optional, Sequence
+
+import numpy as np
+from pydantic import ValidationError
+
+from app import config
+from app.schemas.user import MODEL_FEATURES
+from app.services import scoring
+from app.services.exchange_rate import fetch_rate_snapshot
+from app.services.features import (
+    build_feature_matrix,
+    convert_matrix_to_usd,
+    users_to_matrix,
+)
+from app.services.records import DEFAULT_CHUNK_SIZE, read_records, validate_record
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = (*MODEL_FEATURES, "prediction")
+
+# Magnitudes below _MIN count as zero; those above _MAX share the last bin.
+_MIN = 1e-3
+_MAX = 1e9
+_GAMMA = 1.02
+_MAGNITUDES = math.ceil(math.log(_MAX / _MIN) / math.log(_GAMMA))
+BINS = 2 * _MAGNITUDES + 1
+# The geometric middle of each bin, in ascending order
+_BIN_VALUES = np.concatenate(
+    [
+        -_MIN * _GAMMA ** (np.arange(_MAGNITUDES)[::-1] + 0.5),
+        [0.0],
+        _MIN * _GAMMA ** (np.arange(_MAGNITUDES) + 0.5),
+    ]
+)
+_COLUMN_OFFSETS = np.arange(len(COLUMNS)) * BINS
+
+# Rows buffered before they are folded into the sketch
+_BUFFER_ROWS = 256
+# Floor for empty PSI buckets, so the index stays finite
+_PSI_EPSILON = 1e-4
+_PSI_BUCKETS = 10
+
+
+def bin_indices(values: np.ndarray) -> np.ndarray:
+    """Bin of every value, for finite values."""
+    magnitude = np.abs(values)
+    steps = np.log(np.maximum(magnitude, _MIN) / _MIN) / math.log(_GAMMA)
+    steps = np.minimum(steps, _MAGNITUDES - 1).astype(np.int64)
+    index = np.where(values > 0, _MAGNITUDES + 1 + steps, _MAGNITUDES - 1 - steps)
+    return np.where(magnitude < _MIN, _MAGNITUDES, index)
+
+
+class Sketch:
+    """Counts per column over the shared bins; sketches merge by addition."""
+
+    def __init__(self, counts: Optional[np.ndarray] = None):
+        if counts is None:
+            counts = np.zeros((len(COLUMNS), BINS), dtype=np.int64)
+        self.counts = counts
+
+    def update(self, rows: np.ndarray) -> None:
+        """Count a (rows, `COLUMNS`) matrix; NaN cells are skipped."""
+        valid = np.isfinite(rows)
+        flat = bin_indices(np.where(valid, rows, 0.0)) + _COLUMN_OFFSETS
+        np.add.at(self.counts.reshape(-1), flat[valid], 1)
+
+    def merge(self, other: "Sketch") -> None:
+        self.counts += other.counts
+
+    def rows(self) -> np.ndarray:
+        return self.counts.sum(axis=1)
+
+    def quantile(self, column: int, q: float) -> Optional[float]:
+        """Approximate quantile, within half a bin of the exact one."""
+        cumulative = np.cumsum(self.counts[column])
+        if not cumulative[-1]:
+            return None
+        index = int(np.searchsorted(cumulative, q * cumulative[-1]))
+        return float(_BIN_VALUES[min(index, BINS - 1)])
+
+    def save(self, path: str) -> None:
+        """Write atomically, so readers never see a partial file."""
+        partial = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(partial, "wb") as f:
+            np.savez_compressed(
+                f,
+                counts=self.counts,
+                columns=np.array(COLUMNS),
+                bins=np.array([_MIN, _MAX, _GAMMA]),
+            )
+        os.replace(partial, path)
+
+    @classmethod
+    def load(cls, path: str) -> "Sketch":
+        with np.load(path) as data:
+            if tuple(data["columns"]) != COLUMNS or not np.array_equal(
+                data["bins"], [_MIN, _MAX, _GAMMA]
+            ):
+                raise ValueError(f"{path} was written for other columns or bins")
+            return cls(data["counts"])
+
+
+def psi(reference: np.ndarray, live: np.ndarray) -> float:
+    """Population stability index of one column's counts, over reference deciles.
+
+    Deciles that fall into the same bin (discrete values) share a bucket.
+    """
+    cdf = np.cumsum(reference) / reference.sum()
+    ends = np.searchsorted(cdf, np.arange(1, _PSI_BUCKETS) / _PSI_BUCKETS)
+    starts = np.unique(np.concatenate([[0], ends + 1]))
+    starts = starts[starts < BINS]
+    expected = np.add.reduceat(reference, starts) / reference.sum()
+    actual = np.add.reduceat(live, starts) / live.sum()
+    expected = np.maximum(expected, _PSI_EPSILON)
+    actual = np.maximum(actual, _PSI_EPSILON)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def ks(reference: np.ndarray, live: np.ndarray) -> float:
+    """Largest distance between the two CDFs at the bin edges."""
+    return float(
+        np.max(
+            np.abs(
+                np.cumsum(reference) / reference.sum() - np.cumsum(live) / live.sum()
+            )
+        )
+    )
+
+
+def compare(
+    live: Sketch,
+    reference: Optional[Sketch],
+    threshold: float = config.DRIFT_PSI_THRESHOLD,
+) -> dict:
+    """Per-column rows, medians, PSI and KS, and the columns over `threshold`."""
+    columns, drifted = {}, []
+    live_rows = live.rows()
+    reference_rows = reference.rows() if reference is not None else None
+    for i, name in enumerate(COLUMNS):
+        stats = {
+            "rows": int(live_rows[i]),
+            "median": live.quantile(i, 0.5),
+            "reference_median": None,
+            "psi": None,
+            "ks": None,
+        }
+        if reference is not None and reference_rows[i]:
+            stats["reference_median"] = reference.quantile(i, 0.5)
+            if live_rows[i]:
+                stats["psi"] = psi(reference.counts[i], live.counts[i])
+                stats["ks"] = ks(reference.counts[i], live.counts[i])
+                if stats["psi"] >= threshold:
+                    drifted.append(name)
+        columns[name] = stats
+    return {"drifted": drifted, "columns": columns}
+
+
+def window_start(now: float, window_seconds: float) -> int:
+    return int(now // window_seconds * window_seconds)
+
+
+def _window_files(directory: str) -> list[tuple[int, str]]:
+    """(window start, path) of every worker's window sketch in `directory`."""
+    files = []
+    if not os.path.isdir(directory):
+        return files
+    for name in os.listdir(directory):
+        window, _, rest = name.partition("-")
+        if window.isdigit() and rest.endswith(".npz"):
+            files.append((int(window), os.path.join(directory, name)))
+    return files
+
+
+def merge_windows(directory: str, since: float) -> tuple[Sketch, int]:
+    """All workers' sketches of the windows starting at `since` or later."""
+    merged, count = Sketch(), 0
+    for window, path in _window_files(directory):
+        if window < since:
+            continue
+        try:
+            merged.merge(Sketch.load(path))
+            count += 1
+        except (OSError, ValueError):
+            logger.warning("Skipping drift sketch %s", path, exc_info=True)
+    return merged, count
+
+
+def load_reference(path: str = config.DRIFT_REFERENCE_PATH) -> Optional[Sketch]:
+    if not os.path.exists(path):
+        return None
+    return Sketch.load(path)
+
+
+class DriftMonitor:
+    """This worker's sketch of the current window, written to `directory`.
+
+    `observe` runs on the event loop and only touches memory: rows are
+    buffered and counted every `_BUFFER_ROWS` rows, and the sketch of a
+    window that has ended is kept until the next write. Writes happen in
+    `run` and `report`, on a worker thread.
+    """
+
+    def __init__(
+        self,
+        directory: str = config.DRIFT_DIR,
+        reference_path: str = config.DRIFT_REFERENCE_PATH,
+        window_seconds: float = config.DRIFT_WINDOW_SECONDS,
+        flush_interval: float = config.DRIFT_FLUSH_INTERVAL,
+        retention_seconds: float = config.DRIFT_RETENTION_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.directory = directory
+        self.reference_path = reference_path
+        self.window_seconds = window_seconds
+        self.flush_interval = flush_interval
+        self.retention_seconds = retention_seconds
+        self.clock = clock
+        self.worker = uuid.uuid4().hex[:12]
+        self.window = window_start(clock(), window_seconds)
+        self.sketch = Sketch()
+        self._closed: list[tuple[int, Sketch]] = []
+        self._pending: list[np.ndarray] = []
+        self._pending_rows = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, window: int) -> str:
+        return os.path.join(self.directory, f"{window}-{self.worker}.npz")
+
+    def observe(
+        self, features: np.ndarray, predictions: Optional[Sequence[float]] = None
+    ) -> None:
+        """Buffer scored rows; `predictions` is None when they are not at hand."""
+        rows = np.empty((len(features), len(COLUMNS)))
+        rows[:, :-1] = features
+        rows[:, -1] = np.nan if predictions is None else predictions
+        self._pending.append(rows)
+        self._pending_rows += len(rows)
+        if self._pending_rows >= _BUFFER_ROWS:
+            self._fold()
+
+    def _fold(self) -> None:
+        """Count the buffered rows, then start a new sketch if the window ended."""
+        if self._pending:
+            self.sketch.update(np.concatenate(self._pending))
+            self._pending, self._pending_rows = [], 0
+        window = window_start(self.clock(), self.window_seconds)
+        if window != self.window:
+            self._closed.append((self.window, self.sketch))
+            self.window, self.sketch = window, Sketch()
+
+    def _snapshots(self) -> list[tuple[str, Sketch]]:
+        """Ended windows and a copy of the current one, with their paths."""
+        self._fold()
+        closed, self._closed = self._closed, []
+        snapshots = [(self._path(window), sketch) for window, sketch in closed]
+        snapshots.append((self._path(self.window), Sketch(self.sketch.counts.copy())))
+        return [(path, sketch) for path, sketch in snapshots if sketch.counts.any()]
+
+    @staticmethod
+    def _write(snapshots: list[tuple[str, Sketch]]) -> None:
+        for path, sketch in snapshots:
+            sketch.save(path)
+
+    def flush(self) -> None:
+        self._write(self._snapshots())
+
+    def _prune(self) -> None:
+        oldest = self.clock() - self.retention_seconds
+        for window, path in _window_files(self.directory):
+            if window < oldest:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+    async def run(self) -> None:
+        """Write this worker's sketch and drop expired windows, periodically."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await asyncio.to_thread(self._write, self._snapshots())
+                await asyncio.to_thread(self._prune)
+            except Exception:
+                logger.warning("Writing the drift sketch failed", exc_info=True)
+
+    async def report(self, windows: int) -> dict:
+        """Drift of the last `windows` windows of every worker against the reference."""
+        snapshots = self._snapshots()
+        since = self.window - (windows - 1) * self.window_seconds
+
+        def build() -> dict:
+            self._write(snapshots)
+            live, sketches = merge_windows(self.directory, since)
+            reference = load_reference(self.reference_path)
+            return {
+                "since": since,
+                "window_seconds": self.window_seconds,
+                "sketches": sketches,
+                "reference_rows": (
+                    int(reference.rows().max()) if reference is not None else None
+                ),
+                **compare(live, reference),
+            }
+
+        return await asyncio.to_thread(build)
+
+
+def build_reference(
+    input_path: str,
+    rate: float,
+    version: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Sketch:
+    """Sketch of a CSV or Parquet file of applicants, scored by the model."""
+    sketch = Sketch()
+    records = read_records(input_path, chunk_size)
+    while chunk := list(itertools.islice(records, chunk_size)):
+        users = []
+        for record in chunk:
+            try:
+                users.append(validate_record(record))
+            except ValidationError:
+                pass
+        if users:
+            features = build_feature_matrix(
+                convert_matrix_to_usd(users_to_matrix(users), rate)
+            )
+            predictions = scoring.predict(features, version)
+            sketch.update(np.column_stack([features, predictions]))
+    return sketch
+
+
+_monitor: Optional[DriftMonitor] = None
+_configured = False
+
+
+def get_drift_monitor() -> Optional[DriftMonitor]:
+    """The process-wide drift monitor, or None when monitoring is off."""
+    global _monitor, _configured
+    if not _configured:
+        _monitor = DriftMonitor() if config.DRIFT_MONITORING else None
+        _configured = True
+    return _monitor
+
+
+def set_drift_monitor(monitor: Optional[DriftMonitor]) -> None:
+    global _monitor, _configured
+    _monitor, _configured = monitor, True
+
+
+def shutdown_drift_monitor() -> None:
+    global _monitor, _configured
+    if _monitor is not None:
+        _monitor.flush()
+    _monitor, _configured = None, False
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default=config.DRIFT_REFERENCE_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+    reference = commands.add_parser(
+        "reference", help="Build the reference from a file of applicants"
+    )
+    reference.add_argument("input", help="CSV or Parquet file with UserData columns")
+    reference.add_argument(
+        "--rate",
+        type=float,
+        help="UAH per USD; by default fetched once from the FX backend",
+    )
+    reference.add_argument("--version", help="Model version; the default if omitted")
+    freeze = commands.add_parser(
+        "freeze", help="Use the recent live windows as the reference"
+    )
+    freeze.add_argument("--windows", type=int, default=24)
+    args = parser.parse_args()
+
+    if args.command == "reference":
+        rate = args.rate if args.rate is not None else fetch_rate_snapshot()
+        sketch = build_reference(args.input, rate, args.version)
+    else:
+        window_seconds = config.DRIFT_WINDOW_SECONDS
+        since = (
+            window_start(time.time(), window_seconds)
+            - (args.windows - 1) * window_seconds
+        )
+        sketch, _ = merge_windows(config.DRIFT_DIR, since)
+    if not sketch.counts.any():
+        raise SystemExit("No rows to build a reference from")
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    sketch.save(args.output)
+    print(
+        f"Wrote a reference of {int(sketch.rows().max())} rows to {args.output}",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Optional
+
+import httpx
+
+from app import config
+from app.services.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+FX_FAILURES = REGISTRY.counter(
+    "fico_fx_failures_total",
+    "Exchange rate refreshes that failed, and requests refused for lack of a rate.",
+    ("kind",),
+)
+
+
+class RateUnavailable(Exception):
+    """Raised when no usable UAH/USD rate is known."""
+
+
+class RateBackend(ABC):
+    """Source of the UAH per USD exchange rate."""
+
+    @abstractmethod
+    async def fetch(self) -> float: ...
+
+    async def aclose(self) -> None:
+        pass
+
+
+class HttpRateBackend(RateBackend):
+    """Fetches the rate from exchangerate-api over a pooled async client."""
+
+    def __init__(self, url: str, timeout: float):
+        self.url = url
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout),
+            limits=httpx.Limits(max_connections=4, max_keepalive_connections=2),
+        )
+
+    async def fetch(self) -> float:
+        response = await self._client.get(self.url)
+        response.raise_for_status()
+        return float(response.json()["conversion_rates"]["UAH"])
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+class StaticFileRateBackend(RateBackend):
+    """Reads the rate from a JSON file, either `{"UAH": 41.5}` or an API response."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    async def fetch(self) -> float:
+        with open(self.path, encoding="utf-8") as f:
+            data = json.load(f)
+        rates = data.get("conversion_rates", data)
+        return float(rates["UAH"])
+
+
+class EnvRateBackend(RateBackend):
+    """Reads the rate from an environment variable, for overrides and tests."""
+
+    def __init__(self, var_name: str = config.FX_RATE_ENV_VAR):
+        self.var_name = var_name
+
+    async def fetch(self) -> float:
+        value = os.getenv(self.var_name)
+        if not value:
+            raise RateUnavailable(f"{self.var_name} is not set")
+        return float(value)
+
+
+class RateProvider:
+    """TTL cache over a rate backend with stale-while-revalidate refresh.
+
+    A cached rate older than `ttl` is still served while a single background
+    refresh runs. Past `max_staleness` the rate is refreshed inline, and if
+    that fails the lookup raises `RateUnavailable`.
+    """
+
+    def __init__(
+        self,
+        backend: RateBackend,
+        ttl: float = config.FX_TTL_SECONDS,
+        max_staleness: float = config.FX_MAX_STALENESS_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.backend = backend
+        self.ttl = ttl
+        self.max_staleness = max_staleness
+        self._clock = clock
+        self._rate: Optional[float] = None
+        self._fetched_at = 0.0
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    @property
+    def rate(self) -> Optional[float]:
+        return self._rate
+
+    @property
+    def age(self) -> float:
+        return self._clock() - self._fetched_at
+
+    async def start(self) -> None:
+        """Warm the cache; a failure here is logged, not raised."""
+        await self._refresh()
+
+    async def get_rate(self) -> float:
+        if self._rate is None or self.age > self.max_staleness:
+            await self._refresh()
+            if self._rate is None or self.age > self.max_staleness:
+                FX_FAILURES.labels("unavailable").inc()
+                raise RateUnavailable("No exchange rate within the staleness limit")
+        elif self.age > self.ttl:
+            self._schedule_refresh()
+        return self._rate
+
+    def _schedule_refresh(self) -> asyncio.Task:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._fetch())
+        return self._refresh_task
+
+    async def _refresh(self) -> None:
+        # Concurrent callers share one in-flight fetch.
+        await asyncio.shield(self._schedule_refresh())
+
+    async def _fetch(self) -> None:
+        try:
+            rate = await self.backend.fetch()
+        except Exception:
+            logger.warning("Exchange rate refresh failed", exc_info=True)
+            FX_FAILURES.labels("refresh").inc()
+            return
+        if rate <= 0:
+            logger.warning("Ignoring non-positive exchange rate %r", rate)
+            FX_FAILURES.labels("refresh").inc()
+            return
+        self._rate = rate
+        self._fetched_at = self._clock()
+
+    async def aclose(self) -> None:
+        if self._refresh_task is not None and not self._refresh_task.done():
+            self._refresh_task.cancel()
+        await self.backend.aclose()
+
+
+def build_rate_backend(kind: str = config.FX_BACKEND) -> RateBackend:
+    if kind == "http":
+        return HttpRateBackend(config.FX_API_URL, config.FX_TIMEOUT_SECONDS)
+    if kind == "file":
+        return StaticFileRateBackend(config.FX_RATE_FILE)
+    if kind == "env":
+        return EnvRateBackend()
+    raise ValueError(f"Unknown FX backend: {kind!r}")
+
+
+_provider: Optional[RateProvider] = None
+
+
+def fetch_rate_snapshot() -> float:
+    """One UAH per USD rate from the configured FX backend, for a whole offline run."""
+
+    async def fetch() -> float:
+        backend = build_rate_backend()
+        try:
+            return await backend.fetch()
+        finally:
+            await backend.aclose()
+
+    return asyncio.run(fetch())
+
+
+def get_rate_provider() -> RateProvider:
+    global _provider
+    if _provider is None:
+        _provider = RateProvider(build_rate_backend())
+    return _provider
+
+
+def set_rate_provider(provider: Optional[RateProvider]) -> None:
+    global _provider
+    _provider = provider
+
+
+async def shutdown_rate_provider() -> None:
+    global _provider
+    if _provider is not None:
+        await _provider.aclose()
+        _provider = None
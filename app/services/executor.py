@@ -0,0 +1,86 @@
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+from app import config
+from app.models.registry import get_registry
+from app.services.metrics import REGISTRY
+
+T = TypeVar("T")
+
+MODEL_ERRORS = REGISTRY.counter(
+    "fico_model_errors_total",
+    "Scoring calls on the inference executor that raised.",
+    ("operation",),
+)
+
+
+def _init_worker(nthread: int) -> None:
+    # Load the model once per worker and stop each booster call from
+    # fanning out over every core; the pool provides the parallelism.
+    registry = get_registry()
+    registry.set_nthread(nthread)
+    registry.get()
+
+
+class InferenceExecutor:
+    """Dedicated pool for CPU-bound scoring, separate from Starlette's threadpool.
+
+    `kind="thread"` shares one booster across threads (xgboost releases the
+    GIL while predicting); `kind="process"` loads the model once per worker
+    process.
+    """
+
+    def __init__(
+        self,
+        kind: str = config.INFERENCE_EXECUTOR,
+        workers: int = config.INFERENCE_WORKERS,
+        nthread: int = config.INFERENCE_NTHREAD,
+    ):
+        self.kind = kind
+        self.workers = workers
+        if kind == "thread":
+            _init_worker(nthread)
+            self._pool: Executor = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="inference"
+            )
+        elif kind == "process":
+            self._pool = ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker, initargs=(nthread,)
+            )
+        else:
+            raise ValueError(f"Unknown inference executor: {kind!r}")
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        loop = asyncio.get_running_loop()
+        call = functools.partial(fn, *args)
+        if self.kind == "thread":
+            # Threads see the caller's context, so request stage timings work.
+            call = functools.partial(contextvars.copy_context().run, call)
+        try:
+            return await loop.run_in_executor(self._pool, call)
+        except Exception:
+            MODEL_ERRORS.labels(getattr(fn, "__name__", "unknown")).inc()
+            raise
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+_executor: Optional[InferenceExecutor] = None
+
+
+def get_inference_executor() -> InferenceExecutor:
+    global _executor
+    if _executor is None:
+        _executor = InferenceExecutor()
+    return _executor
+
+
+def shutdown_inference_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
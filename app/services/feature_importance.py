@@ -1,6 +1,9 @@
-from typing import List, Dict, Optional
+from typing import Iterable, List, Dict, Optional
+
+import numpy as np
 
 from app.models.boost_model import ForwardModel
+from app.models.registry import LoadedModel
 from app.schemas.response import NotNeedImprovement, Recommendation
 from app.schemas.feature_config import FeatureConfig, FeatureStatus
 
@@ -14,10 +17,18 @@ class FeatureRecommender:
         "home_ownership_OWN": "Власне житло",
     }
 
-    def __init__(self, feature_names: List[str]):
-        self.model = ForwardModel()
-        self.feature_names = feature_names
+    # Features whose importance is at or below this are never recommended.
+    _min_importance = 0.05
+
+    _not_need_improvement_message = "Ваш кредитний рейтинг вже на високому рівні, радимо продовжувати в тому ж дусі!"
+
+    def __init__(
+        self, feature_names: Iterable[str], model: Optional[LoadedModel] = None
+    ):
+        self.model = model or ForwardModel().model
+        self.feature_names = list(feature_names)
         self._initialize_feature_configs()
+        self._compile()
 
     def _initialize_feature_configs(self) -> None:
         self.feature_configs: Dict[str, FeatureConfig] = {
@@ -108,16 +119,6 @@ class FeatureRecommender:
             ),
         }
 
-    def _calculate_impact(
-        self,
-        current_value: float,
-        good_threshold: float,
-        max_val: float,
-        importance: float,
-    ) -> float:
-        """Calculate the impact score for a feature."""
-        return ((good_threshold - current_value) / max_val) * importance
-
     def _create_message(self, config: FeatureConfig, feat_name: str) -> str:
         if not config.status.can_improve:
             message = (
@@ -132,73 +133,157 @@ class FeatureRecommender:
 
         return message
 
-    def _create_recommendation(
-        self,
-        feat_name: str,
-        current_value: float,
-        good_threshold: float,
-        max_val: float,
-        importance: float,
-        config: FeatureConfig,
-    ) -> Optional[Recommendation]:
-        """Create a recommendation if the feature needs improvement."""
-
-        needs_improvement = (
-            (current_value > good_threshold)
-            if config.status.is_negative
-            else (current_value < good_threshold)
-        )
+    def _compile(self) -> None:
+        """Precompute per-feature constants as arrays aligned with each other."""
+        columns, configs, importances = [], [], []
+        for column, (feat_name, importance) in enumerate(
+            zip(self.feature_names, self.model.feature_importances)
+        ):
+            if feat_name in self.feature_configs:
+                columns.append(column)
+                configs.append((feat_name, self.feature_configs[feat_name]))
+                importances.append(importance)
 
-        if not needs_improvement:
-            return None
+        self._columns = np.array(columns, dtype=np.intp)
+        self._names = [name for name, _ in configs]
+        self._thresholds = np.array([c.threshold[0] for _, c in configs], np.float64)
+        self._max_values = np.array([c.threshold[1] for _, c in configs], np.float64)
+        self._is_negative = np.array([c.status.is_negative for _, c in configs], bool)
+        self._importances = np.array(importances, dtype=np.float32)
+        self._ukrainian_names = [c.ukrainian_name for _, c in configs]
+        self._messages = [self._create_message(c, name) for name, c in configs]
+        # One row is faster through a plain loop than through the arrays.
+        self._features = list(
+            zip(
+                self._names,
+                self._thresholds.tolist(),
+                self._max_values.tolist(),
+                self._is_negative.tolist(),
+                importances,
+                self._ukrainian_names,
+                self._messages,
+            )
+        )
 
-        if importance > 0.05:
-            message = self._create_message(config, feat_name)
+    def _rank(
+        self, current: np.ndarray, importances: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Impact per feature, the ranking by |impact| and which ranked ones apply."""
+        needs_improvement = np.where(
+            self._is_negative, current > self._thresholds, current < self._thresholds
+        ) & (importances > self._min_importance)
+        # Rounding to float32 before multiplying matches the scalar
+        # `python float * np.float32` arithmetic of the original loop.
+        impact = ((self._thresholds - current) / self._max_values).astype(
+            np.float32
+        ) * importances
+        score = np.where(needs_improvement, np.abs(impact), -1.0)
+        order = np.argsort(-score, axis=-1, kind="stable")
+        return impact, order, np.take_along_axis(needs_improvement, order, axis=-1)
 
-            impact = self._calculate_impact(
-                current_value, good_threshold, max_val, importance
-            )
+    def _build(
+        self,
+        current: np.ndarray,
+        impact: np.ndarray,
+        order: np.ndarray,
+        importances: np.ndarray,
+    ) -> List[Recommendation] | NotNeedImprovement:
+        if not len(order):
+            return NotNeedImprovement(message=self._not_need_improvement_message)
 
-            return Recommendation(
-                feat_name=self.feature_configs[feat_name].ukrainian_name,
-                current_value=int(current_value),
-                target_value=int(good_threshold),
-                importance=float(importance),
-                impact=float(impact),
-                message=message,
+        return [
+            Recommendation.model_construct(
+                feat_name=self._ukrainian_names[i],
+                current_value=float(int(current[i])),
+                target_value=float(int(self._thresholds[i])),
+                importance=float(importances[i]),
+                impact=float(impact[i]),
+                message=self._messages[i],
             )
+            for i in order.tolist()
+        ]
 
     def analyze_features(
         self, user_data: Dict[str, float]
     ) -> List[Recommendation] | NotNeedImprovement:
         """Analyze user features and return sorted recommendations."""
         recommendations = []
-
-        for feat_name, importance in zip(
-            self.feature_names, self.model.feature_importances
-        ):
-            if feat_name not in self.feature_configs:
+        for (
+            name,
+            threshold,
+            max_value,
+            is_negative,
+            importance,
+            ukrainian_name,
+            message,
+        ) in self._features:
+            current = user_data[name]
+            if not importance > self._min_importance or not (
+                current > threshold if is_negative else current < threshold
+            ):
                 continue
-
-            config = self.feature_configs[feat_name]
-            good_threshold, max_val = config.threshold
-            current_value = user_data[feat_name]
-
-            recommendation = self._create_recommendation(
-                feat_name=feat_name,
-                current_value=current_value,
-                good_threshold=good_threshold,
-                max_val=max_val,
-                importance=importance,
-                config=config,
+            recommendations.append(
+                Recommendation.model_construct(
+                    feat_name=ukrainian_name,
+                    current_value=float(int(current)),
+                    target_value=float(int(threshold)),
+                    importance=float(importance),
+                    impact=float((threshold - current) / max_value * importance),
+                    message=message,
+                )
             )
+        if not recommendations:
+            return NotNeedImprovement(message=self._not_need_improvement_message)
+        return sorted(recommendations, key=lambda r: abs(r.impact), reverse=True)
 
-            if recommendation:
-                recommendations.append(recommendation)
+    def applicant_importances(self, contributions: np.ndarray) -> np.ndarray:
+        """Each row's share of |attribution| per recommendable feature.
 
-        if not recommendations:
-            return NotNeedImprovement(
-                message="Ваш кредитний рейтинг вже на високому рівні, радимо продовжувати в тому ж дусі!"
+        `contributions` are `LoadedModel.contributions` rows; the shares sum
+        to one per applicant, like the global importances they replace.
+        """
+        magnitude = np.abs(contributions[:, : len(self.feature_names)])
+        total = magnitude.sum(axis=1, keepdims=True)
+        shares = np.divide(
+            magnitude, total, out=np.zeros_like(magnitude), where=total > 0
+        )
+        return shares[:, self._columns].astype(np.float32)
+
+    def analyze_batch(
+        self, features: np.ndarray, contributions: Optional[np.ndarray] = None
+    ) -> List[List[Recommendation] | NotNeedImprovement]:
+        """Analyze a matrix of users whose columns follow `feature_names`.
+
+        With `contributions`, features are weighted by each user's own
+        attributions instead of the model's global importances, and the
+        importance cutoff applies to those per-user shares.
+        """
+        current = np.asarray(features, dtype=np.float64)[:, self._columns]
+        if contributions is None:
+            importances = np.broadcast_to(self._importances, current.shape)
+        else:
+            importances = self.applicant_importances(contributions)
+        impact, order, needed = self._rank(current, importances)
+        return [
+            self._build(
+                current[row], impact[row], order[row][needed[row]], importances[row]
             )
+            for row in range(len(current))
+        ]
+
+
+def get_feature_recommender(
+    feature_names: Iterable[str], model: Optional[LoadedModel] = None
+) -> FeatureRecommender:
+    """The model's recommender for the given feature order, built once.
 
-        return sorted(recommendations, key=lambda x: abs(x.impact), reverse=True)
+    It is kept on the `LoadedModel`, so it is freed when the model is unloaded
+    or replaced.
+    """
+    model = model or ForwardModel().model
+    feature_names = tuple(feature_names)
+    recommender = model.recommenders.get(feature_names)
+    if recommender is None:
+        recommender = FeatureRecommender(feature_names, model)
+        model.recommenders[feature_names] = recommender
+    return recommender
@@ -0,0 +1,129 @@
+import math
+from typing import Iterable, Mapping
+
+import numpy as np
+
+from app.dependencies.currency import currency_fields
+from app.schemas.user import MODEL_FEATURES, UserData
+
+USER_FIELDS = list(UserData.model_fields)
+
+_USER_INDEX = {name: i for i, name in enumerate(USER_FIELDS)}
+_CURRENCY_COLUMNS = [_USER_INDEX[name] for name in currency_fields]
+
+
+def users_to_matrix(users: Iterable[UserData]) -> np.ndarray:
+    """Stack `UserData` records into a float64 matrix in `USER_FIELDS` order."""
+    rows = [list(user.__dict__.values()) for user in users]
+    return np.array(rows, dtype=np.float64).reshape(-1, len(USER_FIELDS))
+
+
+def convert_matrix_to_usd(raw: np.ndarray, rate: float) -> np.ndarray:
+    """Vectorized `convert_to_usd`: divides the currency columns in place."""
+    raw[:, _CURRENCY_COLUMNS] /= rate
+    return raw
+
+
+# Model columns that are not plain `UserData` fields, as expressions over
+# those fields (amounts in USD). The same expressions are compiled for one
+# row of Python numbers and for a batch of NumPy columns, and reproduce
+# `InputFeatures.model_dump()` value for value.
+DERIVED_FEATURES = {
+    "bc_open_to_buy": "trunc(total_credit_limit - used_credit_amount)",
+    "revol_util": "trunc(ratio(used_credit_amount, total_credit_limit, 1e-6)) * 100",
+    "pct_tl_nvr_dlq": (
+        "trunc((total_accounts - accounts_with_late_payments) / total_accounts) * 100"
+    ),
+    "mo_sin_old_rev_tl_op": "months_since_first_credit",
+    "num_actv_rev_tl": "total_accounts",
+    "accounts_with_75_percent_limit": (
+        "trunc(where(total_accounts != 0,"
+        " 1 - ratio(accounts_with_75_percent_limit, total_accounts, 0), 1e-6) * 100)"
+    ),
+    "mo_sin_rcnt_rev_tl_op": "months_since_first_credit",
+    "mo_sin_old_il_acct": "months_since_first_credit",
+    "total_il_high_credit_limit": "total_credit_limit",
+    "bc_util": "trunc(ratio(used_credit_amount, total_credit_limit, 1e-6)) * 100",
+    "dti": "trunc(ratio(monthly_debt_payments, total_income, 1e-6 * 100))",
+    "avg_cur_bal": "trunc(total_card_balance / total_accounts)",
+}
+
+_EXPRESSIONS = [DERIVED_FEATURES.get(name, name) for name in MODEL_FEATURES]
+_ANY_COLUMN = MODEL_FEATURES.index("home_ownership_ANY")
+
+
+def _safe_ratio(num: np.ndarray, den: np.ndarray, fallback: float) -> np.ndarray:
+    out = np.full(num.shape, fallback, dtype=np.float64)
+    np.divide(num, den, out=out, where=den != 0)
+    return out
+
+
+def _ratio(num: float, den: float, fallback: float) -> float:
+    return num / den if den != 0 else fallback
+
+
+def _where(condition: bool, if_true: float, if_false: float) -> float:
+    return if_true if condition else if_false
+
+
+def _compile_row_function():
+    """Generate `row(<USER_FIELDS>) -> list` evaluating `_EXPRESSIONS` once each."""
+    source = (
+        f"def row({', '.join(USER_FIELDS)}):\n"
+        f"    return [{', '.join(_EXPRESSIONS)}]\n"
+    )
+    namespace = {"trunc": math.trunc, "ratio": _ratio, "where": _where}
+    exec(compile(source, "<feature-row>", "exec"), namespace)
+    return namespace["row"]
+
+
+_row_features = _compile_row_function()
+_column_expressions = [
+    compile(expression, f"<feature {name}>", "eval")
+    for name, expression in zip(MODEL_FEATURES, _EXPRESSIONS)
+]
+
+# `UserData` fields the model actually reads, directly or through a derived column.
+MODEL_INPUT_FIELDS = frozenset(
+    name for code in _column_expressions for name in code.co_names
+) & frozenset(USER_FIELDS)
+
+
+def user_features(user: UserData, rate: float) -> np.ndarray:
+    """One validated `UserData` with UAH amounts to a (1, features) model matrix.
+
+    Single-row equivalent of `build_feature_matrix(convert_matrix_to_usd(...))`
+    without rebuilding pydantic models along the way.
+    """
+    raw = list(user.__dict__.values())
+    for i in _CURRENCY_COLUMNS:
+        raw[i] /= rate
+    values = _row_features(*raw)
+    if any(values):
+        values[_ANY_COLUMN] = 1
+    return np.array([values], dtype=np.float64)
+
+
+def build_feature_matrix(raw: np.ndarray) -> np.ndarray:
+    """Vectorized `InputFeatures`: raw user columns to model columns.
+
+    Reproduces `InputFeatures(...).model_dump()` value for value, including
+    the `home_ownership_ANY` override applied in `predict_xgb_boost`.
+    """
+    return build_feature_columns(
+        {name: raw[:, i] for i, name in enumerate(USER_FIELDS)}
+    )
+
+
+def build_feature_columns(columns: Mapping[str, np.ndarray]) -> np.ndarray:
+    """`build_feature_matrix` for separate arrays, one per `USER_FIELDS` name."""
+    namespace = {"trunc": np.trunc, "ratio": _safe_ratio, "where": np.where}
+    rows = len(next(iter(columns.values())))
+    features = np.empty((rows, len(MODEL_FEATURES)), dtype=np.float64)
+    for j, code in enumerate(_column_expressions):
+        features[:, j] = eval(code, namespace, columns)
+
+    features[:, _ANY_COLUMN] = np.where(
+        np.any(features != 0, axis=1), 1.0, features[:, _ANY_COLUMN]
+    )
+    return features
@@ -0,0 +1,761 @@
+"""Asynchronous scoring jobs for batches too large to score within one request.
+
+POST /jobs spills the applicants to `JOBS_DIR` as NDJSON and queues a job
+in a `JobBackend`. `JobQueue` worker tasks in every server process claim
+queued jobs and score them `JOBS_CHUNK_SIZE` rows at a time on the
+inference executor, appending one NDJSON result line per applicant to the
+job's output file. Progress is committed after each chunk, so readers only
+ever stream complete lines, and a job whose worker died is resumed from its
+last chunk by the first worker to claim it after `JOBS_STALE_SECONDS`.
+File reads and writes run in worker threads, off the event loop.
+Memory per running job is one chunk, whatever the size of the job.
+
+`SQLiteJobBackend` shares jobs between the workers on a host;
+`MemoryJobBackend` keeps them in one process. A networked backend can be
+passed to `JobQueue` if `JOBS_DIR` is on shared storage.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, BinaryIO, NamedTuple, Optional
+
+from pydantic import ValidationError
+
+from app import config
+from app.schemas.response import JobStatus
+from app.schemas.user import UserData
+from app.services import scoring
+from app.services.executor import get_inference_executor
+from app.services.features import (
+    build_feature_matrix,
+    convert_matrix_to_usd,
+    users_to_matrix,
+)
+from app.services.metrics import REGISTRY
+from app.services.records import error_message
+from app.services.serialization import ATTRIBUTED_RESPONSE_ADAPTER, RESPONSE_ADAPTER
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED = (SUCCEEDED, FAILED, CANCELLED)
+
+JOB_ROWS = REGISTRY.counter(
+    "fico_job_rows_total",
+    "Rows scored by asynchronous jobs.",
+)
+JOBS_FINISHED = REGISTRY.counter(
+    "fico_jobs_finished_total",
+    "Asynchronous jobs that reached a final state.",
+    ("state",),
+)
+
+
+class JobQueueFull(Exception):
+    """Raised when `JOBS_MAX_QUEUED` jobs are already waiting."""
+
+
+class JobTooLarge(Exception):
+    """Raised when a job's input exceeds `JOBS_MAX_BYTES`."""
+
+
+class InvalidJobInput(ValueError):
+    """Raised when a JSON job body is not an array."""
+
+
+class Job(NamedTuple):
+    id: str
+    state: str
+    version: str
+    rate: float
+    with_attributions: bool
+    rows_total: int
+    rows_done: int = 0
+    errors: int = 0
+    # Length of the complete result lines in the output file
+    bytes_done: int = 0
+    owner: Optional[str] = None
+    created: float = 0.0
+    updated: float = 0.0
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    error: Optional[str] = None
+    # Length of the input lines already scored, to resume with a seek
+    bytes_read: int = 0
+
+    def status(self) -> JobStatus:
+        return JobStatus.model_construct(
+            **{name: getattr(self, name) for name in JobStatus.model_fields}
+        )
+
+
+def score_lines(
+    lines: list[bytes],
+    first_row: int,
+    rate: float,
+    version: Optional[str] = None,
+    with_attributions: bool = False,
+) -> tuple[bytes, int]:
+    """NDJSON results for a chunk of NDJSON applicants, and how many were invalid."""
+    users, valid, results = [], [], [b""] * len(lines)
+    for offset, line in enumerate(lines):
+        try:
+            users.append(UserData.model_validate_json(line))
+            valid.append(offset)
+        except ValidationError as e:
+            results[offset] = json.dumps(
+                {"row": first_row + offset, "error": error_message(e)}
+            ).encode()
+
+    if users:
+        features = build_feature_matrix(
+            convert_matrix_to_usd(users_to_matrix(users), rate)
+        )
+        adapter = ATTRIBUTED_RESPONSE_ADAPTER if with_attributions else RESPONSE_ADAPTER
+        responses = scoring.score(features, version, with_attributions)
+        for offset, response in zip(valid, responses):
+            # Splice the row number into the serialized response object.
+            results[offset] = b'{"row":%d,%s' % (
+                first_row + offset,
+                adapter.dump_json(response)[1:],
+            )
+    return b"\n".join(results) + b"\n", len(lines) - len(users)
+
+
+class JobBackend(ABC):
+    """Job records; implementations must be thread-safe and `claim` atomic."""
+
+    @abstractmethod
+    def create(self, job: Job) -> None: ...
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[Job]: ...
+
+    @abstractmethod
+    def count(self, state: str) -> int: ...
+
+    @abstractmethod
+    def claim(self, owner: str, now: float, stale_before: float) -> Optional[Job]:
+        """Mark the oldest queued or stale running job as run by `owner`."""
+
+    @abstractmethod
+    def progress(
+        self,
+        job_id: str,
+        owner: str,
+        rows_done: int,
+        errors: int,
+        bytes_done: int,
+        bytes_read: int,
+        now: float,
+    ) -> bool:
+        """Record progress; False if `owner` no longer runs the job."""
+
+    @abstractmethod
+    def set_state(
+        self,
+        job_id: str,
+        owner: str,
+        state: str,
+        now: float,
+        error: Optional[str] = None,
+    ) -> bool:
+        """Move a job run by `owner` to `state`; False if it no longer runs it."""
+
+    @abstractmethod
+    def cancel(self, job_id: str, now: float) -> Optional[Job]: ...
+
+    @abstractmethod
+    def remove_finished(self, before: float) -> list[str]:
+        """Delete jobs that finished before `before`; returns their ids."""
+
+    def close(self) -> None:
+        pass
+
+
+class MemoryJobBackend(JobBackend):
+    """Jobs in a dict; only the process that received a job can see it."""
+
+    def __init__(self):
+        self._jobs: dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def create(self, job: Job) -> None:
+        with self._lock:
+            self._jobs[job.id] = job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def count(self, state: str) -> int:
+        with self._lock:
+            return sum(job.state == state for job in self._jobs.values())
+
+    def claim(self, owner: str, now: float, stale_before: float) -> Optional[Job]:
+        with self._lock:
+            for job in self._jobs.values():
+                if job.state == QUEUED or (
+                    job.state == RUNNING and job.updated < stale_before
+                ):
+                    job = self._jobs[job.id] = job._replace(
+                        state=RUNNING,
+                        owner=owner,
+                        updated=now,
+                        started=job.started or now,
+                    )
+                    return job
+        return None
+
+    def _update(self, job_id: str, owner: Optional[str], **fields) -> bool:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.state != RUNNING or job.owner != owner:
+                return False
+            self._jobs[job_id] = job._replace(**fields)
+            return True
+
+    def progress(
+        self, job_id, owner, rows_done, errors, bytes_done, bytes_read, now
+    ) -> bool:
+        return self._update(
+            job_id,
+            owner,
+            rows_done=rows_done,
+            errors=errors,
+            bytes_done=bytes_done,
+            bytes_read=bytes_read,
+            updated=now,
+        )
+
+    def set_state(self, job_id, owner, state, now, error=None) -> bool:
+        return self._update(
+            job_id,
+            owner,
+            state=state,
+            updated=now,
+            finished=now if state in FINISHED else None,
+            error=error,
+        )
+
+    def cancel(self, job_id: str, now: float) -> Optional[Job]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and job.state not in FINISHED:
+                job = self._jobs[job_id] = job._replace(
+                    state=CANCELLED, updated=now, finished=now
+                )
+            return job
+
+    def remove_finished(self, before: float) -> list[str]:
+        with self._lock:
+            removed = [
+                job.id
+                for job in self._jobs.values()
+                if job.state in FINISHED and job.finished < before
+            ]
+            for job_id in removed:
+                del self._jobs[job_id]
+        return removed
+
+
+class SQLiteJobBackend(JobBackend):
+    """Jobs in a SQLite file, claimed with single-statement updates."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(config.JOBS_DIR, "jobs.sqlite3")
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, state TEXT NOT NULL, version TEXT NOT NULL, "
+            "rate REAL NOT NULL, with_attributions INTEGER NOT NULL, "
+            "rows_total INTEGER NOT NULL, rows_done INTEGER NOT NULL, "
+            "errors INTEGER NOT NULL, bytes_done INTEGER NOT NULL, owner TEXT, "
+            "created REAL NOT NULL, updated REAL NOT NULL, started REAL, "
+            "finished REAL, error TEXT, bytes_read INTEGER NOT NULL DEFAULT 0)"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        if "bytes_read" not in columns:
+            # Added last, matching the end of `Job`, so `SELECT *` still maps.
+            self._conn.execute(
+                "ALTER TABLE jobs ADD COLUMN bytes_read INTEGER NOT NULL DEFAULT 0"
+            )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, created)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _job(row: Optional[tuple]) -> Optional[Job]:
+        if row is None:
+            return None
+        job = Job._make(row)
+        return job._replace(with_attributions=bool(job.with_attributions))
+
+    def _execute(self, sql: str, parameters: tuple = ()) -> sqlite3.Cursor:
+        with self._lock:
+            cursor = self._conn.execute(sql, parameters)
+            self._conn.commit()
+            return cursor
+
+    def create(self, job: Job) -> None:
+        placeholders = ", ".join("?" * len(job))
+        self._execute(f"INSERT INTO jobs VALUES ({placeholders})", tuple(job))
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return self._job(row)
+
+    def count(self, state: str) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE state = ?", (state,)
+            ).fetchone()[0]
+
+    def claim(self, owner: str, now: float, stale_before: float) -> Optional[Job]:
+        with self._lock:
+            row = self._conn.execute(
+                "UPDATE jobs SET state = ?, owner = ?, updated = ?, "
+                "started = COALESCE(started, ?) WHERE id = ("
+                "SELECT id FROM jobs WHERE state = ? OR (state = ? AND updated < ?) "
+                "ORDER BY created LIMIT 1) RETURNING *",
+                (RUNNING, owner, now, now, QUEUED, RUNNING, stale_before),
+            ).fetchone()
+            self._conn.commit()
+        return self._job(row)
+
+    def progress(
+        self, job_id, owner, rows_done, errors, bytes_done, bytes_read, now
+    ) -> bool:
+        cursor = self._execute(
+            "UPDATE jobs SET rows_done = ?, errors = ?, bytes_done = ?, "
+            "bytes_read = ?, updated = ? WHERE id = ? AND state = ? AND owner = ?",
+            (rows_done, errors, bytes_done, bytes_read, now, job_id, RUNNING, owner),
+        )
+        return cursor.rowcount == 1
+
+    def set_state(self, job_id, owner, state, now, error=None) -> bool:
+        cursor = self._execute(
+            "UPDATE jobs SET state = ?, updated = ?, finished = ?, error = ? "
+            "WHERE id = ? AND state = ? AND owner = ?",
+            (
+                state,
+                now,
+                now if state in FINISHED else None,
+                error,
+                job_id,
+                RUNNING,
+                owner,
+            ),
+        )
+        return cursor.rowcount == 1
+
+    def cancel(self, job_id: str, now: float) -> Optional[Job]:
+        self._execute(
+            "UPDATE jobs SET state = ?, updated = ?, finished = ? "
+            "WHERE id = ? AND state IN (?, ?)",
+            (CANCELLED, now, now, job_id, QUEUED, RUNNING),
+        )
+        return self.get(job_id)
+
+    def remove_finished(self, before: float) -> list[str]:
+        placeholders = ", ".join("?" * len(FINISHED))
+        rows = self._execute(
+            f"DELETE FROM jobs WHERE state IN ({placeholders}) AND finished < ? "
+            "RETURNING id",
+            (*FINISHED, before),
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _write_lines(file, lines: list[bytes]) -> int:
+    rows = 0
+    for line in lines:
+        line = line.strip()
+        if line:
+            file.write(line + b"\n")
+            rows += 1
+    return rows
+
+
+def _create_empty(path: str) -> None:
+    open(path, "wb").close()
+
+
+def _open_job_files(
+    input_path: str, output_path: str, job: Job
+) -> tuple[BinaryIO, BinaryIO]:
+    """The job's input and output, positioned after its last committed chunk."""
+    source = open(input_path, "rb")
+    try:
+        sink = open(output_path, "r+b")
+    except BaseException:
+        source.close()
+        raise
+    if job.bytes_read or not job.rows_done:
+        source.seek(job.bytes_read)
+    else:
+        # Progress recorded before input offsets were.
+        for _ in itertools.islice(source, job.rows_done):
+            pass
+    sink.truncate(job.bytes_done)
+    sink.seek(job.bytes_done)
+    return source, sink
+
+
+def _read_lines(file: BinaryIO, count: int) -> list[bytes]:
+    return list(itertools.islice(file, count))
+
+
+def _append(file: BinaryIO, data: bytes) -> None:
+    file.write(data)
+    file.flush()
+
+
+def _close(*files: Optional[BinaryIO]) -> None:
+    for file in files:
+        if file is not None:
+            file.close()
+
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+def _write_json_array(parts: list[bytes], path: str) -> int:
+    """Rewrite a JSON array body as NDJSON at `path`; returns the row count.
+
+    Runs in a worker thread. Elements are decoded one at a time rather than
+    with one `json.loads` call, which would hold the GIL for the whole body.
+    """
+    body = b"".join(parts)
+    try:
+        text = body.decode(json.detect_encoding(body))
+    except UnicodeDecodeError as e:
+        raise InvalidJobInput(f"Invalid JSON: {e}") from e
+    decoder = json.JSONDecoder()
+    position = _WHITESPACE.match(text).end()
+    if text[position : position + 1] != "[":
+        raise InvalidJobInput("Expected a JSON array of applicants")
+    position = _WHITESPACE.match(text, position + 1).end()
+    rows = 0
+    try:
+        with open(path, "wb") as f:
+            closed = text[position : position + 1] == "]"
+            if closed:
+                position = _WHITESPACE.match(text, position + 1).end()
+            while not closed:
+                record, position = decoder.raw_decode(text, position)
+                f.write(json.dumps(record, separators=(",", ":")).encode() + b"\n")
+                rows += 1
+                position = _WHITESPACE.match(text, position).end()
+                delimiter = text[position : position + 1]
+                if delimiter not in (",", "]"):
+                    raise json.JSONDecodeError(
+                        "Expecting ',' delimiter", text, position
+                    )
+                closed = delimiter == "]"
+                position = _WHITESPACE.match(text, position + 1).end()
+        if position < len(text):
+            raise json.JSONDecodeError("Extra data", text, position)
+    except ValueError as e:
+        raise InvalidJobInput(f"Invalid JSON: {e}") from e
+    return rows
+
+
+class JobQueue:
+    """Spills submitted jobs to disk and scores them on background tasks.
+
+    Backend calls block on I/O, so they run in worker threads.
+    """
+
+    def __init__(
+        self,
+        backend: JobBackend,
+        directory: str = config.JOBS_DIR,
+        chunk_size: int = config.JOBS_CHUNK_SIZE,
+        concurrency: int = config.JOBS_CONCURRENCY,
+        max_queued: int = config.JOBS_MAX_QUEUED,
+        max_bytes: int = config.JOBS_MAX_BYTES,
+        poll_interval: float = config.JOBS_POLL_INTERVAL,
+        stale_seconds: float = config.JOBS_STALE_SECONDS,
+        retention_seconds: float = config.JOBS_RETENTION_SECONDS,
+    ):
+        self.backend = backend
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.concurrency = concurrency
+        self.max_queued = max_queued
+        self.max_bytes = max_bytes
+        self.poll_interval = poll_interval
+        self.stale_seconds = stale_seconds
+        self.retention_seconds = retention_seconds
+        self.owner = uuid.uuid4().hex
+        os.makedirs(directory, exist_ok=True)
+        self._tasks: list[asyncio.Task] = []
+        self._wake = asyncio.Event()
+        self._swept = 0.0
+
+    def input_path(self, job_id: str) -> str:
+        return os.path.join(self.directory, f"{job_id}.in.ndjson")
+
+    def output_path(self, job_id: str) -> str:
+        return os.path.join(self.directory, f"{job_id}.out.ndjson")
+
+    async def submit(
+        self,
+        body: AsyncIterator[bytes],
+        ndjson: bool,
+        version: str,
+        rate: float,
+        with_attributions: bool = False,
+    ) -> Job:
+        """Spill a JSON array or NDJSON `body` to disk and queue it."""
+        if await asyncio.to_thread(self.backend.count, QUEUED) >= self.max_queued:
+            raise JobQueueFull(f"{self.max_queued} jobs are already queued")
+
+        job_id = uuid.uuid4().hex
+        path = self.input_path(job_id)
+        try:
+            spill = self._spill_ndjson if ndjson else self._spill_json
+            rows = await spill(body, path)
+            await asyncio.to_thread(_create_empty, self.output_path(job_id))
+        except BaseException:
+            for stale in (path, self.output_path(job_id)):
+                if os.path.exists(stale):
+                    os.remove(stale)
+            raise
+
+        now = time.time()
+        job = Job(job_id, QUEUED, version, rate, with_attributions, rows)
+        job = job._replace(created=now, updated=now)
+        await asyncio.to_thread(self.backend.create, job)
+        self._wake.set()
+        return job
+
+    async def _spill_ndjson(self, body: AsyncIterator[bytes], path: str) -> int:
+        size = rows = 0
+        carry = b""
+        f = await asyncio.to_thread(open, path, "wb")
+        try:
+            async for chunk in body:
+                size += len(chunk)
+                if size > self.max_bytes:
+                    raise JobTooLarge(f"Jobs are limited to {self.max_bytes} bytes")
+                lines = (carry + chunk).split(b"\n")
+                carry = lines.pop()
+                rows += await asyncio.to_thread(_write_lines, f, lines)
+            rows += await asyncio.to_thread(_write_lines, f, [carry])
+        finally:
+            await asyncio.to_thread(f.close)
+        return rows
+
+    async def _spill_json(self, body: AsyncIterator[bytes], path: str) -> int:
+        # A JSON array has to be held whole; NDJSON bodies never are.
+        parts, size = [], 0
+        async for chunk in body:
+            size += len(chunk)
+            if size > self.max_bytes:
+                raise JobTooLarge(f"Jobs are limited to {self.max_bytes} bytes")
+            parts.append(chunk)
+        return await asyncio.to_thread(_write_json_array, parts, path)
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        return await asyncio.to_thread(self.backend.get, job_id)
+
+    async def cancel(self, job_id: str) -> Optional[Job]:
+        """Cancel a queued or running job; its files go with the retention sweep."""
+        return await asyncio.to_thread(self.backend.cancel, job_id, time.time())
+
+    async def results(self, job_id: str) -> AsyncIterator[bytes]:
+        """Result lines as they are committed, until the job finishes.
+
+        Opens the output file before returning, so a missing one raises here.
+        """
+        f = await asyncio.to_thread(open, self.output_path(job_id), "rb")
+
+        async def follow() -> AsyncIterator[bytes]:
+            position = 0
+            try:
+                while True:
+                    job = await self.get(job_id)
+                    if job is None:
+                        return
+                    while position < job.bytes_done:
+                        block = await asyncio.to_thread(
+                            f.read, min(1 << 16, job.bytes_done - position)
+                        )
+                        if not block:
+                            return
+                        position += len(block)
+                        yield block
+                    if job.state in FINISHED:
+                        return
+                    await asyncio.sleep(self.poll_interval)
+            finally:
+                await asyncio.to_thread(f.close)
+
+        return follow()
+
+    async def start(self) -> None:
+        self._tasks = [
+            asyncio.create_task(self._work()) for _ in range(self.concurrency)
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _work(self) -> None:
+        while True:
+            now = time.time()
+            try:
+                job = await asyncio.to_thread(
+                    self.backend.claim, self.owner, now, now - self.stale_seconds
+                )
+                if job is None:
+                    await self._sweep(now)
+            except Exception:
+                logger.warning("Claiming a scoring job failed", exc_info=True)
+                job = None
+            if job is not None:
+                await self._run(job)
+                continue
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _run(self, job: Job) -> None:
+        executor = get_inference_executor()
+        rows_done, errors = job.rows_done, job.errors
+        bytes_done, bytes_read = job.bytes_done, job.bytes_read
+        source = sink = None
+        try:
+            source, sink = await asyncio.to_thread(
+                _open_job_files,
+                self.input_path(job.id),
+                self.output_path(job.id),
+                job,
+            )
+            while lines := await asyncio.to_thread(
+                _read_lines, source, self.chunk_size
+            ):
+                body, invalid = await executor.run(
+                    score_lines,
+                    lines,
+                    rows_done,
+                    job.rate,
+                    job.version,
+                    job.with_attributions,
+                )
+                await asyncio.to_thread(_append, sink, body)
+                rows_done += len(lines)
+                errors += invalid
+                bytes_done += len(body)
+                bytes_read += sum(map(len, lines))
+                JOB_ROWS.inc(len(lines))
+                if not await asyncio.to_thread(
+                    self.backend.progress,
+                    job.id,
+                    self.owner,
+                    rows_done,
+                    errors,
+                    bytes_done,
+                    bytes_read,
+                    time.time(),
+                ):
+                    # Cancelled, or taken over after stalling.
+                    return
+            state, error = SUCCEEDED, None
+        except asyncio.CancelledError:
+            # Shutting down: hand the job back for another worker to resume.
+            await asyncio.to_thread(
+                self.backend.set_state, job.id, self.owner, QUEUED, time.time()
+            )
+            raise
+        except Exception as e:
+            logger.exception("Scoring job %s failed", job.id)
+            state, error = FAILED, f"{type(e).__name__}: {e}"
+        finally:
+            await asyncio.to_thread(_close, source, sink)
+
+        if await asyncio.to_thread(
+            self.backend.set_state, job.id, self.owner, state, time.time(), error
+        ):
+            JOBS_FINISHED.labels(state).inc()
+            self._remove_files(self.input_path(job.id))
+
+    async def _sweep(self, now: float) -> None:
+        """Delete jobs, and their files, that finished before the retention period."""
+        if now - self._swept < min(60.0, self.retention_seconds):
+            return
+        self._swept = now
+        removed = await asyncio.to_thread(
+            self.backend.remove_finished, now - self.retention_seconds
+        )
+        for job_id in removed:
+            self._remove_files(self.input_path(job_id), self.output_path(job_id))
+
+    @staticmethod
+    def _remove_files(*paths: str) -> None:
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+def build_job_backend(kind: str = config.JOBS_BACKEND) -> JobBackend:
+    if kind == "memory":
+        return MemoryJobBackend()
+    if kind == "sqlite":
+        return SQLiteJobBackend()
+    raise ValueError(f"Unknown job backend: {kind!r}")
+
+
+_queue: Optional[JobQueue] = None
+
+
+def get_job_queue() -> JobQueue:
+    global _queue
+    if _queue is None:
+        _queue = JobQueue(build_job_backend())
+    return _queue
+
+
+def set_job_queue(queue: Optional[JobQueue]) -> None:
+    global _queue
+    _queue = queue
+
+
+async def shutdown_job_queue() -> None:
+    global _queue
+    if _queue is not None:
+        await _queue.stop()
+        _queue.backend.close()
+        _queue = None
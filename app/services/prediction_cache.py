@@ -0,0 +1,284 @@
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable, Optional
+
+import numpy as np
+
+from app import config
+from app.services.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+CACHE_HITS = REGISTRY.counter(
+    "fico_prediction_cache_hits_total",
+    "Prediction cache lookups answered from the cache.",
+    ("tier",),
+)
+CACHE_MISSES = REGISTRY.counter(
+    "fico_prediction_cache_misses_total",
+    "Prediction cache lookups that had to score the request.",
+    ("tier",),
+)
+CACHE_EVICTIONS = REGISTRY.counter(
+    "fico_prediction_cache_evictions_total",
+    "Entries dropped to stay within the cache size limit.",
+    ("tier",),
+)
+CACHE_BYTES = REGISTRY.gauge(
+    "fico_prediction_cache_bytes",
+    "Bytes held by the in-process prediction cache.",
+)
+
+# Rough per-entry overhead of the key, the OrderedDict node and the tuple
+_ENTRY_OVERHEAD = 200
+
+
+def prediction_key(
+    features: np.ndarray,
+    version: str,
+    rate: Optional[float],
+    fx_bucket: float = config.PREDICTION_CACHE_FX_BUCKET,
+    variant: str = "",
+) -> str:
+    """Hash of one `InputFeatures` row, the model version and the FX-rate bucket.
+
+    `variant` separates differently shaped responses for the same row.
+    """
+    row = np.ascontiguousarray(features, dtype=np.float64)
+    # -0.0 and 0.0 score the same, so they should hash the same.
+    row = row + 0.0
+    bucket = -1 if rate is None else int(round(rate / fx_bucket))
+    digest = hashlib.blake2b(row.tobytes(), digest_size=16)
+    digest.update(f"|{version}|{bucket}|{variant}".encode())
+    return digest.hexdigest()
+
+
+class CacheBackend(ABC):
+    """Byte-valued store with per-entry expiry; implementations must be thread-safe."""
+
+    name = ""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]: ...
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: float) -> None: ...
+
+    def close(self) -> None:
+        pass
+
+
+class LocalCache(CacheBackend):
+    """In-process LRU with a TTL, bounded by the approximate bytes it holds."""
+
+    name = "local"
+
+    def __init__(
+        self,
+        max_bytes: int = config.PREDICTION_CACHE_MAX_BYTES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.size = 0
+        self._entries: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires <= self.clock():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        cost = len(value) + len(key) + _ENTRY_OVERHEAD
+        if cost > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, self.clock() + ttl)
+            self.size += cost
+            while self.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                CACHE_EVICTIONS.labels(self.name).inc()
+            CACHE_BYTES.set(self.size)
+
+    def _remove(self, key: str) -> None:
+        value, _ = self._entries.pop(key)
+        self.size -= len(value) + len(key) + _ENTRY_OVERHEAD
+
+
+class SQLiteCache(CacheBackend):
+    """Shared cache in a SQLite file, visible to every worker on the host.
+
+    A stand-in for a networked store such as Redis: any `CacheBackend` can be
+    passed to `PredictionCache` as its shared tier.
+    """
+
+    name = "shared"
+
+    def __init__(
+        self,
+        path: str = config.PREDICTION_CACHE_PATH,
+        max_entries: int = config.PREDICTION_CACHE_SHARED_MAX_ENTRIES,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.clock = clock
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=1.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=OFF")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS predictions ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS predictions_expires ON predictions (expires)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM predictions WHERE key = ? AND expires > ?",
+                (key, self.clock()),
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO predictions VALUES (?, ?, ?)",
+                (key, value, self.clock() + ttl),
+            )
+            self._writes += 1
+            if self._writes % 1000 == 0:
+                self._prune()
+            self._conn.commit()
+
+    def _prune(self) -> None:
+        self._conn.execute(
+            "DELETE FROM predictions WHERE expires <= ?", (self.clock(),)
+        )
+        evicted = self._conn.execute(
+            "DELETE FROM predictions WHERE key IN (SELECT key FROM predictions "
+            "ORDER BY expires DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        ).rowcount
+        if evicted > 0:
+            CACHE_EVICTIONS.labels(self.name).inc(evicted)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class PredictionCache:
+    """Serialized prediction responses, in-process first and then in a shared tier.
+
+    Lookups in the shared tier block on I/O, so they run in a worker thread.
+    Failures of the shared tier are logged and treated as misses.
+    """
+
+    def __init__(
+        self,
+        local: Optional[CacheBackend] = None,
+        shared: Optional[CacheBackend] = None,
+        ttl: float = config.PREDICTION_CACHE_TTL_SECONDS,
+    ):
+        self.local = local
+        self.shared = shared
+        self.ttl = ttl
+
+    async def get(self, key: str) -> Optional[bytes]:
+        if self.local is not None:
+            value = self.local.get(key)
+            if value is not None:
+                CACHE_HITS.labels(self.local.name).inc()
+                return value
+            CACHE_MISSES.labels(self.local.name).inc()
+
+        if self.shared is not None:
+            try:
+                value = await asyncio.to_thread(self.shared.get, key)
+            except Exception:
+                logger.warning("Shared prediction cache lookup failed", exc_info=True)
+                value = None
+            if value is None:
+                CACHE_MISSES.labels(self.shared.name).inc()
+                return None
+            CACHE_HITS.labels(self.shared.name).inc()
+            if self.local is not None:
+                self.local.set(key, value, self.ttl)
+            return value
+        return None
+
+    async def set(self, key: str, value: bytes) -> None:
+        if self.local is not None:
+            self.local.set(key, value, self.ttl)
+        if self.shared is not None:
+            try:
+                await asyncio.to_thread(self.shared.set, key, value, self.ttl)
+            except Exception:
+                logger.warning("Shared prediction cache write failed", exc_info=True)
+
+    def close(self) -> None:
+        for backend in (self.local, self.shared):
+            if backend is not None:
+                backend.close()
+
+
+def build_prediction_cache(
+    kind: str = config.PREDICTION_CACHE,
+) -> Optional[PredictionCache]:
+    if kind == "off":
+        return None
+    if kind == "local":
+        return PredictionCache(local=LocalCache())
+    if kind == "shared":
+        return PredictionCache(local=LocalCache(), shared=SQLiteCache())
+    raise ValueError(f"Unknown prediction cache: {kind!r}")
+
+
+_cache: Optional[PredictionCache] = None
+_configured = False
+
+
+def get_prediction_cache() -> Optional[PredictionCache]:
+    """The process-wide prediction cache, or None when caching is off."""
+    global _cache, _configured
+    if not _configured:
+        _cache = build_prediction_cache()
+        _configured = True
+    return _cache
+
+
+def set_prediction_cache(cache: Optional[PredictionCache]) -> None:
+    global _cache, _configured
+    _cache, _configured = cache, True
+
+
+def shutdown_prediction_cache() -> None:
+    global _cache, _configured
+    if _cache is not None:
+        _cache.close()
+    _cache, _configured = None, False
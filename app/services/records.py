@@ -0,0 +1,50 @@
+"""Applicant records from CSV or Parquet files, validated as `UserData`.
+
+Shared by the offline scorer, the drift reference builder and the job queue.
+"""
+
+import csv
+from typing import Iterator
+
+from pydantic import ValidationError
+
+from app.schemas.user import UserData
+from app.services.features import USER_FIELDS
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+
+def is_parquet(path: str) -> bool:
+    return path.endswith((".parquet", ".pq"))
+
+
+def import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise SystemExit("Parquet files need pyarrow: pip install pyarrow") from e
+    return pyarrow
+
+
+def validate_record(record: dict) -> UserData:
+    # Empty cells fall back to the field defaults (the home_ownership flags).
+    return UserData.model_validate(
+        {k: v for k, v in record.items() if k in USER_FIELDS and v not in ("", None)}
+    )
+
+
+def error_message(error: ValidationError) -> str:
+    first = error.errors()[0]
+    location = ".".join(str(part) for part in first["loc"])
+    return f"{location}: {first['msg']}" if location else first["msg"]
+
+
+def read_records(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[dict]:
+    if is_parquet(path):
+        pa = import_pyarrow()
+        for batch in pa.parquet.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield from batch.to_pylist()
+        return
+    with open(path, newline="", encoding="utf-8") as f:
+        yield from csv.DictReader(f)
@@ -0,0 +1,122 @@
+"""CPU-bound scoring steps, kept at module level so a process pool can run them.
+
+`version` selects a model from the registry; None means the default one.
+"""
+
+import time
+from typing import Optional
+
+import numpy as np
+
+from app import config
+from app.models.boost_model import ForwardModel
+from app.schemas.response import (
+    NotNeedImprovement,
+    ResponseWithAttributions,
+    ResponseWithRecommendation,
+    WhatIfResponse,
+)
+from app.schemas.user import MODEL_FEATURES
+from app.services.feature_importance import get_feature_recommender
+from app.services.timing import timed
+from app.services.whatif import whatif as _whatif
+
+
+def predict(features: np.ndarray, version: Optional[str] = None) -> np.ndarray:
+    with timed("predict"):
+        return ForwardModel(version).predict(features)
+
+
+def attributions(features: np.ndarray, version: Optional[str] = None) -> np.ndarray:
+    """Per-applicant feature contributions, see `LoadedModel.contributions`."""
+    with timed("attributions"):
+        return ForwardModel(version).model.contributions(features)
+
+
+def explain(
+    features: np.ndarray, version: Optional[str] = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """Predictions and attributions together, see `predict_with_contributions`."""
+    with timed("predict"):
+        return ForwardModel(version).model.predict_with_contributions(features)
+
+
+def recommend(
+    features: np.ndarray,
+    version: Optional[str] = None,
+    contributions: Optional[np.ndarray] = None,
+) -> list:
+    if contributions is None and config.RECOMMEND_BY_ATTRIBUTIONS:
+        contributions = attributions(features, version)
+    model = ForwardModel(version).model
+    with timed("recommend"):
+        return get_feature_recommender(MODEL_FEATURES, model).analyze_batch(
+            features, contributions
+        )
+
+
+def recommend_user(
+    user_data: dict, version: Optional[str] = None
+) -> list | NotNeedImprovement:
+    """Recommendations for a raw `UserData` dump, as served by /recommend."""
+    model = ForwardModel(version).model
+    with timed("recommend"):
+        recommender = get_feature_recommender(user_data.keys(), model)
+        return recommender.analyze_features(user_data)
+
+
+def whatif(
+    raw: np.ndarray, rate: float, version: Optional[str] = None
+) -> WhatIfResponse:
+    """Counterfactual grid for one raw `UserData` row, as served by /recommend/whatif."""
+    with timed("whatif"):
+        return _whatif(raw, rate, version)
+
+
+def score(
+    features: np.ndarray,
+    version: Optional[str] = None,
+    with_attributions: bool = False,
+) -> list[ResponseWithRecommendation]:
+    """Scored responses; `with_attributions` adds each row's attributions."""
+    if not len(features):
+        return []
+    contributions = None
+    if with_attributions or config.RECOMMEND_BY_ATTRIBUTIONS:
+        predictions, contributions = explain(features, version)
+    else:
+        predictions = predict(features, version)
+    responses = [
+        ResponseWithRecommendation(
+            prediction=int(prediction), recommendations=recommendation
+        )
+        for prediction, recommendation in zip(
+            predictions, recommend(features, version, contributions)
+        )
+    ]
+    if with_attributions:
+        return with_attributions_of(responses, contributions)
+    return responses
+
+
+def with_attributions_of(
+    responses: list[ResponseWithRecommendation], contributions: np.ndarray
+) -> list[ResponseWithAttributions]:
+    """Attach `contributions` rows to already scored responses."""
+    return [
+        ResponseWithAttributions(
+            **response.__dict__,
+            attributions=dict(zip(MODEL_FEATURES, row[:-1].tolist())),
+            base_value=float(row[-1]),
+        )
+        for response, row in zip(responses, contributions)
+    ]
+
+
+def timed_predict(
+    features: np.ndarray, version: Optional[str] = None
+) -> tuple[np.ndarray, float]:
+    """`predict` and the seconds it took, measured where it runs."""
+    start = time.perf_counter()
+    predictions = np.asarray(predict(features, version), dtype=np.float64)
+    return predictions, time.perf_counter() - start
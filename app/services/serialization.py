@@ -0,0 +1,45 @@
+"""Prebuilt JSON encoders for the scoring responses.
+
+Route handlers return `json_response(...)` so FastAPI neither re-validates
+the result against `response_model` nor walks it with `jsonable_encoder`;
+`response_model` stays on the routes for the OpenAPI schema only.
+"""
+
+from typing import Any, Mapping, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from app.schemas.response import (
+    NotNeedImprovement,
+    Recommendation,
+    ResponseWithAttributions,
+    ResponseWithRecommendation,
+    WhatIfResponse,
+)
+
+RESPONSE_ADAPTER = TypeAdapter(ResponseWithRecommendation)
+RESPONSES_ADAPTER = TypeAdapter(list[ResponseWithRecommendation])
+ATTRIBUTED_RESPONSE_ADAPTER = TypeAdapter(ResponseWithAttributions)
+ATTRIBUTED_RESPONSES_ADAPTER = TypeAdapter(list[ResponseWithAttributions])
+RECOMMENDATIONS_ADAPTER = TypeAdapter(list[Recommendation] | NotNeedImprovement)
+WHATIF_ADAPTER = TypeAdapter(WhatIfResponse)
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+def json_response(
+    adapter: TypeAdapter,
+    value: Any,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Response:
+    return Response(
+        adapter.dump_json(value), media_type=JSON_MEDIA_TYPE, headers=headers
+    )
+
+
+def json_bytes_response(
+    body: bytes, headers: Optional[Mapping[str, str]] = None
+) -> Response:
+    """Response for JSON that is already encoded, e.g. from the prediction cache."""
+    return Response(body, media_type=JSON_MEDIA_TYPE, headers=headers)
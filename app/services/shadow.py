@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import random
+from typing import Optional, Sequence
+
+import numpy as np
+
+from app import config
+from app.services import scoring
+from app.services.executor import get_inference_executor
+from app.services.metrics import REGISTRY
+from app.services.timing import detach_timings
+
+logger = logging.getLogger(__name__)
+
+SHADOW_ROWS = REGISTRY.counter(
+    "fico_shadow_rows_total",
+    "Rows scored by the shadow model.",
+    ("version",),
+)
+SHADOW_ABS_DIFF = REGISTRY.histogram(
+    "fico_shadow_abs_diff",
+    "Absolute difference between shadow and primary predictions.",
+    ("version",),
+    buckets=(0.5, 1, 2, 5, 10, 20, 50, 100, 200),
+)
+SHADOW_DROPPED = REGISTRY.counter(
+    "fico_shadow_dropped_total",
+    "Sampled requests not shadow-scored because too many were in flight.",
+    ("version",),
+)
+SHADOW_PREDICT_SECONDS = REGISTRY.histogram(
+    "fico_shadow_predict_seconds",
+    "Booster time of the shadow model for the sampled rows.",
+    ("version",),
+)
+
+
+class ShadowScorer:
+    """Scores a sampled share of traffic with a candidate model, off the request path.
+
+    The candidate's predictions are truncated like the served ones and
+    compared with what the primary model already answered. At most
+    `max_inflight` shadow calls run at once; further samples are dropped so
+    shadow work cannot pile up behind the scoring routes.
+    """
+
+    def __init__(
+        self,
+        version: str,
+        rate: float,
+        max_inflight: int = config.MODEL_SHADOW_MAX_INFLIGHT,
+    ):
+        self.version = version
+        self.rate = rate
+        self.max_inflight = max_inflight
+        self.rows = 0
+        self.dropped = 0
+        self.abs_diff_sum = 0.0
+        self.abs_diff_max = 0.0
+        self.candidate_seconds = 0.0
+        self._tasks: set[asyncio.Task] = set()
+
+    def submit(
+        self, features: np.ndarray, primary_version: str, predictions: Sequence[float]
+    ) -> None:
+        """Sample one scored request; `predictions` are the served ones."""
+        if primary_version == self.version or random.random() >= self.rate:
+            return
+        if len(self._tasks) >= self.max_inflight:
+            self.dropped += 1
+            SHADOW_DROPPED.labels(self.version).inc()
+            return
+        task = asyncio.create_task(
+            self._score(features, np.asarray(predictions, dtype=np.float64))
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _score(self, features: np.ndarray, primary: np.ndarray) -> None:
+        # Shadow work runs past the response and must not count as its stages.
+        detach_timings()
+        try:
+            candidate, seconds = await get_inference_executor().run(
+                scoring.timed_predict, features, self.version
+            )
+        except Exception:
+            logger.warning("Shadow scoring with %s failed", self.version, exc_info=True)
+            return
+
+        diff = np.abs(np.trunc(candidate) - primary)
+        self.rows += len(diff)
+        self.abs_diff_sum += float(diff.sum())
+        self.abs_diff_max = max(self.abs_diff_max, float(diff.max(initial=0.0)))
+        self.candidate_seconds += seconds
+
+        SHADOW_ROWS.labels(self.version).inc(len(diff))
+        for value in diff:
+            SHADOW_ABS_DIFF.labels(self.version).observe(float(value))
+        SHADOW_PREDICT_SECONDS.labels(self.version).observe(seconds)
+
+    def stats(self) -> dict:
+        return {
+            "version": self.version,
+            "rate": self.rate,
+            "rows": self.rows,
+            "dropped": self.dropped,
+            "mean_abs_diff": self.abs_diff_sum / self.rows if self.rows else None,
+            "max_abs_diff": self.abs_diff_max,
+            "shadow_seconds": self.candidate_seconds,
+        }
+
+
+_shadow: Optional[ShadowScorer] = None
+
+
+def get_shadow() -> Optional[ShadowScorer]:
+    return _shadow
+
+
+def set_shadow(version: Optional[str], rate: float = 0.0) -> Optional[ShadowScorer]:
+    global _shadow
+    _shadow = ShadowScorer(version, rate) if version and rate > 0 else None
+    return _shadow
+
+
+def configure_shadow_from_env() -> None:
+    set_shadow(config.MODEL_SHADOW_VERSION, config.MODEL_SHADOW_RATE)
@@ -0,0 +1,133 @@
+"""Model preload, warm-up and the readiness flag behind /health.
+
+The lifespan starts `start_serving` in the background, so the server answers
+liveness probes while the model loads; /health and the scoring routes stay
+not-ready (503) until every step has finished. `preload` can also run in a
+pre-fork parent (`app.server --preload`), in which case the workers inherit
+the warmed model and only re-check the registry.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Iterator, Optional
+
+import numpy as np
+
+from app import config
+from app.models.boost_model import ForwardModel
+from app.models.registry import get_registry
+from app.schemas.user import MODEL_FEATURES, UserData
+from app.services import scoring
+from app.services.serialization import (
+    RECOMMENDATIONS_ADAPTER,
+    RESPONSES_ADAPTER,
+    WHATIF_ADAPTER,
+)
+
+logger = logging.getLogger(__name__)
+
+_started = time.perf_counter()
+_phases: dict[str, float] = {}
+_ready = False
+_error: Optional[str] = None
+
+
+def is_ready() -> bool:
+    return _ready
+
+
+def startup_error() -> Optional[str]:
+    return _error
+
+
+def mark_ready() -> None:
+    global _ready
+    _ready = True
+    memory = memory_usage()
+    logger.info(
+        "Worker %d ready %.2fs after import (%s; rss %.0f MB, pss %.0f MB)",
+        os.getpid(),
+        time.perf_counter() - _started,
+        ", ".join(f"{name} {seconds:.2f}s" for name, seconds in _phases.items()),
+        memory.get("rss_mb", float("nan")),
+        memory.get("pss_mb", float("nan")),
+    )
+
+
+def mark_not_ready() -> None:
+    global _ready
+    _ready = False
+
+
+def startup_report() -> dict:
+    return {
+        "ready": _ready,
+        "error": _error,
+        "phases": dict(_phases),
+        "pid": os.getpid(),
+        **memory_usage(),
+    }
+
+
+def memory_usage() -> dict[str, float]:
+    """RSS and PSS of this process in MB; PSS splits shared pages between sharers."""
+    usage = {}
+    try:
+        with open("/proc/self/smaps_rollup", encoding="ascii") as f:
+            for line in f:
+                name, _, rest = line.partition(":")
+                if name in ("Rss", "Pss"):
+                    usage[f"{name.lower()}_mb"] = int(rest.split()[0]) / 1024
+    except OSError:
+        pass
+    return usage
+
+
+@contextmanager
+def _phase(name: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _phases[name] = time.perf_counter() - start
+
+
+def warm_up_scoring() -> None:
+    """Run every loaded version through the scoring and serialization paths once."""
+    registry = get_registry()
+    user = UserData(**{name: 1 for name in UserData.model_fields}).model_dump()
+    for version in registry.loaded_versions:
+        for rows in (1, config.COMPILED_TREES_MAX_ROWS + 1):
+            features = np.ones((rows, len(MODEL_FEATURES)))
+            RESPONSES_ADAPTER.dump_json(scoring.score(features, version))
+        RECOMMENDATIONS_ADAPTER.dump_json(scoring.recommend_user(user, version))
+        raw = np.array(list(user.values()), dtype=np.float64)
+        WHATIF_ADAPTER.dump_json(scoring.whatif(raw, 1.0, version))
+
+
+def preload() -> None:
+    """Load, validate and warm the models; blocking, so run it off the event loop."""
+    with _phase("load_model"):
+        ForwardModel.load()
+    with _phase("warm_up"):
+        warm_up_scoring()
+
+
+async def start_serving(
+    steps: list[Callable[[], Awaitable[None]]],
+) -> None:
+    """`preload` in a thread, then the async startup `steps`, then mark ready."""
+    global _error
+    try:
+        await asyncio.to_thread(preload)
+        for step in steps:
+            with _phase(step.__name__.strip("_")):
+                await step()
+    except Exception as e:
+        _error = f"{type(e).__name__}: {e}"
+        logger.exception("Startup failed; the worker stays not-ready")
+        return
+    mark_ready()
@@ -0,0 +1,132 @@
+"""Per-request stage timings, exported as histograms and a `Server-Timing` header.
+
+`TimingMiddleware` opens a `RequestTimings` for every HTTP request and
+`timed(stage)` adds to it from anywhere in the request's context, including
+inference threads (`InferenceExecutor` copies the context). Work done in
+an inference process is only visible as the awaiting `inference` stage.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from app import config
+from app.services.metrics import REGISTRY
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "fico_stage_seconds",
+    "Time spent in each request stage.",
+    ("route", "stage"),
+)
+REQUEST_SECONDS = REGISTRY.histogram(
+    "fico_request_seconds",
+    "Time from receiving a request to sending the last byte of its response.",
+    ("route", "method", "status"),
+)
+
+
+class RequestTimings:
+    __slots__ = ("started", "stages")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: list[tuple[str, float]] = []
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.stages.append((stage, seconds))
+
+    def mark_handler_start(self) -> None:
+        """Record `parse`: body read, validation and dependencies before the handler."""
+        now = time.perf_counter()
+        nested = sum(seconds for _, seconds in self.stages)
+        self.stages.append(("parse", now - self.started - nested))
+
+    def server_timing(self, total: float) -> str:
+        entries = [f"{stage};dur={seconds * 1000:.3f}" for stage, seconds in self]
+        entries.append(f"total;dur={total * 1000:.3f}")
+        return ", ".join(entries)
+
+    def __iter__(self) -> Iterator[tuple[str, float]]:
+        # A stage may run more than once per request; report the sum.
+        totals: dict[str, float] = {}
+        for stage, seconds in self.stages:
+            totals[stage] = totals.get(stage, 0.0) + seconds
+        return iter(totals.items())
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar(
+    "request_timings", default=None
+)
+
+
+def detach_timings() -> None:
+    """Stop recording into the request's timings, e.g. from a background task."""
+    _current.set(None)
+
+
+def mark_handler_start() -> None:
+    timings = _current.get()
+    if timings is not None:
+        timings.mark_handler_start()
+
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    """Add the duration of the block to the current request's `stage`."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(stage, time.perf_counter() - start)
+
+
+def _route_label(scope: dict) -> str:
+    # The route template, not the raw path, so labels stay bounded.
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class TimingMiddleware:
+    """Pure ASGI middleware; records stage and request histograms per route."""
+
+    def __init__(self, app, server_timing: bool = config.SERVER_TIMING):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                route = _route_label(scope)
+                for stage, seconds in timings:
+                    STAGE_SECONDS.labels(route, stage).observe(seconds)
+                if self.server_timing:
+                    total = time.perf_counter() - timings.started
+                    headers = list(message.get("headers", []))
+                    headers.append(
+                        (b"server-timing", timings.server_timing(total).encode())
+                    )
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            REQUEST_SECONDS.labels(
+                _route_label(scope), scope["method"], status
+            ).observe(time.perf_counter() - timings.started)
@@ -0,0 +1,201 @@
+"""Counterfactual "what-if" scoring: perturb one applicant and ask the model.
+
+Every improvable feature in the recommender's `feature_configs` becomes an
+action on the `UserData` field behind it, stepped from the applicant's value
+toward the config threshold. The perturbed raw rows go through
+`build_feature_matrix`, so linked model columns (`bc_util` and `revol_util`
+from the credit amounts, `avg_cur_bal`, ...) move together, and the whole
+grid is scored in one model call. A second call scores the cumulative
+combinations of the helpful actions to pick the best plan.
+"""
+
+from typing import Callable, NamedTuple, Optional
+
+import numpy as np
+
+from app import config
+from app.dependencies.currency import currency_fields
+from app.models.boost_model import ForwardModel
+from app.schemas.response import WhatIfAction, WhatIfPlan, WhatIfResponse, WhatIfStep
+from app.schemas.user import MODEL_FEATURES, UserData
+from app.services.feature_importance import get_feature_recommender
+from app.services.features import (
+    MODEL_INPUT_FIELDS,
+    USER_FIELDS,
+    build_feature_matrix,
+    convert_matrix_to_usd,
+)
+
+_USER_INDEX = {name: i for i, name in enumerate(USER_FIELDS)}
+_INTEGER_FIELDS = {
+    name
+    for name, field in UserData.model_fields.items()
+    if field.annotation in (int, bool)
+}
+
+# Config features that are model columns rather than `UserData` fields: the
+# field that moves each one, and the field value that puts the column at the
+# threshold for a given raw (USD) row.
+_DERIVED_LEVERS: dict[str, tuple[str, Callable[[np.ndarray, float], float]]] = {
+    "total_il_high_credit_limit": ("total_credit_limit", lambda row, t: t),
+    "mo_sin_rcnt_rev_tl_op": ("months_since_first_credit", lambda row, t: t),
+    "pct_tl_nvr_dlq": (
+        "accounts_with_late_payments",
+        lambda row, t: row[_USER_INDEX["total_accounts"]] * (1 - t / 100),
+    ),
+    "bc_util": (
+        "used_credit_amount",
+        lambda row, t: row[_USER_INDEX["total_credit_limit"]] * t / 100,
+    ),
+    # The model column is the percentage of accounts *under* 75% of their limit.
+    "accounts_with_75_percent_limit": (
+        "accounts_with_75_percent_limit",
+        lambda row, t: row[_USER_INDEX["total_accounts"]] * (1 - t / 100),
+    ),
+}
+
+# `build_feature_matrix` sets this column for every non-empty row, so moving
+# the field never changes what the model sees.
+_FIXED_FEATURES = {"home_ownership_ANY"}
+_MODEL_INDEX = {name: i for i, name in enumerate(MODEL_FEATURES)}
+
+
+class _Action(NamedTuple):
+    feature: str
+    feat_name: str
+    column: int
+    current: float
+    target: float
+
+
+def _actions(raw: np.ndarray, features: np.ndarray, version: Optional[str]):
+    """Improvable config features whose threshold the applicant misses.
+
+    Thresholds are on model columns, so model columns are compared as the
+    model sees them; only fields the model never reads are compared raw.
+    """
+    recommender = get_feature_recommender(MODEL_FEATURES, ForwardModel(version).model)
+    actions, seen = [], set()
+    for feature, feature_config in recommender.feature_configs.items():
+        threshold = feature_config.threshold[0]
+        if feature in _FIXED_FEATURES:
+            continue
+        if feature in _DERIVED_LEVERS:
+            field, lever = _DERIVED_LEVERS[feature]
+            target = lever(raw, threshold)
+        elif feature in _USER_INDEX:
+            field, target = feature, threshold
+        else:
+            continue
+        if feature in _MODEL_INDEX:
+            current = features[_MODEL_INDEX[feature]]
+        else:
+            current = raw[_USER_INDEX[feature]]
+        if not feature_config.status.can_improve or field not in MODEL_INPUT_FIELDS:
+            continue
+        misses = (
+            current > threshold
+            if feature_config.status.is_negative
+            else current < threshold
+        )
+        if field in _INTEGER_FIELDS:
+            target = round(target)
+        column = _USER_INDEX[field]
+        target = max(float(target), 0.0)
+        if misses and field not in seen and target != raw[column]:
+            seen.add(field)
+            actions.append(
+                _Action(
+                    feature,
+                    feature_config.ukrainian_name,
+                    column,
+                    float(raw[column]),
+                    target,
+                )
+            )
+    return actions
+
+
+def _step_values(action: _Action, steps: int) -> np.ndarray:
+    fractions = np.arange(1, steps + 1) / steps
+    values = action.current + fractions * (action.target - action.current)
+    if USER_FIELDS[action.column] in _INTEGER_FIELDS:
+        values = np.round(values)
+    return values
+
+
+def _grid(raw: np.ndarray, actions: list[_Action], steps: int) -> np.ndarray:
+    """The base row, then `steps` rows per action ending at its target."""
+    grid = np.repeat(raw[None, :], 1 + len(actions) * steps, axis=0)
+    for i, action in enumerate(actions):
+        grid[1 + i * steps : 1 + (i + 1) * steps, action.column] = _step_values(
+            action, steps
+        )
+    return grid
+
+
+def whatif(
+    raw: np.ndarray,
+    rate: float,
+    version: Optional[str] = None,
+    steps: int = config.WHATIF_STEPS,
+) -> WhatIfResponse:
+    """Score deltas per action and the best combined plan for one raw UAH row."""
+    model = ForwardModel(version)
+    raw = convert_matrix_to_usd(np.array(raw, dtype=np.float64).reshape(1, -1), rate)
+    actions = _actions(raw[0], build_feature_matrix(raw)[0], version)
+
+    predictions = model.predict(build_feature_matrix(_grid(raw[0], actions, steps)))
+    base = float(predictions[0])
+    deltas = predictions[1:].reshape(len(actions), steps) - base
+
+    # Combine the helpful actions, best first, and keep the best prefix.
+    helpful = [
+        i for i in np.argsort(-deltas[:, -1], kind="stable") if deltas[i, -1] > 0
+    ]
+    plan = WhatIfPlan.model_construct(features=[], prediction=base, delta=0.0)
+    if helpful:
+        combined = np.repeat(raw, len(helpful), axis=0)
+        for n, i in enumerate(helpful):
+            combined[n:, actions[i].column] = actions[i].target
+        totals = model.predict(build_feature_matrix(combined)) - base
+        best = int(np.argmax(totals))
+        if totals[best] > 0:
+            plan = WhatIfPlan.model_construct(
+                features=[actions[i].feature for i in helpful[: best + 1]],
+                prediction=base + float(totals[best]),
+                delta=float(totals[best]),
+            )
+
+    return WhatIfResponse.model_construct(
+        prediction=base,
+        actions=[
+            _response_action(action, deltas[i], base, steps, rate)
+            for i, action in enumerate(actions)
+        ],
+        plan=plan,
+    )
+
+
+def _response_action(
+    action: _Action, deltas: np.ndarray, base: float, steps: int, rate: float
+) -> WhatIfAction:
+    # Amounts are reported in UAH, like the request.
+    scale = rate if USER_FIELDS[action.column] in currency_fields else 1.0
+    values = _step_values(action, steps)
+    return WhatIfAction.model_construct(
+        feature=action.feature,
+        feat_name=action.feat_name,
+        field=USER_FIELDS[action.column],
+        current_value=action.current * scale,
+        target_value=action.target * scale,
+        delta=float(deltas[-1]),
+        steps=[
+            WhatIfStep.model_construct(
+                value=float(value) * scale,
+                prediction=base + float(delta),
+                delta=float(delta),
+            )
+            for value, delta in zip(values, deltas)
+        ],
+    )
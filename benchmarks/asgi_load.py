@@ -0,0 +1,67 @@
+"""In-process load test of the API over ASGI, without sockets or a server.
+
+python -m benchmarks.asgi_load --concurrency 1 8 32 --duration 5
+
+The app runs its real lifespan (model load, rate provider, executor) in
+this process; the client shares the event loop, so the numbers include
+the client's own overhead and are meant for comparing commits.
+"""
+
+import argparse
+import asyncio
+import json
+
+import httpx
+
+from benchmarks.common import (
+    drive_load,
+    ensure_model,
+    synthetic_users,
+    use_local_fx_rate,
+    wait_until_ready,
+)
+
+CONCURRENCY_LEVELS = (1, 8, 32)
+
+
+async def run_asgi_load(
+    concurrency_levels=CONCURRENCY_LEVELS,
+    duration: float = 5.0,
+    path: str = "/predict/",
+    payload_count: int = 1000,
+) -> dict:
+    use_local_fx_rate()
+    ensure_model()
+    from app.main import app
+
+    payloads = [user.model_dump() for user in synthetic_users(payload_count)]
+    results = {}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://benchmark"
+        ) as client:
+            await wait_until_ready(client)
+            # One short pass so first-request costs do not land in the numbers.
+            await drive_load(client, payloads, 1, min(duration, 0.5), path)
+            for concurrency in concurrency_levels:
+                results[str(concurrency)] = await drive_load(
+                    client, payloads, concurrency, duration, path
+                )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=CONCURRENCY_LEVELS
+    )
+    parser.add_argument("--duration", type=float, default=5.0)
+    args = parser.parse_args()
+
+    results = asyncio.run(run_asgi_load(args.concurrency, args.duration))
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Extra cost of per-applicant attributions over plain scoring.
+
+python -m benchmarks.attributions --rows 500 --batch-size 256
+
+Scores the same applicants with the global importances, with recommendations
+ranked by attributions (`RECOMMEND_BY_ATTRIBUTIONS`, the default) and with
+the attributions returned as well. Reports microseconds per row, single-row
+and batched, and each mode's overhead relative to the first.
+"""
+
+import argparse
+
+from app import config
+from app.services import scoring
+from app.services.features import (
+    build_feature_matrix,
+    convert_matrix_to_usd,
+    user_features,
+    users_to_matrix,
+)
+from app.services.serialization import (
+    ATTRIBUTED_RESPONSES_ADAPTER,
+    RESPONSES_ADAPTER,
+)
+from benchmarks.common import FX_RATE, ensure_model, synthetic_users
+from benchmarks.stages import _us_per_row
+
+MODES = {
+    "global importances": (False, False),
+    "ranked by attributions": (True, False),
+    "attributions returned": (True, True),
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    ensure_model()
+    users = synthetic_users(args.rows)
+    rows = [user_features(user, FX_RATE) for user in users]
+    matrix = build_feature_matrix(
+        convert_matrix_to_usd(users_to_matrix(users), FX_RATE)
+    )
+    batches = [
+        matrix[i : i + args.batch_size] for i in range(0, len(matrix), args.batch_size)
+    ]
+
+    default = config.RECOMMEND_BY_ATTRIBUTIONS
+    results = {}
+    try:
+        for mode, (ranked, returned) in MODES.items():
+            config.RECOMMEND_BY_ATTRIBUTIONS = ranked
+            adapter = ATTRIBUTED_RESPONSES_ADAPTER if returned else RESPONSES_ADAPTER
+
+            def run(features_list):
+                for features in features_list:
+                    adapter.dump_json(scoring.score(features, None, returned))
+
+            results[mode] = (
+                _us_per_row(lambda: run(rows), len(rows), args.repeats)["us_per_row"],
+                _us_per_row(lambda: run(batches), len(matrix), args.repeats)[
+                    "us_per_row"
+                ],
+            )
+    finally:
+        config.RECOMMEND_BY_ATTRIBUTIONS = default
+
+    base_single, base_batch = results["global importances"]
+    print(f"{'mode':<24} {'single us/row':>14} {'batch us/row':>13}")
+    for mode, (single, batch) in results.items():
+        print(
+            f"{mode:<24} {single:8.1f} {single / base_single - 1:+5.0%}"
+            f" {batch:7.1f} {batch / base_batch - 1:+5.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
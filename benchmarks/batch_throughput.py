@@ -0,0 +1,68 @@
+"""Compare scoring N users one request at a time against one batch call.
+
+python -m benchmarks.batch_throughput --rows 2000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from app.schemas.user import MODEL_FEATURES, UserData
+from app.services.feature_importance import get_feature_recommender
+from app.services.features import (
+    build_feature_matrix,
+    convert_matrix_to_usd,
+    user_features,
+    users_to_matrix,
+)
+from benchmarks.common import FX_RATE, ensure_model, synthetic_users
+
+
+def single_row_path(users: list[UserData], model) -> list[float]:
+    """Mirror of `predict_xgb_boost` body, one user at a time."""
+    predictions = []
+    for user in users:
+        features = user_features(user, FX_RATE)
+        prediction = model.predict(features)
+        get_feature_recommender(MODEL_FEATURES).analyze_batch(features)
+        predictions.append(float(prediction[0]))
+    return predictions
+
+
+def batch_path(users: list[UserData], model) -> list[float]:
+    features = build_feature_matrix(
+        convert_matrix_to_usd(users_to_matrix(users), FX_RATE)
+    )
+    predictions = model.predict(features)
+    get_feature_recommender(MODEL_FEATURES).analyze_batch(features)
+    return [float(p) for p in predictions]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=2000)
+    args = parser.parse_args()
+
+    model = ensure_model()
+    users = synthetic_users(args.rows)
+
+    start = time.perf_counter()
+    single = single_row_path(users, model)
+    single_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = batch_path(users, model)
+    batch_seconds = time.perf_counter() - start
+
+    assert np.array_equal(
+        single, batch
+    ), "batch predictions differ from single-row path"
+    print(f"rows:        {args.rows}")
+    print(f"single-row:  {args.rows / single_seconds:10.0f} rows/s")
+    print(f"batch:       {args.rows / batch_seconds:10.0f} rows/s")
+    print(f"speedup:     {single_seconds / batch_seconds:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
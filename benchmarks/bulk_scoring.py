@@ -0,0 +1,95 @@
+"""Throughput of the offline bulk scorer and its parity with the /predict path.
+
+python -m benchmarks.bulk_scoring --rows 100000 --workers 1 2 4
+"""
+
+import argparse
+import asyncio
+import csv
+import os
+import tempfile
+
+import httpx
+
+from app.services.bulk_scoring import score_file
+from app.services.features import USER_FIELDS
+from benchmarks.common import (
+    FX_RATE,
+    ensure_model,
+    synthetic_users,
+    use_local_fx_rate,
+    wait_until_ready,
+)
+
+
+def write_input(path: str, rows: int) -> None:
+    users = synthetic_users(min(rows, 5000))
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(USER_FIELDS)
+        for i in range(rows):
+            writer.writerow(users[i % len(users)].__dict__.values())
+
+
+async def predict_bodies(sample: int = 500) -> list[dict]:
+    """/predict response bodies for the first `sample` input rows."""
+    use_local_fx_rate(FX_RATE)
+    from app.main import app
+
+    bodies = []
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://benchmark"
+        ) as client:
+            await wait_until_ready(client)
+            for user in synthetic_users(sample):
+                response = await client.post("/predict/", json=user.model_dump())
+                response.raise_for_status()
+                bodies.append(response.json())
+    return bodies
+
+
+def check_parity(output_path: str, expected: list[dict]) -> None:
+    """Compare the first bulk output rows with the /predict response bodies."""
+    with open(output_path, newline="", encoding="utf-8") as f:
+        rows = [row for row, _ in zip(csv.DictReader(f), range(len(expected)))]
+    for body, row in zip(expected, rows):
+        assert row["prediction"] == str(body["prediction"]), (row, body)
+        recommended = body["recommendations"]
+        if isinstance(recommended, list) and recommended:
+            assert row["feature_1"] == recommended[0]["feat_name"], (row, body)
+            assert float(row["target_1"]) == recommended[0]["target_value"], row
+            assert float(row["impact_1"]) == recommended[0]["impact"], (row, body)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count()])
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    args = parser.parse_args()
+
+    ensure_model()
+    expected = asyncio.run(predict_bodies())
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = os.path.join(tmp, "applicants.csv")
+        write_input(input_path, args.rows)
+        for workers in sorted(set(args.workers)):
+            output_path = os.path.join(tmp, f"scores-{workers}.csv")
+            summary = score_file(
+                input_path,
+                output_path,
+                FX_RATE,
+                workers=workers,
+                chunk_size=args.chunk_size,
+            )
+            check_parity(output_path, expected)
+            print(
+                f"workers={workers:<3} {summary['rows_per_second']:10.0f} rows/s"
+                f"  ({summary['rows']} rows, {summary['errors']} invalid)"
+            )
+
+
+if __name__ == "__main__":
+    main()
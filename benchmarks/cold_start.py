@@ -0,0 +1,102 @@
+"""Startup time and worker memory with and without the pre-fork model preload.
+
+python -m benchmarks.cold_start --workers 4
+
+Starts `app.server` in each mode and reports:
+- the time until /health/live answers;
+- the time until every worker reports ready;
+- RSS per worker, and the PSS of all processes.
+PSS divides shared pages between the processes that map them, so its sum
+is the real memory cost. This needs Linux /proc.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+
+def _memory_mb(pid: int) -> dict[str, float]:
+    usage = {}
+    with open(f"/proc/{pid}/smaps_rollup", encoding="ascii") as f:
+        for line in f:
+            name, _, rest = line.partition(":")
+            if name in ("Rss", "Pss"):
+                usage[name.lower()] = int(rest.split()[0]) / 1024
+    return usage
+
+
+def _children(pid: int) -> list[int]:
+    pids = []
+    for task in os.listdir(f"/proc/{pid}/task"):
+        with open(f"/proc/{pid}/task/{task}/children", encoding="ascii") as f:
+            pids += [int(child) for child in f.read().split()]
+    return pids
+
+
+def measure(workers: int, preload: bool, port: int, timeout: float = 120.0) -> dict:
+    command = [sys.executable, "-m", "app.server", "--port", str(port)]
+    command += ["--workers", str(workers), "--log-level", "warning"]
+    if preload:
+        command.append("--preload")
+    env = {**os.environ, "FX_BACKEND": os.getenv("FX_BACKEND", "env")}
+    env.setdefault("FX_UAH_RATE", "41.5")
+
+    started = time.perf_counter()
+    server = subprocess.Popen(command, env=env)
+    live_seconds, ready = None, set()
+    try:
+        # A new connection per poll, so the kernel spreads them over workers.
+        with httpx.Client(
+            base_url=f"http://127.0.0.1:{port}", headers={"Connection": "close"}
+        ) as client:
+            while len(ready) < workers:
+                if time.perf_counter() - started > timeout:
+                    raise RuntimeError("Workers did not become ready")
+                try:
+                    if live_seconds is None:
+                        client.get("/health/live").raise_for_status()
+                        live_seconds = time.perf_counter() - started
+                    report = client.get("/health/startup").json()
+                    if report["ready"]:
+                        ready.add(report["pid"])
+                except httpx.HTTPError:
+                    pass
+                time.sleep(0.02)
+        ready_seconds = time.perf_counter() - started
+
+        children = [_memory_mb(pid) for pid in _children(server.pid)]
+        parent = _memory_mb(server.pid)
+        return {
+            "live_seconds": live_seconds,
+            "ready_seconds": ready_seconds,
+            "worker_rss_mb": [round(child["rss"]) for child in children],
+            "total_pss_mb": parent["pss"] + sum(child["pss"] for child in children),
+        }
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--port", type=int, default=8002)
+    args = parser.parse_args()
+
+    for preload in (False, True):
+        result = measure(args.workers, preload, args.port)
+        print(
+            f"{'preload' if preload else 'per-worker':<11}"
+            f" live {result['live_seconds']:5.2f}s"
+            f"  all ready {result['ready_seconds']:5.2f}s"
+            f"  worker rss {result['worker_rss_mb']} MB"
+            f"  total pss {result['total_pss_mb']:.0f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Rows per second of /predict/columnar (.npy, Arrow) against /predict/batch (JSON).
+
+python -m benchmarks.columnar --rows 10000 --repeats 5
+
+Posts the same applicants to each route in-process over ASGI and reports
+rows/s with the server-side stage breakdown from `Server-Timing`. The JSON
+route also builds recommendations, so its `predict` stage includes the
+attributions they are ranked by; `parse`, `validation` and `features` are
+the like-for-like stages. Arrow is skipped without pyarrow.
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import time
+
+import httpx
+import numpy as np
+
+# `Server-Timing` is read from the config at import time.
+os.environ["SERVER_TIMING"] = "1"
+
+from app.main import app  # noqa: E402
+from app.services.columnar import (  # noqa: E402
+    ARROW_STREAM_MEDIA_TYPE,
+    NPY_MEDIA_TYPE,
+)
+from app.services.features import USER_FIELDS  # noqa: E402
+from benchmarks.common import (  # noqa: E402
+    ensure_model,
+    synthetic_users,
+    use_local_fx_rate,
+    wait_until_ready,
+)
+
+
+def _columns(users) -> dict[str, np.ndarray]:
+    dtypes = {
+        name: {bool: np.bool_, int: np.int64}.get(type(getattr(users[0], name)), None)
+        for name in USER_FIELDS
+    }
+    return {
+        name: np.array(
+            [getattr(user, name) for user in users], dtype=dtypes[name] or np.float64
+        )
+        for name in USER_FIELDS
+    }
+
+
+def _npy_body(columns: dict[str, np.ndarray]) -> bytes:
+    array = np.empty(
+        len(columns[USER_FIELDS[0]]),
+        dtype=[(name, values.dtype) for name, values in columns.items()],
+    )
+    for name, values in columns.items():
+        array[name] = values
+    buffer = io.BytesIO()
+    np.save(buffer, array)
+    return buffer.getvalue()
+
+
+def _arrow_body(columns: dict[str, np.ndarray]):
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc
+    except ImportError:
+        return None
+    table = pa.table(columns)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _stages(header: str) -> str:
+    entries = [entry.split(";dur=") for entry in header.split(", ")]
+    return " ".join(f"{name} {float(ms):.1f}" for name, ms in entries)
+
+
+async def run(rows: int, repeats: int) -> None:
+    use_local_fx_rate()
+    ensure_model()
+    users = synthetic_users(rows)
+    columns = _columns(users)
+    json_body = (
+        "[" + ",".join(user.model_dump_json() for user in users) + "]"
+    ).encode()
+    bodies = {
+        "json batch": ("/predict/batch", "application/json", json_body),
+        "npy columnar": ("/predict/columnar", NPY_MEDIA_TYPE, _npy_body(columns)),
+    }
+    arrow = _arrow_body(columns)
+    if arrow is not None:
+        bodies["arrow columnar"] = ("/predict/columnar", ARROW_STREAM_MEDIA_TYPE, arrow)
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://benchmark", timeout=120
+        ) as client:
+            await wait_until_ready(client)
+            for name, (path, media_type, body) in bodies.items():
+                best, timing = float("inf"), ""
+                for _ in range(repeats):
+                    start = time.perf_counter()
+                    response = await client.post(
+                        path,
+                        content=body,
+                        headers={"content-type": media_type, "X-Request-Timeout": "60"},
+                    )
+                    elapsed = time.perf_counter() - start
+                    response.raise_for_status()
+                    if elapsed < best:
+                        best, timing = elapsed, response.headers["server-timing"]
+                print(
+                    f"{name:<15} {len(body) / 1e6:6.1f} MB {rows / best:10.0f} rows/s"
+                    f"  (ms: {_stages(timing)})"
+                )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.repeats))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+import asyncio
+import os
+import time
+
+import httpx
+import numpy as np
+
+from app.models.boost_model import ForwardModel
+from app.models.compiled_trees import TreeArrays
+from app.models.registry import LoadedModel, get_registry
+from app.schemas.user import MODEL_FEATURES, UserData
+
+FX_RATE = 41.5
+
+
+def use_local_fx_rate(rate: float = FX_RATE) -> None:
+    """Point the rate provider at an in-process value so nothing hits the network."""
+    os.environ["FX_UAH_RATE"] = str(rate)
+    from app.services.exchange_rate import (
+        EnvRateBackend,
+        RateProvider,
+        set_rate_provider,
+    )
+
+    set_rate_provider(RateProvider(EnvRateBackend()))
+
+
+def synthetic_model(seed: int = 0):
+    """A small `XGBRegressor` over `MODEL_FEATURES`, for when no artifact exists."""
+    from xgboost import XGBRegressor
+
+    rng = np.random.default_rng(seed)
+    X = rng.uniform(0, 100, size=(2000, len(MODEL_FEATURES)))
+    y = 300 + 5 * X[:, 1] - 3 * X[:, 2] + rng.normal(0, 10, len(X))
+    return XGBRegressor(n_estimators=200, max_depth=6).fit(X, y)
+
+
+def ensure_model(seed: int = 0) -> ForwardModel:
+    """Load the real booster, or fit a small synthetic one if the artifact is absent."""
+    try:
+        return ForwardModel.load()
+    except RuntimeError:
+        pass
+
+    model = synthetic_model(seed)
+    get_registry().add(
+        "synthetic",
+        LoadedModel(
+            booster=model.get_booster(),
+            feature_importances=model.feature_importances_,
+            trees=TreeArrays.from_booster(model.get_booster()),
+        ),
+    )
+    return ForwardModel()
+
+
+def synthetic_users(n: int, seed: int = 0) -> list[UserData]:
+    rng = np.random.default_rng(seed)
+    users = []
+    for _ in range(n):
+        total_accounts = int(rng.integers(1, 40))
+        limit = float(rng.uniform(0, 2_000_000))
+        used = float(rng.uniform(0, limit))
+        home = rng.integers(0, 6)
+        users.append(
+            UserData(
+                total_credit_limit=limit,
+                used_credit_amount=used,
+                available_credit_limit=limit - used,
+                accounts_with_late_payments=int(rng.integers(0, total_accounts + 1)),
+                total_accounts=total_accounts,
+                number_of_derogatory_records=int(rng.integers(0, 3)),
+                number_of_collections=int(rng.integers(0, 3)),
+                months_since_first_credit=int(rng.integers(0, 400)),
+                accounts_with_75_percent_limit=int(rng.integers(0, total_accounts + 1)),
+                credits_overdue_120_days=int(rng.integers(0, 2)),
+                total_taken_credits=int(rng.integers(0, 30)),
+                credits_taken_last_2_years=int(rng.integers(0, 10)),
+                total_card_balance=float(rng.uniform(0, 500_000)),
+                total_income=float(rng.choice([0.0, rng.uniform(0, 3_000_000)])),
+                monthly_debt_payments=float(rng.uniform(0, 100_000)),
+                credits_overdue_30_days=int(rng.integers(0, 3)),
+                home_ownership_RENT=bool(home == 0),
+                home_ownership_MORTGAGE=bool(home == 1),
+                home_ownership_OWN=bool(home == 2),
+            )
+        )
+    return users
+
+
+async def wait_until_ready(client: httpx.AsyncClient, timeout: float = 60.0) -> None:
+    """Poll /health/ until the server has loaded and warmed its model."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/health/")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("Server did not become ready")
+
+
+async def drive_load(
+    client: httpx.AsyncClient,
+    payloads: list[dict],
+    concurrency: int,
+    duration: float,
+    path: str = "/predict/",
+) -> dict:
+    """Closed loop: `concurrency` workers each POST one payload after another."""
+    latencies: list[float] = []
+    errors = 0
+    stop_at = time.perf_counter() + duration
+
+    async def worker(offset: int) -> None:
+        nonlocal errors
+        i = offset
+        while time.perf_counter() < stop_at:
+            start = time.perf_counter()
+            response = await client.post(path, json=payloads[i % len(payloads)])
+            latencies.append(time.perf_counter() - start)
+            errors += response.status_code != 200
+            i += concurrency
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+    }
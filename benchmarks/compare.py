@@ -0,0 +1,83 @@
+"""Diff two `benchmarks.suite` result files; exit 1 on regressions.
+
+python -m benchmarks.compare baseline.json candidate.json --tolerance 0.10
+
+Latencies and per-row times regress when they grow by more than the
+tolerance, throughput when it drops by more than the tolerance.
+"""
+
+import argparse
+import json
+import sys
+
+# Metric names where a larger value is better; everything else is a cost.
+_HIGHER_IS_BETTER = {"rps"}
+# Counts and parameters that are reported but not judged.
+_IGNORED = {"requests", "errors", "rows", "batch_size", "min_us_per_row"}
+
+
+def flatten(results: dict, prefix: str = "") -> dict[str, float]:
+    """Numeric leaves of `results` keyed by their dotted path."""
+    metrics = {}
+    for key, value in results.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            metrics.update(flatten(value, path + "."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            if key not in _IGNORED:
+                metrics[path] = float(value)
+    return metrics
+
+
+def compare(baseline: dict, candidate: dict, tolerance: float) -> list[dict]:
+    base = flatten({k: v for k, v in baseline.items() if k != "environment"})
+    new = flatten({k: v for k, v in candidate.items() if k != "environment"})
+    rows = []
+    for path in sorted(base.keys() & new.keys()):
+        before, after = base[path], new[path]
+        change = (after - before) / before if before else 0.0
+        if path.rsplit(".", 1)[-1] in _HIGHER_IS_BETTER:
+            regressed = change < -tolerance
+        else:
+            regressed = change > tolerance
+        rows.append(
+            {
+                "metric": path,
+                "baseline": before,
+                "candidate": after,
+                "change": change,
+                "regressed": regressed,
+            }
+        )
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    args = parser.parse_args()
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.candidate, encoding="utf-8") as f:
+        candidate = json.load(f)
+
+    rows = compare(baseline, candidate, args.tolerance)
+    for row in rows:
+        flag = "REGRESSED" if row["regressed"] else ""
+        print(
+            f"{row['metric']:<50} {row['baseline']:12.2f} {row['candidate']:12.2f}"
+            f" {row['change']:+8.1%} {flag}"
+        )
+    regressions = [row for row in rows if row["regressed"]]
+    if regressions:
+        print(
+            f"{len(regressions)} metric(s) regressed by more than {args.tolerance:.0%}"
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Cost of drift monitoring on the /predict path, and the size of its sketches.
+
+python -m benchmarks.drift --rows 2000 --workers 4
+
+Reports microseconds per row for `DriftMonitor.observe`, single-row and
+batched (including the periodic folds into the sketch), next to scoring
+the same rows. Also reports the memory and file size of one sketch and
+the time `/drift` takes to merge one sketch per worker and compare it
+with a reference.
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from app.services import scoring
+from app.services.drift import DriftMonitor, Sketch
+from app.services.features import (
+    build_feature_matrix,
+    convert_matrix_to_usd,
+    user_features,
+    users_to_matrix,
+)
+from benchmarks.common import FX_RATE, ensure_model, synthetic_users
+from benchmarks.stages import _us_per_row
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    ensure_model()
+    users = synthetic_users(args.rows)
+    rows = [user_features(user, FX_RATE) for user in users]
+    matrix = build_feature_matrix(
+        convert_matrix_to_usd(users_to_matrix(users), FX_RATE)
+    )
+    predictions = scoring.predict(matrix)
+    batches = [
+        (matrix[i : i + args.batch_size], predictions[i : i + args.batch_size])
+        for i in range(0, len(matrix), args.batch_size)
+    ]
+
+    with tempfile.TemporaryDirectory() as directory:
+        monitor = DriftMonitor(directory, os.path.join(directory, "reference.npz"))
+
+        def observe_single():
+            for features, prediction in zip(rows, predictions):
+                monitor.observe(features, [prediction])
+
+        def observe_batches():
+            for features, batch_predictions in batches:
+                monitor.observe(features, batch_predictions)
+
+        def score_single():
+            for features in rows:
+                scoring.score(features)
+
+        single = _us_per_row(observe_single, len(rows), args.repeats)["us_per_row"]
+        batched = _us_per_row(observe_batches, len(matrix), args.repeats)["us_per_row"]
+        scored = _us_per_row(score_single, len(rows), args.repeats)["us_per_row"]
+        print(
+            f"observe   single {single:6.2f} us/row  batched {batched:6.2f} us/row"
+            f"  ({single / scored:.1%} of single-row scoring, {scored:.0f} us)"
+        )
+
+        monitor.flush()
+        (name,) = os.listdir(directory)
+        print(
+            f"sketch    {monitor.sketch.counts.nbytes / 1024:.0f} KiB in memory,"
+            f" {os.path.getsize(os.path.join(directory, name)) / 1024:.1f} KiB"
+            " on disk"
+        )
+
+        # One sketch per worker.
+        for _ in range(1, args.workers):
+            other = DriftMonitor(directory)
+            other.observe(matrix, predictions)
+            other.flush()
+        reference = Sketch()
+        reference.update(np.column_stack([matrix, predictions]))
+        reference.save(os.path.join(directory, "reference.npz"))
+        start = time.perf_counter()
+        report = asyncio.run(monitor.report(24))
+        print(
+            f"report    {report['sketches']} sketches merged and compared in"
+            f" {(time.perf_counter() - start) * 1000:.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Per-request cost of feature engineering: pydantic models vs compiled expressions.
+
+python -m benchmarks.feature_pipeline --rows 5000
+
+The pydantic path is what `predict_xgb_boost` did before `user_features`:
+rebuild `UserData` in USD, build `InputFeatures` and call `model_dump()`
+for the override check and the model vector.
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from app.dependencies.currency import currency_fields
+from app.schemas.user import InputFeatures, UserData
+from app.services.features import user_features
+from benchmarks.common import FX_RATE, synthetic_users
+
+
+def pydantic_features(user: UserData, rate: float) -> np.ndarray:
+    data = user.model_dump()
+    for feat in currency_fields:
+        data[feat] = data[feat] / rate if data[feat] != 0 else 0
+    input_model = InputFeatures(**UserData(**data).model_dump())
+    if any(input_model.model_dump().values()):
+        input_model.home_ownership_ANY = True
+    return np.array([list(input_model.model_dump().values())], np.float64)
+
+
+def profile(fn, users: list[UserData]) -> tuple[float, float]:
+    """Microseconds per row and mean peak of traced memory while building one row."""
+    start = time.perf_counter()
+    for user in users:
+        fn(user, FX_RATE)
+    seconds = time.perf_counter() - start
+
+    sample = users[: min(len(users), 500)]
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    peaks = 0
+    for user in sample:
+        tracemalloc.reset_peak()
+        fn(user, FX_RATE)
+        _, peak = tracemalloc.get_traced_memory()
+        peaks += peak - before
+    tracemalloc.stop()
+    return seconds / len(users) * 1e6, peaks / len(sample)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=5000)
+    args = parser.parse_args()
+
+    users = synthetic_users(args.rows)
+    for user in users:
+        expected = pydantic_features(user, FX_RATE)
+        assert np.array_equal(user_features(user, FX_RATE), expected), user
+
+    print(f"{'path':<10} {'us/row':>8} {'peak bytes':>10}")
+    for name, fn in (("pydantic", pydantic_features), ("compiled", user_features)):
+        us, peak = profile(fn, users)
+        print(f"{name:<10} {us:8.1f} {peak:10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Overhead of the stage timing instrumentation.
+
+python -m benchmarks.instrumentation --calls 20000
+
+Times a `timed()` block with and without a request in context, and one
+request through `TimingMiddleware` around a trivial ASGI app compared with
+the bare app, reporting the per-request difference.
+"""
+
+import argparse
+import asyncio
+import time
+
+from app.services.timing import RequestTimings, TimingMiddleware, _current, timed
+
+
+async def _trivial_app(scope, receive, send):
+    with timed("features"):
+        pass
+    with timed("inference"):
+        pass
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+class _Route:
+    path = "/predict/"
+
+
+async def _seconds_per_request(app, calls: int) -> float:
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    start = time.perf_counter()
+    for _ in range(calls):
+        scope = {"type": "http", "method": "POST", "route": _Route()}
+        await app(scope, receive, send)
+    return (time.perf_counter() - start) / calls
+
+
+def _timed_block(calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        with timed("predict"):
+            pass
+    return (time.perf_counter() - start) / calls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=20000)
+    args = parser.parse_args()
+
+    idle = _timed_block(args.calls)
+    token = _current.set(RequestTimings())
+    active = _timed_block(args.calls)
+    _current.reset(token)
+    print(f"timed() outside a request: {idle * 1e9:8.0f} ns")
+    print(f"timed() inside a request:  {active * 1e9:8.0f} ns")
+
+    bare = asyncio.run(_seconds_per_request(_trivial_app, args.calls))
+    for server_timing in (False, True):
+        wrapped = TimingMiddleware(_trivial_app, server_timing=server_timing)
+        seconds = asyncio.run(_seconds_per_request(wrapped, args.calls))
+        print(
+            f"middleware (Server-Timing {'on' if server_timing else 'off'}): "
+            f"{(seconds - bare) * 1e6:6.1f} us per request"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""Throughput and server memory of /jobs against /predict/batch.
+
+python -m benchmarks.jobs --rows 10000 100000
+
+Starts uvicorn once per run and samples the server's RSS while it works.
+A job run uploads NDJSON, streams the results as they are committed and
+reports rows/s, the time to the first result line and the peak RSS over
+the idle server. The batch run posts one /predict/batch request of the
+same rows, so it is capped at `PREDICT_BATCH_MAX_ROWS`.
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import httpx
+
+from app import config
+from benchmarks.common import synthetic_users, wait_until_ready
+
+
+def _rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status", encoding="ascii") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+class _PeakRss:
+    def __init__(self, pid: int, interval: float = 0.02):
+        self.pid = pid
+        self.interval = interval
+        self.peak = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self) -> None:
+        while not self._stop.is_set():
+            self.peak = max(self.peak, _rss_mb(self.pid))
+            time.sleep(self.interval)
+
+    def __enter__(self) -> "_PeakRss":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def _ndjson(users) -> bytes:
+    return b"".join(user.model_dump_json().encode() + b"\n" for user in users)
+
+
+async def _upload(body: bytes, repeat: int):
+    # Streamed, so neither side needs the whole job in memory.
+    for _ in range(repeat):
+        yield body
+
+
+async def _job(client: httpx.AsyncClient, users, repeat: int) -> dict:
+    started = time.perf_counter()
+    response = await client.post(
+        "/jobs/",
+        content=_upload(_ndjson(users), repeat),
+        headers={"content-type": "application/x-ndjson"},
+    )
+    response.raise_for_status()
+    job_id = response.json()["id"]
+    first_row, rows = None, 0
+    async with client.stream("GET", f"/jobs/{job_id}/results") as results:
+        async for line in results.aiter_lines():
+            if line:
+                rows += 1
+                first_row = first_row or time.perf_counter() - started
+    state = (await client.get(f"/jobs/{job_id}")).json()["state"]
+    return {
+        "rows": rows,
+        "state": state,
+        "seconds": time.perf_counter() - started,
+        "first_row_seconds": first_row,
+    }
+
+
+async def _batch(client: httpx.AsyncClient, users, repeat: int) -> dict:
+    started = time.perf_counter()
+    response = await client.post(
+        "/predict/batch",
+        content=_ndjson(users) * repeat,
+        headers={"content-type": "application/x-ndjson"},
+    )
+    response.raise_for_status()
+    seconds = time.perf_counter() - started
+    return {
+        "rows": len(response.text.splitlines()),
+        "state": "done",
+        "seconds": seconds,
+        "first_row_seconds": seconds,
+    }
+
+
+async def measure(mode: str, rows: int, port: int) -> dict:
+    with tempfile.TemporaryDirectory(prefix="fico-jobs-") as directory:
+        return await _measure(mode, rows, port, directory)
+
+
+async def _measure(mode: str, rows: int, port: int, directory: str) -> dict:
+    env = {
+        **os.environ,
+        "FX_BACKEND": "env",
+        "FX_UAH_RATE": os.getenv("FX_UAH_RATE", "41.5"),
+        "JOBS_DIR": directory,
+        "JOBS_POLL_INTERVAL": "0.1",
+        "ADMISSION_DEFAULT_TIMEOUT": "60",
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port)]
+        + ["--log-level", "warning", "--no-access-log"],
+        env=env,
+    )
+    users = synthetic_users(min(rows, 1000))
+    try:
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{port}", timeout=600
+        ) as client:
+            await wait_until_ready(client)
+            idle = _rss_mb(server.pid)
+            with _PeakRss(server.pid) as rss:
+                run = _job if mode == "job" else _batch
+                result = await run(client, users, rows // len(users))
+        return {**result, "idle_mb": idle, "peak_mb": rss.peak}
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--port", type=int, default=8004)
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        modes = ["job"]
+        if rows <= config.PREDICT_BATCH_MAX_ROWS:
+            modes.insert(0, "batch")
+        for mode in modes:
+            result = asyncio.run(measure(mode, rows, args.port))
+            print(
+                f"{mode:<5} {result['rows']:>7} rows ({result['state']})"
+                f"  {result['rows'] / result['seconds']:7.0f} rows/s"
+                f"  first row {result['first_row_seconds']:6.2f}s"
+                f"  rss idle {result['idle_mb']:4.0f} MB"
+                f" peak +{result['peak_mb'] - result['idle_mb']:4.0f} MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
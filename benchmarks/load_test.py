@@ -0,0 +1,70 @@
+"""Closed-loop HTTP load test of POST /predict against a real uvicorn server.
+
+Starts `benchmarks.serve` once per configuration (environment overrides
+such as INFERENCE_EXECUTOR=process or BATCHING_ENABLED=1) and reports
+requests/s and latency percentiles.
+
+    python -m benchmarks.load_test --concurrency 64 --duration 10
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+
+import httpx
+
+from benchmarks.common import drive_load, synthetic_users, wait_until_ready
+
+CONFIGURATIONS = {
+    "unpinned-booster": {"INFERENCE_EXECUTOR": "thread", "INFERENCE_NTHREAD": "0"},
+    "thread-executor": {"INFERENCE_EXECUTOR": "thread", "INFERENCE_NTHREAD": "1"},
+    "process-executor": {"INFERENCE_EXECUTOR": "process", "INFERENCE_NTHREAD": "1"},
+    "micro-batching": {"INFERENCE_EXECUTOR": "thread", "BATCHING_ENABLED": "1"},
+}
+
+
+async def run_load(
+    base_url: str, payloads: list[dict], concurrency: int, duration: float
+) -> dict:
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits) as client:
+        await wait_until_ready(client)
+        return await drive_load(client, payloads, concurrency, duration)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--config", choices=CONFIGURATIONS, action="append")
+    args = parser.parse_args()
+
+    payloads = [user.model_dump() for user in synthetic_users(1000)]
+    results = {}
+    for name in args.config or CONFIGURATIONS:
+        env = {**os.environ, "FX_BACKEND": "env", **CONFIGURATIONS[name]}
+        server = subprocess.Popen(
+            [sys.executable, "-m", "benchmarks.serve", "--port", str(args.port)],
+            env=env,
+        )
+        try:
+            results[name] = asyncio.run(
+                run_load(
+                    f"http://127.0.0.1:{args.port}",
+                    payloads,
+                    args.concurrency,
+                    args.duration,
+                )
+            )
+        finally:
+            server.terminate()
+            server.wait()
+        print(f"{name:18s} " + json.dumps(results[name], default=float), flush=True)
+
+
+if __name__ == "__main__":
+    main()
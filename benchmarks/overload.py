@@ -0,0 +1,166 @@
+"""Behaviour under overload, with and without admission control.
+
+python -m benchmarks.overload --overload 2 --duration 10
+
+Starts uvicorn once per mode, measures the closed-loop capacity of
+/predict, then sends an open-loop stream at `--overload` times that rate,
+each request with an `X-Request-Timeout` deadline. It reports the latency
+of the requests that were served, how many were shed (429/503) or failed,
+and the latency of /health/live probes sent meanwhile. Requests are
+prebuilt bytes on raw connections, so the client stays cheap next to the
+server even on one core.
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+import numpy as np
+
+from benchmarks.common import drive_load, synthetic_users, wait_until_ready
+
+PATH = "/predict/"
+
+
+def _percentiles(values: list[float]) -> str:
+    if not values:
+        return "-"
+    p50, p99 = np.percentile(values, [50, 99]) * 1000
+    return f"p50 {p50:7.1f} ms  p99 {p99:7.1f} ms"
+
+
+def _request(method: str, path: str, body: bytes = b"", headers: dict = {}) -> bytes:
+    lines = [f"{method} {path} HTTP/1.1", "Host: benchmark", "Connection: close"]
+    lines += [f"{name}: {value}" for name, value in headers.items()]
+    if body:
+        lines += ["Content-Type: application/json", f"Content-Length: {len(body)}"]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode() + body
+
+
+async def _send(port: int, request: bytes) -> int:
+    """Send one prebuilt request on a new connection; returns the status code."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        writer.write(request)
+        status_line = await reader.readline()
+        await reader.read()
+        return int(status_line.split()[1])
+    finally:
+        writer.close()
+
+
+async def _overload(
+    port: int,
+    requests: list[bytes],
+    rate: float,
+    duration: float,
+    deadline: float,
+) -> dict:
+    served, shed, failed, probes = [], 0, 0, []
+    probe_request = _request("GET", "/health/live")
+
+    async def one(request: bytes) -> None:
+        nonlocal shed, failed
+        start = time.perf_counter()
+        try:
+            status = await asyncio.wait_for(_send(port, request), deadline * 4)
+        except (OSError, asyncio.TimeoutError):
+            failed += 1
+            return
+        if status == 200:
+            served.append(time.perf_counter() - start)
+        elif status in (429, 503):
+            shed += 1
+        else:
+            failed += 1
+
+    async def probe() -> None:
+        while time.perf_counter() < stop_at:
+            start = time.perf_counter()
+            await _send(port, probe_request)
+            probes.append(time.perf_counter() - start)
+            await asyncio.sleep(0.2)
+
+    stop_at = time.perf_counter() + duration
+    probing = asyncio.create_task(probe())
+    tasks, i = [], 0
+    started = time.perf_counter()
+    while time.perf_counter() < stop_at:
+        tasks.append(asyncio.create_task(one(requests[i % len(requests)])))
+        i += 1
+        await asyncio.sleep(max(0.0, started + i / rate - time.perf_counter()))
+    await asyncio.gather(*tasks)
+    await probing
+    return {
+        "sent": i,
+        "served": len(served),
+        "shed": shed,
+        "failed": failed,
+        "served_latency": _percentiles(served),
+        "probe_latency": _percentiles(probes),
+        "elapsed": time.perf_counter() - started,
+    }
+
+
+async def _run_mode(admission: bool, args: argparse.Namespace) -> dict:
+    env = {
+        **os.environ,
+        "ADMISSION_CONTROL": str(admission).lower(),
+        "FX_BACKEND": "env",
+        "FX_UAH_RATE": os.getenv("FX_UAH_RATE", "41.5"),
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port)]
+        + ["--log-level", "warning", "--no-access-log"],
+        env=env,
+    )
+    users = synthetic_users(1000)
+    headers = {"X-Request-Timeout": args.deadline}
+    requests = [
+        _request("POST", PATH, user.model_dump_json().encode(), headers)
+        for user in users
+    ]
+    try:
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{args.port}"
+        ) as client:
+            await wait_until_ready(client)
+            payloads = [user.model_dump() for user in users]
+            capacity = await drive_load(client, payloads, 8, 2.0, PATH)
+        rate = capacity["rps"] * args.overload
+        result = await _overload(
+            args.port, requests, rate, args.duration, args.deadline
+        )
+        return {"capacity_rps": capacity["rps"], "offered_rps": rate, **result}
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--overload", type=float, default=2.0)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--deadline", type=float, default=1.0)
+    parser.add_argument("--port", type=int, default=8003)
+    args = parser.parse_args()
+
+    for admission in (False, True):
+        result = asyncio.run(_run_mode(admission, args))
+        print(
+            f"admission {'on ' if admission else 'off'}:"
+            f" capacity {result['capacity_rps']:.0f} rps,"
+            f" offered {result['offered_rps']:.0f} rps for {result['elapsed']:.1f}s\n"
+            f"  served {result['served']}/{result['sent']}"
+            f"  shed {result['shed']}  failed {result['failed']}"
+            f"  served {result['served_latency']}\n"
+            f"  /health/live {result['probe_latency']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Per-response cost of FastAPI's generic serialization vs the prebuilt encoders.
+
+python -m benchmarks.serialization --rows 2000
+
+`fastapi` re-validates against the response model and encodes through
+`jsonable_encoder` + `json.dumps` (FastAPI 0.115, as pinned in
+requirements.txt); `fastapi-dump-json` is newer FastAPI, which still
+re-validates but dumps JSON in pydantic-core; `adapter` is
+`app.services.serialization`.
+"""
+
+import argparse
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.schemas.response import ResponseWithRecommendation
+from app.services import scoring
+from app.services.features import user_features
+from app.services.serialization import RECOMMENDATIONS_ADAPTER, RESPONSE_ADAPTER
+from benchmarks.common import FX_RATE, ensure_model, synthetic_users
+
+
+def _us_per_call(fn, values: list, repeats: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for value in values:
+            fn(value)
+        best = min(best, time.perf_counter() - start)
+    return best / len(values) * 1e6
+
+
+def _run(coroutine):
+    # serialize_response never suspends for async endpoints; skip the event loop.
+    try:
+        coroutine.send(None)
+    except StopIteration as done:
+        return done.value
+    raise RuntimeError("serialize_response suspended")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=2000)
+    args = parser.parse_args()
+
+    ensure_model()
+    users = synthetic_users(args.rows)
+    responses = [scoring.score(user_features(user, FX_RATE))[0] for user in users]
+    recommendations = [scoring.recommend_user(user.model_dump()) for user in users]
+
+    field = create_model_field(
+        "Response_predict", ResponseWithRecommendation, mode="serialization"
+    )
+
+    def fastapi_default(value):
+        content = _run(serialize_response(field=field, response_content=value))
+        return JSONResponse(content).body
+
+    def fastapi_dump_json(value):
+        return _run(
+            serialize_response(field=field, response_content=value, dump_json=True)
+        )
+
+    def fastapi_untyped(value):
+        return JSONResponse(jsonable_encoder(value)).body
+
+    print(f"{'response':<12} {'encoder':<18} {'us/response':>12}")
+    for name, fn in (
+        ("fastapi", fastapi_default),
+        ("fastapi-dump-json", fastapi_dump_json),
+        ("adapter", RESPONSE_ADAPTER.dump_json),
+    ):
+        print(f"{'/predict':<12} {name:<18} {_us_per_call(fn, responses):12.1f}")
+    for name, fn in (
+        ("fastapi", fastapi_untyped),
+        ("adapter", RECOMMENDATIONS_ADAPTER.dump_json),
+    ):
+        print(
+            f"{'/recommend':<12} {name:<18} {_us_per_call(fn, recommendations):12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+"""Run the API under uvicorn with a local FX rate and, if needed, a synthetic model.
+
+python -m benchmarks.serve --port 8001
+"""
+
+import argparse
+
+import uvicorn
+
+from benchmarks.common import ensure_model, use_local_fx_rate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    args = parser.parse_args()
+
+    use_local_fx_rate()
+    ensure_model()
+
+    from app.main import app
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Micro-benchmarks of each /predict pipeline stage, single-row and batched.
+
+python -m benchmarks.stages --rows 2000 --batch-size 256
+
+Every stage is timed over the same synthetic applicants and reported in
+microseconds per row (the median of `--repeats` passes).
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Callable
+
+from app.schemas.response import ResponseWithRecommendation
+from app.schemas.user import UserData
+from app.services import scoring
+from app.services.exchange_rate import get_rate_provider
+from app.services.features import (
+    build_feature_matrix,
+    convert_matrix_to_usd,
+    user_features,
+    users_to_matrix,
+)
+from benchmarks.common import FX_RATE, ensure_model, synthetic_users, use_local_fx_rate
+from pydantic import TypeAdapter
+
+_responses_adapter = TypeAdapter(list[ResponseWithRecommendation])
+
+
+def _us_per_row(run: Callable[[], object], rows: int, repeats: int) -> dict:
+    run()
+    passes = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        passes.append((time.perf_counter() - start) / rows * 1e6)
+    return {"us_per_row": statistics.median(passes), "min_us_per_row": min(passes)}
+
+
+def single_row_stages(users: list[UserData], repeats: int = 5) -> dict:
+    """The stages of one /predict request, applied to each user in turn."""
+    bodies = [user.model_dump_json() for user in users]
+    features = [user_features(user, FX_RATE) for user in users]
+    provider = get_rate_provider()
+
+    async def fetch_rates() -> None:
+        await provider.start()
+        for _ in users:
+            await provider.get_rate()
+
+    n = len(users)
+    return {
+        "validation": _us_per_row(
+            lambda: [UserData.model_validate_json(body) for body in bodies],
+            n,
+            repeats,
+        ),
+        "fx_rate": _us_per_row(lambda: asyncio.run(fetch_rates()), n, repeats),
+        # Currency conversion is fused into the single-row feature function.
+        "conversion_and_features": _us_per_row(
+            lambda: [user_features(user, FX_RATE) for user in users], n, repeats
+        ),
+        "predict": _us_per_row(
+            lambda: [scoring.predict(row) for row in features], n, repeats
+        ),
+        "recommend": _us_per_row(
+            lambda: [scoring.recommend(row) for row in features], n, repeats
+        ),
+        "score_and_serialize": _us_per_row(
+            lambda: [scoring.score(row)[0].model_dump_json() for row in features],
+            n,
+            repeats,
+        ),
+    }
+
+
+def batch_stages(users: list[UserData], batch_size: int, repeats: int = 5) -> dict:
+    """The stages of /predict/batch over `batch_size`-row chunks."""
+    chunks = [users[i : i + batch_size] for i in range(0, len(users), batch_size)]
+    bodies = [_user_list_json(chunk) for chunk in chunks]
+    raws = [users_to_matrix(chunk) for chunk in chunks]
+    features = [
+        build_feature_matrix(convert_matrix_to_usd(raw.copy(), FX_RATE)) for raw in raws
+    ]
+    results = [scoring.score(matrix) for matrix in features]
+    adapter = TypeAdapter(list[UserData])
+
+    n = len(users)
+    return {
+        "validation": _us_per_row(
+            lambda: [adapter.validate_json(body) for body in bodies], n, repeats
+        ),
+        "to_matrix": _us_per_row(
+            lambda: [users_to_matrix(chunk) for chunk in chunks], n, repeats
+        ),
+        "conversion": _us_per_row(
+            lambda: [convert_matrix_to_usd(raw.copy(), FX_RATE) for raw in raws],
+            n,
+            repeats,
+        ),
+        "features": _us_per_row(
+            lambda: [build_feature_matrix(raw) for raw in raws], n, repeats
+        ),
+        "predict": _us_per_row(
+            lambda: [scoring.predict(matrix) for matrix in features], n, repeats
+        ),
+        "recommend": _us_per_row(
+            lambda: [scoring.recommend(matrix) for matrix in features], n, repeats
+        ),
+        "serialize": _us_per_row(
+            lambda: [_responses_adapter.dump_json(result) for result in results],
+            n,
+            repeats,
+        ),
+    }
+
+
+def _user_list_json(users: list[UserData]) -> bytes:
+    return ("[" + ",".join(user.model_dump_json() for user in users) + "]").encode()
+
+
+def run_stages(rows: int, batch_size: int, repeats: int) -> dict:
+    use_local_fx_rate()
+    ensure_model()
+    users = synthetic_users(rows)
+    return {
+        "rows": rows,
+        "batch_size": batch_size,
+        "single": single_row_stages(users, repeats),
+        "batch": batch_stages(users, batch_size, repeats),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    results = run_stages(args.rows, args.batch_size, args.repeats)
+    print(json.dumps(results, indent=2, default=float))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Run the stage micro-benchmarks and the in-process load test, write JSON.
+
+python -m benchmarks.suite --output bench.json
+python -m benchmarks.compare baseline.json bench.json --tolerance 0.10
+
+Nothing touches the network: the FX rate comes from a local stand-in and a
+synthetic model is fitted when no model artifact is present.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+import xgboost
+
+from benchmarks.asgi_load import CONCURRENCY_LEVELS, run_asgi_load
+from benchmarks.stages import run_stages
+
+# Settings that change what the numbers mean, recorded with the results
+_SETTINGS = (
+    "MODEL_BACKEND",
+    "INFERENCE_EXECUTOR",
+    "INFERENCE_WORKERS",
+    "INFERENCE_NTHREAD",
+    "BATCHING_ENABLED",
+    "PREDICTION_CACHE",
+)
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def environment() -> dict:
+    from app import config
+    from app.models.boost_model import ForwardModel
+
+    return {
+        "commit": _git_commit(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "xgboost": xgboost.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "model_version": ForwardModel().model.version,
+        "settings": {name: getattr(config, name) for name in _SETTINGS},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", help="Write the results here instead of stdout")
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=CONCURRENCY_LEVELS
+    )
+    parser.add_argument("--duration", type=float, default=5.0)
+    args = parser.parse_args()
+
+    stages = run_stages(args.rows, args.batch_size, args.repeats)
+    results = {
+        "environment": environment(),
+        "stages": stages,
+        "load": asyncio.run(run_asgi_load(args.concurrency, args.duration)),
+    }
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Parity and latency of the model backends at several batch sizes.
+
+python -m benchmarks.tree_backends
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from app.models.compiled_trees import CodegenTrees, TreeArrays, check_parity
+from app.services.features import build_feature_matrix, users_to_matrix
+from benchmarks.common import ensure_model, synthetic_users
+
+BATCH_SIZES = (1, 16, 256, 10_000)
+
+
+def _time_per_call(fn, X: np.ndarray, min_seconds: float = 0.5) -> float:
+    fn(X)
+    calls, start = 0, time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < min_seconds:
+        fn(X)
+        calls += 1
+    return elapsed / calls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=BATCH_SIZES)
+    args = parser.parse_args()
+
+    model = ensure_model().model
+    trees = TreeArrays.from_booster(model.booster)
+
+    def xgboost_predict(X):
+        return model.booster.inplace_predict(X, validate_features=False)
+
+    backends = {
+        "xgboost": xgboost_predict,
+        "arrays": trees.predict,
+        "codegen": CodegenTrees(trees).predict,
+    }
+    for name in ("arrays", "codegen"):
+        deviation = check_parity(backends[name].__self__, xgboost_predict, trees)
+        print(f"{name} parity: max relative deviation {deviation:.3g}")
+
+    users = synthetic_users(max(args.batch_sizes))
+    X = build_feature_matrix(users_to_matrix(users)).astype(np.float32)
+
+    print(f"{'batch':>7} " + " ".join(f"{name:>14}" for name in backends))
+    for size in args.batch_sizes:
+        timings = [_time_per_call(fn, X[:size]) for fn in backends.values()]
+        print(f"{size:>7} " + " ".join(f"{t * 1e6:>11.1f} us" for t in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Latency of a /recommend/whatif grid against a plain /predict scoring.
+
+python -m benchmarks.whatif --rows 200
+
+Both are timed in-process for the same applicants, without HTTP, and
+reported as the median per applicant together with the grid size.
+"""
+
+import argparse
+import statistics
+import time
+
+from app.services import scoring
+from app.services.features import user_features, users_to_matrix
+from benchmarks.common import FX_RATE, ensure_model, synthetic_users
+
+
+def _ms_each(fn, items: list) -> list[float]:
+    fn(items[0])
+    timings = []
+    for item in items:
+        start = time.perf_counter()
+        fn(item)
+        timings.append((time.perf_counter() - start) * 1e3)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200)
+    args = parser.parse_args()
+
+    ensure_model()
+    users = synthetic_users(args.rows)
+    raws = list(users_to_matrix(users))
+
+    predict = _ms_each(lambda user: scoring.score(user_features(user, FX_RATE)), users)
+    whatif = _ms_each(lambda raw: scoring.whatif(raw, FX_RATE), raws)
+    actions = [len(scoring.whatif(raw, FX_RATE).actions) for raw in raws]
+
+    predict_ms, whatif_ms = statistics.median(predict), statistics.median(whatif)
+    print(f"/predict          {predict_ms:7.2f} ms")
+    print(
+        f"/recommend/whatif {whatif_ms:7.2f} ms"
+        f"  ({whatif_ms / predict_ms:.1f}x, {statistics.mean(actions):.1f} actions)"
+    )
+
+
+if __name__ == "__main__":
+    main()
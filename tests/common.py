@@ -0,0 +1,18 @@
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from fastapi.testclient import TestClient
+
+
+@contextmanager
+def serve(timeout: float = 60.0) -> Iterator[TestClient]:
+    """The app with its lifespan running, once /health/ reports it ready."""
+    from app.main import app
+
+    with TestClient(app) as client:
+        deadline = time.monotonic() + timeout
+        while client.get("/health/").status_code != 200:
+            assert time.monotonic() < deadline, "app did not become ready"
+            time.sleep(0.05)
+        yield client
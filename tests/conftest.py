@@ -0,0 +1,34 @@
+import os
+import tempfile
+
+# Settings are read at import, so they go in before the app is imported.
+_STATE_DIR = tempfile.mkdtemp(prefix="fico-tests-")
+os.environ.update(
+    FX_BACKEND="env",
+    FX_UAH_RATE="41.5",
+    JOBS_DIR=os.path.join(_STATE_DIR, "jobs"),
+    DRIFT_DIR=os.path.join(_STATE_DIR, "drift"),
+    MODEL_REGISTRY_DIR=os.path.join(_STATE_DIR, "models"),
+)
+
+import pytest  # noqa: E402
+
+from app.models.boost_model import ForwardModel  # noqa: E402
+from app.models.export import export_model  # noqa: E402
+from benchmarks.common import synthetic_model, use_local_fx_rate  # noqa: E402
+from tests.common import serve  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def model():
+    """A synthetic model exported to the test registry, never a shipped one."""
+    use_local_fx_rate()
+    root = os.environ["MODEL_REGISTRY_DIR"]
+    export_model(synthetic_model(), os.path.join(root, "synthetic"))
+    return ForwardModel.load()
+
+
+@pytest.fixture
+def client():
+    with serve() as client:
+        yield client
@@ -0,0 +1,111 @@
+import asyncio
+import json
+
+import numpy as np
+import pytest
+from xgboost import XGBRegressor
+
+from app import config
+from app.models.export import export_model
+from app.models.registry import (
+    CURRENT_FILE,
+    MANIFEST_FILE,
+    ModelRegistry,
+    UnknownModelVersion,
+)
+from app.routers import admin
+from app.schemas.user import MODEL_FEATURES
+from app.services import scoring
+from app.services.features import user_features
+from app.services.shadow import ShadowScorer
+from benchmarks.common import FX_RATE, synthetic_users
+
+
+@pytest.mark.parametrize(
+    "token, status", [(None, 403), ("wrong", 403), ("s3cret", 200)]
+)
+def test_admin_token(client, monkeypatch, token, status):
+    monkeypatch.setattr(config, "ADMIN_TOKEN", "s3cret")
+    headers = {"X-Admin-Token": token} if token is not None else {}
+    assert client.get("/admin/models", headers=headers).status_code == status
+
+
+@pytest.fixture
+def registry(tmp_path):
+    rng = np.random.default_rng(0)
+    X = rng.uniform(0, 100, size=(200, len(MODEL_FEATURES)))
+    for version in ("v1", "v2"):
+        model = XGBRegressor(n_estimators=3, max_depth=2).fit(X, X[:, 0])
+        export_model(model, str(tmp_path / version), version)
+    registry = ModelRegistry(root=str(tmp_path))
+    registry.sync()
+    return registry
+
+
+def test_unload_survives_sync(registry):
+    assert registry.loaded_versions == ["v1", "v2"]
+    registry.unload("v1")
+    registry.sync()
+    assert registry.loaded_versions == ["v2"]
+    assert registry.unloaded_versions == ["v1"]
+    with pytest.raises(UnknownModelVersion):
+        registry.get("v1")
+
+    registry.load("v1")
+    registry.sync()
+    assert registry.loaded_versions == ["v1", "v2"]
+    assert registry.unloaded_versions == []
+
+
+def test_sync_skips_version_removed_after_listing(registry, monkeypatch):
+    listed = registry.available_versions()
+    # v3 was listed, then deleted before its manifest could be read.
+    monkeypatch.setattr(registry, "available_versions", lambda: listed + ["v3"])
+    registry.sync()
+    assert registry.loaded_versions == ["v1", "v2"]
+    assert registry.default_version == "v2"
+
+
+def test_promotion_reloads_unloaded_version(registry, tmp_path):
+    registry.unload("v1")
+    # Another worker promoting v1 writes the pointer.
+    (tmp_path / CURRENT_FILE).write_text("v1")
+    registry.sync()
+    assert registry.default_version == "v1"
+    assert registry.unloaded_versions == []
+
+
+def test_broken_artifact_is_rejected_with_422(client, registry, tmp_path, monkeypatch):
+    model = XGBRegressor(n_estimators=3, max_depth=2)
+    model.fit(np.zeros((4, len(MODEL_FEATURES))), np.arange(4))
+    export_model(model, str(tmp_path / "v3"), "v3")
+    manifest = json.loads((tmp_path / "v3" / MANIFEST_FILE).read_text())
+    with open(tmp_path / "v3" / next(iter(manifest["files"])), "ab") as f:
+        f.write(b"corrupt")
+    monkeypatch.setattr(config, "ADMIN_TOKEN", "s3cret")
+    monkeypatch.setattr(admin, "get_registry", lambda: registry)
+    headers = {"X-Admin-Token": "s3cret"}
+
+    promoted = client.post("/admin/models/v3/promote", headers=headers)
+    assert promoted.status_code == 422
+    assert "Checksum mismatch" in promoted.json()["detail"]
+    shadowed = client.put("/admin/models/shadow/v3?rate=0.5", headers=headers)
+    assert shadowed.status_code == 422
+    assert registry.default_version == "v2"
+
+
+def test_shadow_drops_samples_beyond_inflight_cap(model):
+    features = np.vstack([user_features(u, FX_RATE) for u in synthetic_users(4)])
+    served = [response.prediction for response in scoring.score(features)]
+    shadow = ShadowScorer(model.version, rate=1.0, max_inflight=1)
+
+    async def submit_burst():
+        for _ in range(3):
+            shadow.submit(features, "primary", served)
+        await asyncio.gather(*shadow._tasks)
+
+    asyncio.run(submit_burst())
+    assert shadow.dropped == 2
+    assert shadow.rows == len(features)
+    # Same model as the served predictions, so nothing differs once truncated.
+    assert shadow.abs_diff_max == 0
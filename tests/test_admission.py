@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from app.services import admission
+from app.services.admission import AdmissionController, Rejected
+from benchmarks.common import synthetic_users
+
+
+def test_full_queue_is_rejected_at_once():
+    async def run():
+        controller = AdmissionController(max_concurrent=1, max_queue=1)
+        await controller.acquire(timeout=1.0)
+        queued = asyncio.create_task(controller.acquire(timeout=1.0))
+        await asyncio.sleep(0)
+        with pytest.raises(Rejected) as rejected:
+            await controller.acquire(timeout=1.0)
+
+        # Releasing hands the slot to the queued request.
+        controller.release(0.01)
+        await queued
+        return rejected.value, controller.in_flight
+
+    rejected, in_flight = asyncio.run(run())
+    assert (rejected.status, rejected.reason) == (503, "queue_full")
+    assert rejected.retry_after >= 1
+    assert in_flight == 1
+
+
+def test_unmeetable_deadline_is_rejected_before_queueing():
+    async def run():
+        controller = AdmissionController(max_concurrent=1, max_queue=10)
+        controller._service_seconds = 2.0
+        await controller.acquire(timeout=10.0)
+        with pytest.raises(Rejected) as rejected:
+            await controller.acquire(timeout=1.0)
+        return rejected.value, len(controller._waiters)
+
+    rejected, waiting = asyncio.run(run())
+    assert (rejected.status, rejected.reason) == (503, "deadline")
+    assert waiting == 0
+
+
+def test_deadline_passing_in_queue_is_rejected():
+    async def run():
+        controller = AdmissionController(max_concurrent=1, max_queue=10)
+        await controller.acquire(timeout=10.0)
+        with pytest.raises(Rejected) as rejected:
+            await controller.acquire(timeout=0.01)
+        controller.release(0.01)
+        return rejected.value, len(controller._waiters), controller.in_flight
+
+    rejected, waiting, in_flight = asyncio.run(run())
+    assert rejected.detail == "The request deadline passed while queued"
+    assert (waiting, in_flight) == (0, 0)
+
+
+def test_overloaded_scoring_route_answers_503(client, monkeypatch):
+    controller = AdmissionController(max_concurrent=1, max_queue=0)
+    controller._take()  # a request holding the only slot
+    monkeypatch.setattr(admission, "_controller", controller)
+
+    response = client.post("/predict/", json=synthetic_users(1)[0].model_dump())
+    assert response.status_code == 503
+    assert response.json() == {"detail": "The service is overloaded"}
+    assert int(response.headers["Retry-After"]) >= 1
+    assert client.get("/health/").status_code == 200
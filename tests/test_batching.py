@@ -0,0 +1,69 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from app import config
+from app.routers import predict
+from app.services.batching import BatcherOverloaded, MicroBatcher, get_batcher
+from benchmarks.common import synthetic_users
+from tests.common import serve
+
+
+@pytest.mark.parametrize("attributions", [False, True])
+def test_batched_responses_match_unbatched(monkeypatch, attributions):
+    users = [user.model_dump() for user in synthetic_users(20)]
+    params = {"attributions": attributions}
+
+    def responses() -> tuple[bool, list[dict]]:
+        with serve() as client:
+            bodies = [
+                client.post("/predict/", json=user, params=params).json()
+                for user in users
+            ]
+            return get_batcher() is not None, bodies
+
+    batched, expected = responses()
+    assert not batched
+    monkeypatch.setattr(config, "BATCHING_ENABLED", True)
+    batched, actual = responses()
+    assert batched
+    assert actual == expected
+
+
+def test_full_queue_rejects_rows():
+    async def run():
+        calls = []
+
+        async def score(matrix: np.ndarray, key) -> list:
+            calls.append((len(matrix), key))
+            return matrix[:, 0].tolist()
+
+        batcher = MicroBatcher(score, max_wait_us=0, max_queue_size=2)
+        pending = [asyncio.create_task(batcher.submit([i], "v")) for i in (1, 2)]
+        await asyncio.sleep(0)
+        with pytest.raises(BatcherOverloaded):
+            await batcher.submit([3], "v")
+
+        # Queued rows still complete once the batcher runs.
+        await batcher.start()
+        results = await asyncio.gather(*pending)
+        await batcher.stop()
+        return results, calls
+
+    results, calls = asyncio.run(run())
+    assert results == [1.0, 2.0]
+    assert calls == [(2, "v")]
+
+
+def test_overloaded_batcher_answers_503(client, monkeypatch):
+    async def score(matrix, key):
+        raise AssertionError("nothing should be scored")
+
+    batcher = MicroBatcher(score, max_queue_size=1)
+    batcher._queue.put_nowait(None)
+    monkeypatch.setattr(predict, "get_batcher", lambda: batcher)
+
+    response = client.post("/predict/", json=synthetic_users(1)[0].model_dump())
+    assert response.status_code == 503
+    assert response.json()["detail"] == "Too many pending predictions"
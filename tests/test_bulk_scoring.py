@@ -0,0 +1,51 @@
+import csv
+
+import pytest
+
+from app.models.registry import get_registry
+from app.services.bulk_scoring import score_file
+from app.services.features import USER_FIELDS
+from benchmarks.common import FX_RATE, synthetic_users
+
+
+def _write_csv(path, users) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(USER_FIELDS)
+        for user in users:
+            writer.writerow(user.__dict__.values())
+
+
+def test_default_version_is_resolved_once(tmp_path, monkeypatch):
+    _write_csv(tmp_path / "in.csv", synthetic_users(20))
+    versions = []
+
+    def score_chunk(records, first_row, rate, version, *args):
+        versions.append(version)
+        return []
+
+    monkeypatch.setattr("app.services.bulk_scoring.score_chunk", score_chunk)
+    summary = score_file(
+        str(tmp_path / "in.csv"), str(tmp_path / "out.csv"), FX_RATE, chunk_size=5
+    )
+    assert summary["version"] == get_registry().default_version
+    assert versions == [summary["version"]] * 4
+
+
+def test_parquet_output_schema_does_not_depend_on_first_chunk(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    users = synthetic_users(10)
+    _write_csv(tmp_path / "in.csv", users)
+    with open(tmp_path / "in.csv", "a", newline="", encoding="utf-8") as f:
+        # Invalid only in the second chunk: total_accounts must be >= 1.
+        csv.writer(f).writerow({**users[0].__dict__, "total_accounts": 0}.values())
+
+    score_file(
+        str(tmp_path / "in.csv"), str(tmp_path / "out.parquet"), FX_RATE, chunk_size=10
+    )
+    table = pq.read_table(tmp_path / "out.parquet")
+    assert table.num_rows == 11
+    assert str(table.schema.field("prediction").type) == "int64"
+    assert str(table.schema.field("error").type) == "string"
+    errors = table.column("error").to_pylist()
+    assert errors[:10] == [None] * 10 and errors[10] is not None
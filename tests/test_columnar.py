@@ -0,0 +1,25 @@
+import io
+
+import numpy as np
+
+from app.services.columnar import NPY_MEDIA_TYPE, write_npy
+from app.services.features import USER_FIELDS
+from benchmarks.common import synthetic_users
+
+
+def test_columnar_predictions_match_batch(client):
+    users = synthetic_users(200)
+    columns = {
+        name: np.array([getattr(user, name) for user in users]) for name in USER_FIELDS
+    }
+    response = client.post(
+        "/predict/columnar",
+        content=write_npy(columns),
+        headers={"content-type": NPY_MEDIA_TYPE},
+    )
+    assert response.status_code == 200
+    predictions = np.load(io.BytesIO(response.content))["prediction"]
+
+    batch = client.post("/predict/batch", json=[user.model_dump() for user in users])
+    assert predictions.dtype == np.int64
+    assert predictions.tolist() == [row["prediction"] for row in batch.json()]
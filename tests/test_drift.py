@@ -0,0 +1,25 @@
+import os
+
+import numpy as np
+
+from app.schemas.user import MODEL_FEATURES
+from app.services.drift import DriftMonitor, Sketch
+
+
+def test_window_rollover_does_not_write_from_observe(tmp_path, monkeypatch):
+    now = [0.0]
+    monitor = DriftMonitor(str(tmp_path), window_seconds=60, clock=lambda: now[0])
+    rows = np.random.default_rng(0).uniform(1, 100, (300, len(MODEL_FEATURES)))
+
+    def no_writes(*args):
+        raise AssertionError("observe wrote a sketch")
+
+    monkeypatch.setattr(Sketch, "save", no_writes)
+    monitor.observe(rows, np.full(len(rows), 700.0))
+    now[0] = 120.0
+    monitor.observe(rows, np.full(len(rows), 700.0))
+    monitor.observe(rows, np.full(len(rows), 700.0))
+    monkeypatch.undo()
+
+    monitor.flush()
+    assert sorted(name.split("-")[0] for name in os.listdir(tmp_path)) == ["0", "120"]
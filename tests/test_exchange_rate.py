@@ -0,0 +1,144 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.services.exchange_rate import (
+    EnvRateBackend,
+    HttpRateBackend,
+    RateBackend,
+    RateProvider,
+    RateUnavailable,
+    StaticFileRateBackend,
+)
+
+
+class FakeBackend(RateBackend):
+    """Returns queued rates, or raises queued exceptions, one per fetch."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.fetches = 0
+
+    async def fetch(self) -> float:
+        self.fetches += 1
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _provider(backend: RateBackend, clock: Clock) -> RateProvider:
+    return RateProvider(backend, ttl=60.0, max_staleness=600.0, clock=clock)
+
+
+def test_rate_is_fetched_once_within_ttl():
+    backend, clock = FakeBackend(41.5), Clock()
+    provider = _provider(backend, clock)
+
+    async def run():
+        first = await provider.get_rate()
+        clock.now += 59
+        return first, await provider.get_rate()
+
+    assert asyncio.run(run()) == (41.5, 41.5)
+    assert backend.fetches == 1
+
+
+def test_expired_rate_is_served_while_one_refresh_runs():
+    backend, clock = FakeBackend(41.5, 42.0), Clock()
+    provider = _provider(backend, clock)
+
+    async def run():
+        await provider.start()
+        clock.now += 61
+        stale = await asyncio.gather(*(provider.get_rate() for _ in range(5)))
+        await provider._refresh_task
+        return stale, await provider.get_rate()
+
+    stale, fresh = asyncio.run(run())
+    assert stale == [41.5] * 5
+    assert fresh == 42.0
+    assert backend.fetches == 2
+
+
+def test_failed_refreshes_serve_stale_rate_until_max_staleness():
+    backend = FakeBackend(41.5, RuntimeError("down"), RuntimeError("down"))
+    clock = Clock()
+    provider = _provider(backend, clock)
+
+    async def run():
+        await provider.start()
+        clock.now += 300
+        stale = await provider.get_rate()
+        await provider._refresh_task
+        clock.now += 301
+        with pytest.raises(RateUnavailable):
+            await provider.get_rate()
+        return stale
+
+    assert asyncio.run(run()) == 41.5
+    assert backend.fetches == 3
+
+
+def test_non_positive_rate_is_ignored():
+    provider = _provider(FakeBackend(0.0), Clock())
+    with pytest.raises(RateUnavailable):
+        asyncio.run(provider.get_rate())
+
+
+def test_http_backend_reads_uah_rate():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"conversion_rates": {"UAH": 41.25}})
+
+    async def run():
+        backend = HttpRateBackend("https://fx.test/latest/USD", timeout=1.0)
+        backend._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await backend.fetch()
+        finally:
+            await backend.aclose()
+
+    assert asyncio.run(run()) == 41.25
+
+
+def test_http_backend_raises_on_error_status():
+    async def run():
+        backend = HttpRateBackend("https://fx.test/latest/USD", timeout=1.0)
+        backend._client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(503))
+        )
+        try:
+            await backend.fetch()
+        finally:
+            await backend.aclose()
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(run())
+
+
+@pytest.mark.parametrize(
+    "content", [{"UAH": 40.0}, {"result": "success", "conversion_rates": {"UAH": 40.0}}]
+)
+def test_file_backend_reads_plain_and_api_formats(tmp_path, content):
+    path = tmp_path / "rate.json"
+    path.write_text(json.dumps(content))
+    assert asyncio.run(StaticFileRateBackend(str(path)).fetch()) == 40.0
+
+
+def test_env_backend(monkeypatch):
+    backend = EnvRateBackend("TEST_FX_RATE")
+    monkeypatch.setenv("TEST_FX_RATE", "39.9")
+    assert asyncio.run(backend.fetch()) == 39.9
+    monkeypatch.delenv("TEST_FX_RATE")
+    with pytest.raises(RateUnavailable):
+        asyncio.run(backend.fetch())
@@ -0,0 +1,142 @@
+import gc
+import weakref
+
+import numpy as np
+import pytest
+from xgboost import XGBRegressor
+
+from app.models.boost_model import ForwardModel
+from app.models.registry import LoadedModel
+from app.schemas.response import NotNeedImprovement, Recommendation
+from app.schemas.user import MODEL_FEATURES
+from app.services.feature_importance import FeatureRecommender, get_feature_recommender
+from app.services.features import (
+    USER_FIELDS,
+    build_feature_matrix,
+    convert_matrix_to_usd,
+    users_to_matrix,
+)
+from benchmarks.common import FX_RATE, synthetic_users
+
+
+def _model() -> LoadedModel:
+    X = np.random.default_rng(0).uniform(0, 100, size=(200, len(MODEL_FEATURES)))
+    regressor = XGBRegressor(n_estimators=3, max_depth=2).fit(X, X[:, 0])
+    return LoadedModel(regressor.get_booster(), regressor.feature_importances_)
+
+
+def _reference_analyze_features(recommender: FeatureRecommender, user_data: dict):
+    """The original per-feature loop, ranking by global importances."""
+    recommendations = []
+    for feat_name, importance in zip(
+        recommender.feature_names, recommender.model.feature_importances
+    ):
+        if feat_name not in recommender.feature_configs:
+            continue
+        config = recommender.feature_configs[feat_name]
+        good_threshold, max_val = config.threshold
+        current_value = user_data[feat_name]
+        needs_improvement = (
+            (current_value > good_threshold)
+            if config.status.is_negative
+            else (current_value < good_threshold)
+        )
+        if not needs_improvement or not importance > 0.05:
+            continue
+        recommendations.append(
+            Recommendation(
+                feat_name=config.ukrainian_name,
+                current_value=int(current_value),
+                target_value=int(good_threshold),
+                importance=float(importance),
+                impact=float(((good_threshold - current_value) / max_val) * importance),
+                message=recommender._create_message(config, feat_name),
+            )
+        )
+    if not recommendations:
+        return NotNeedImprovement(
+            message="Ваш кредитний рейтинг вже на високому рівні, радимо продовжувати в тому ж дусі!"
+        )
+    return sorted(recommendations, key=lambda x: abs(x.impact), reverse=True)
+
+
+def _dump(result):
+    if isinstance(result, list):
+        return [r.model_dump() for r in result]
+    return result.model_dump()
+
+
+@pytest.mark.parametrize("route", ["predict", "recommend"])
+def test_recommendations_match_reference_loop(route):
+    users = synthetic_users(300)
+    if route == "predict":
+        names = MODEL_FEATURES
+        matrix = build_feature_matrix(
+            convert_matrix_to_usd(users_to_matrix(users), FX_RATE)
+        )
+        rows = [dict(zip(names, values)) for values in matrix.tolist()]
+    else:
+        names = USER_FIELDS
+        rows = [user.model_dump() for user in users]
+    recommender = FeatureRecommender(names)
+    batch = recommender.analyze_batch([[row[name] for name in names] for row in rows])
+
+    for row, got_batch in zip(rows, batch):
+        expected = _dump(_reference_analyze_features(recommender, row))
+        assert _dump(recommender.analyze_features(row)) == expected
+        assert _dump(got_batch) == expected
+
+
+def test_recommender_is_built_once_per_model():
+    model = _model()
+    recommender = get_feature_recommender(MODEL_FEATURES, model)
+    assert get_feature_recommender(list(MODEL_FEATURES), model) is recommender
+    assert get_feature_recommender(MODEL_FEATURES, _model()) is not recommender
+
+
+def test_recommender_does_not_keep_its_model_alive():
+    model = _model()
+    get_feature_recommender(MODEL_FEATURES, model)
+    unloaded = weakref.ref(model)
+    del model
+    gc.collect()
+    assert unloaded() is None
+
+
+def test_importance_cutoff_applies_to_each_applicants_shares():
+    # Globally only column 0 matters to this model, so neither feature below
+    # would be recommended by global importance.
+    recommender = get_feature_recommender(MODEL_FEATURES, _model())
+    limit = MODEL_FEATURES.index("total_credit_limit")
+    on_time = MODEL_FEATURES.index("pct_tl_nvr_dlq")
+    contributions = np.zeros((2, len(MODEL_FEATURES) + 1))
+    contributions[0, [limit, on_time]] = [1.0, 0.04]
+    contributions[1, [limit, on_time]] = [-0.04, -1.0]
+
+    first, second = recommender.analyze_batch(
+        np.zeros((2, len(MODEL_FEATURES))), contributions
+    )
+    assert [r.feat_name for r in first] == ["Загальний кредитний ліміт"]
+    assert [r.feat_name for r in second] == ["Відсоток рахунків без прострочень"]
+    assert first[0].importance == pytest.approx(1 / 1.04)
+
+
+def test_attributions_sum_to_margin(client):
+    users = synthetic_users(50)
+    response = client.post(
+        "/predict/batch",
+        params={"attributions": "true"},
+        json=[user.model_dump() for user in users],
+    )
+    assert response.status_code == 200
+    totals = [
+        sum(row["attributions"].values()) + row["base_value"] for row in response.json()
+    ]
+
+    features = build_feature_matrix(
+        convert_matrix_to_usd(users_to_matrix(users), FX_RATE)
+    )
+    margin = ForwardModel().model.booster.inplace_predict(
+        features, predict_type="margin", validate_features=False
+    )
+    np.testing.assert_allclose(totals, margin, rtol=1e-5)
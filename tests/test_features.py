@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from app.schemas.user import UserData
+from app.services.features import (
+    build_feature_matrix,
+    convert_matrix_to_usd,
+    user_features,
+    users_to_matrix,
+)
+from benchmarks.common import FX_RATE, synthetic_users
+from benchmarks.feature_pipeline import pydantic_features
+
+BASE = synthetic_users(1)[0].model_dump()
+
+# Inputs that hit the zero-denominator branches of the InputFeatures formulas.
+EDGE_CASES = {
+    "no_credit_limit": dict(
+        total_credit_limit=0, used_credit_amount=0, available_credit_limit=0
+    ),
+    "no_income": dict(total_income=0, monthly_debt_payments=250.0),
+    "no_income_or_debt": dict(total_income=0, monthly_debt_payments=0),
+    "all_accounts_late": dict(total_accounts=3, accounts_with_late_payments=3),
+    "all_accounts_near_limit": dict(total_accounts=4, accounts_with_75_percent_limit=4),
+    "all_zero": {
+        **{name: 0 for name in UserData.model_fields},
+        "total_accounts": 1,
+    },
+}
+
+
+# The old formulas return floats from int-typed computed fields.
+@pytest.mark.filterwarnings("ignore:Pydantic serializer warnings")
+@pytest.mark.parametrize("case", EDGE_CASES)
+def test_features_match_input_features_formulas(case):
+    user = UserData(**{**BASE, **EDGE_CASES[case]})
+    expected = pydantic_features(user, FX_RATE)
+
+    assert user_features(user, FX_RATE).tolist() == expected.tolist()
+    batch = build_feature_matrix(
+        convert_matrix_to_usd(users_to_matrix([user]), FX_RATE)
+    )
+    np.testing.assert_array_equal(batch, expected)
@@ -0,0 +1,80 @@
+import asyncio
+import time
+
+from app.models.registry import get_registry
+from app.services.jobs import (
+    QUEUED,
+    SUCCEEDED,
+    JobQueue,
+    MemoryJobBackend,
+    score_lines,
+)
+from benchmarks.common import synthetic_users
+
+CHUNK = 1 << 16
+
+
+async def _body(payload: bytes):
+    for start in range(0, len(payload), CHUNK):
+        yield payload[start : start + CHUNK]
+
+
+async def _longest_stall(coro) -> tuple[object, float, float]:
+    """Run `coro`; returns its result, the longest loop stall and its duration."""
+    task = asyncio.create_task(coro)
+    started = last = time.perf_counter()
+    longest = 0.0
+    while not task.done():
+        await asyncio.sleep(0.001)
+        now = time.perf_counter()
+        longest, last = max(longest, now - last), now
+    return task.result(), longest, last - started
+
+
+def test_large_json_submit_keeps_loop_responsive(tmp_path):
+    users = [user.model_dump_json() for user in synthetic_users(1000)]
+    payload = ("[" + ",".join(users * 40) + "]").encode()
+
+    async def submit():
+        queue = JobQueue(MemoryJobBackend(), directory=str(tmp_path))
+        job, stall, elapsed = await _longest_stall(
+            queue.submit(_body(payload), ndjson=False, version="v", rate=41.5)
+        )
+        lines = open(queue.input_path(job.id), "rb").read().splitlines()
+        return job, stall, elapsed, lines
+
+    job, stall, elapsed, lines = asyncio.run(submit())
+    assert job.state == QUEUED
+    assert job.rows_total == len(lines) == 40_000
+    # Relative, so a slow machine stretches both: parsing on the loop would
+    # make one stall span nearly the whole submit.
+    assert stall < elapsed / 4, f"loop stalled {stall:.3f}s of {elapsed:.3f}s"
+
+
+def test_resume_continues_from_committed_offsets(tmp_path):
+    payload = b"\n".join(u.model_dump_json().encode() for u in synthetic_users(25))
+    version = get_registry().default_version
+
+    async def run(resume: bool) -> bytes:
+        backend = MemoryJobBackend()
+        queue = JobQueue(backend, directory=str(tmp_path), chunk_size=10)
+        await queue.submit(_body(payload), True, version, rate=41.5)
+        job = backend.claim(queue.owner, time.time(), 0.0)
+        if resume:
+            # A worker that committed one chunk, then died writing the next.
+            first = open(queue.input_path(job.id), "rb").readlines()[:10]
+            body, _ = score_lines(first, 0, job.rate, version)
+            with open(queue.output_path(job.id), "wb") as f:
+                f.write(body + b'{"row":10,"partial')
+            job = job._replace(
+                rows_done=10, bytes_done=len(body), bytes_read=sum(map(len, first))
+            )
+            backend.create(job)
+        await queue._run(job)
+        assert backend.get(job.id).state == SUCCEEDED
+        return open(queue.output_path(job.id), "rb").read()
+
+    expected = asyncio.run(run(resume=False))
+    assert asyncio.run(run(resume=True)) == expected
+    rows = [line.split(b",", 1)[0] for line in expected.splitlines()]
+    assert rows == [b'{"row":%d' % row for row in range(25)]
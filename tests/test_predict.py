@@ -0,0 +1,45 @@
+import json
+
+import pytest
+
+from app import config
+from app.routers import predict
+from benchmarks.common import synthetic_users
+
+NDJSON = {"content-type": "application/x-ndjson"}
+
+
+@pytest.mark.parametrize("ndjson", [False, True])
+def test_oversized_batch_is_refused_before_validation(client, monkeypatch, ndjson):
+    monkeypatch.setattr(config, "PREDICT_BATCH_MAX_ROWS", 2)
+
+    def parse(*args):
+        raise AssertionError("an oversized batch should not be validated")
+
+    monkeypatch.setattr(predict, "_parse_batch", parse)
+    rows = [{"total_accounts": 0}] * 3  # invalid, so validation would say 422
+    if ndjson:
+        body = "\n".join(json.dumps(row) for row in rows) + "\n\n"
+    else:
+        body = json.dumps(rows)
+    headers = NDJSON if ndjson else {"content-type": "application/json"}
+
+    response = client.post("/predict/batch", content=body, headers=headers)
+    assert response.status_code == 413
+
+
+def test_ndjson_batch_matches_json_batch(client, monkeypatch):
+    # Large enough to be validated in a worker thread.
+    users = [user.model_dump() for user in synthetic_users(200)]
+    assert len(json.dumps(users)) > predict._PARSE_INLINE_BYTES
+    params = {"attributions": "true"}
+
+    batch = client.post("/predict/batch", params=params, json=users)
+    lines = client.post(
+        "/predict/batch",
+        params=params,
+        content="\n".join(json.dumps(user) for user in users),
+        headers=NDJSON,
+    )
+    assert batch.status_code == lines.status_code == 200
+    assert [json.loads(line) for line in lines.text.splitlines()] == batch.json()
@@ -0,0 +1,70 @@
+import numpy as np
+
+from app.services.prediction_cache import LocalCache, SQLiteCache, prediction_key
+
+ROW = np.array([1.0, 0.0, 2.5])
+
+
+class Clock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_key_covers_row_version_rate_bucket_and_variant():
+    key = prediction_key(ROW, "v1", 41.50, fx_bucket=0.01)
+    assert prediction_key(ROW.copy(), "v1", 41.504, fx_bucket=0.01) == key
+    assert prediction_key(np.array([1.0, -0.0, 2.5]), "v1", 41.5, 0.01) == key
+    others = [
+        prediction_key(np.array([1.0, 0.0, 2.6]), "v1", 41.5, 0.01),
+        prediction_key(ROW, "v2", 41.5, 0.01),
+        prediction_key(ROW, "v1", 41.52, 0.01),
+        prediction_key(ROW, "v1", None, 0.01),
+        prediction_key(ROW, "v1", 41.5, 0.01, variant="attributions"),
+    ]
+    assert len({key, *others}) == 6
+
+
+def test_local_entries_expire_after_ttl():
+    clock = Clock()
+    cache = LocalCache(max_bytes=1 << 20, clock=clock)
+    cache.set("a", b"1", ttl=10)
+    clock.now += 9
+    assert cache.get("a") == b"1"
+    clock.now += 1
+    assert cache.get("a") is None
+    assert len(cache) == 0 and cache.size == 0
+
+
+def test_local_cache_evicts_least_recently_used_within_byte_limit():
+    cache = LocalCache(max_bytes=3 * (100 + 1 + 200), clock=Clock())
+    for key in "abc":
+        cache.set(key, b"x" * 100, ttl=10)
+    cache.get("a")
+    cache.set("d", b"x" * 100, ttl=10)
+    assert [key for key in "abcd" if cache.get(key)] == ["a", "c", "d"]
+    assert cache.size <= cache.max_bytes
+    cache.set("huge", b"x" * cache.max_bytes, ttl=10)
+    assert cache.get("huge") is None and len(cache) == 3
+
+
+def test_shared_entries_expire_and_prune(tmp_path):
+    clock = Clock()
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite3"), max_entries=2, clock=clock)
+    cache.set("a", b"1", ttl=10)
+    cache.set("b", b"2", ttl=20)
+    cache.set("c", b"3", ttl=30)
+    clock.now += 10
+    assert cache.get("a") is None
+    assert cache.get("b") == b"2"
+
+    cache._prune()
+    rows = cache._conn.execute("SELECT key FROM predictions ORDER BY key").fetchall()
+    assert rows == [("b",), ("c",)]
+    clock.now += 10
+    cache._prune()
+    rows = cache._conn.execute("SELECT key FROM predictions").fetchall()
+    assert rows == [("c",)]
+    cache.close()
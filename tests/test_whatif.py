@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from app.schemas.user import UserData
+from app.services.features import build_feature_matrix, users_to_matrix
+from app.services.whatif import _actions
+
+
+def _user(**fields) -> UserData:
+    values = dict(
+        total_credit_limit=200000.0,
+        used_credit_amount=100.0,
+        available_credit_limit=199900.0,
+        accounts_with_late_payments=0,
+        total_accounts=5,
+        number_of_derogatory_records=0,
+        number_of_collections=0,
+        months_since_first_credit=20,
+        accounts_with_75_percent_limit=0,
+        credits_overdue_120_days=0,
+        total_taken_credits=5,
+        credits_taken_last_2_years=1,
+        total_card_balance=0.0,
+        total_income=100000.0,
+        monthly_debt_payments=20.0,
+        credits_overdue_30_days=0,
+    )
+    return UserData(**{**values, **fields})
+
+
+def _actions_for(user: UserData) -> dict:
+    raw = users_to_matrix([user])
+    return {a.feature: a for a in _actions(raw[0], build_feature_matrix(raw)[0], None)}
+
+
+def test_accounts_with_75_percent_limit_compared_on_model_column():
+    # (1 - 1/5) * 100 = 80 is above the 42.3 threshold.
+    action = _actions_for(_user(total_accounts=5, accounts_with_75_percent_limit=1))[
+        "accounts_with_75_percent_limit"
+    ]
+    assert action.current == 1
+    assert action.target == 3
+
+
+def test_accounts_with_75_percent_limit_within_threshold():
+    # (1 - 50/60) * 100 = 16 is below the threshold.
+    actions = _actions_for(_user(total_accounts=60, accounts_with_75_percent_limit=50))
+    assert "accounts_with_75_percent_limit" not in actions
+
+
+@pytest.mark.parametrize("home_ownership_ANY", [False, True])
+def test_no_home_ownership_any_action(home_ownership_ANY):
+    actions = _actions_for(_user(home_ownership_ANY=home_ownership_ANY))
+    assert "home_ownership_ANY" not in actions
+    assert all(np.isfinite(a.target) for a in actions.values())